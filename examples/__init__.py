@@ -0,0 +1 @@
+"""Runnable Key-Kid examples; see ``python -m examples --help``."""
@@ -0,0 +1,19 @@
+"""Run an example by name (``python -m examples basic_usage``), or ``all`` of them."""
+
+import argparse
+import importlib
+
+EXAMPLES = ["basic_usage", "ctf_workflow", "performance_demo", "sagemath_crypto"]
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m examples", description=__doc__)
+    parser.add_argument("name", choices=[*EXAMPLES, "all"], help="example to run")
+    args = parser.parse_args()
+    # Running several examples in one process imports the tools only once.
+    for name in EXAMPLES if args.name == "all" else [args.name]:
+        importlib.import_module(f"examples.{name}").main()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,4 @@
 """Basic usage examples for Key-Kid MCP server."""
-import os
-import sys
-
-sys.path.insert(0, os.path.abspath("."))
 
 # Direct imports (not via MCP)
 from src.tools.classic import caesar_break, vigenere_break
@@ -1,8 +1,4 @@
 """CTF workflow example - solving a multi-step challenge."""
-import os
-import sys
-
-sys.path.insert(0, os.path.abspath("."))
 
 from src.tools.decode import detect_encoding
 from src.tools.rot import rot_all
@@ -16,34 +12,39 @@ def solve_ctf_challenge(ciphertext: str):
     2. 解码
     3. 尝试各种密码破解
     """
-    print(f"=== 解密密文: {ciphertext} ===\n")
+    # 输出先收集到列表，函数结束时一次性写出，避免每步都触发一次 I/O
+    lines: list[str] = []
+    out = lines.append
+
+    out(f"=== 解密密文: {ciphertext} ===\n")
 
     # 步骤 1: 检测编码
-    print("步骤 1: 检测编码")
+    out("步骤 1: 检测编码")
     encodings = detect_encoding(ciphertext, top_k=5)
-    print(f"找到 {len(encodings)} 种可能的编码:")
+    out(f"找到 {len(encodings)} 种可能的编码:")
     for enc in encodings:
-        print(f"  - {enc.name}: {enc.decoded[:50]}...")
-    print()
+        out(f"  - {enc.name}: {enc.decoded[:50]}...")
+    out("")
 
     # 步骤 2: 尝试 ROT
-    print("步骤 2: 尝试 ROT 破解")
+    out("步骤 2: 尝试 ROT 破解")
     rot_results = rot_all(ciphertext, top_k=3)
-    print("最佳 ROT 候选:")
+    out("最佳 ROT 候选:")
     for r in rot_results:
-        print(f"  - ROT{r.key}: {r.plaintext[:50]} (分数: {r.confidence:.2f})")
-    print()
+        out(f"  - ROT{r.key}: {r.plaintext[:50]} (分数: {r.confidence:.2f})")
+    out("")
 
     # 步骤 3: 尝试 XOR (如果是十六进制)
-    print("步骤 3: 尝试 XOR 破解")
+    out("步骤 3: 尝试 XOR 破解")
     try:
         xor_results = xor_single_break(ciphertext, encoding="hex", top_k=1)
-        print("最佳 XOR 结果:")
-        print(f"  - 密钥: {xor_results[0].key}")
-        print(f"  - 明文: {xor_results[0].plaintext[:100]}")
+        out("最佳 XOR 结果:")
+        out(f"  - 密钥: {xor_results[0].key}")
+        out(f"  - 明文: {xor_results[0].plaintext[:100]}")
     except Exception as e:
-        print(f"  XOR 失败: {e}")
-    print()
+        out(f"  XOR 失败: {e}")
+    out("")
+    print("\n".join(lines))
 
 
 def main():
@@ -1,8 +1,4 @@
 """SageMath advanced cryptography examples."""
-import os
-import sys
-
-sys.path.insert(0, os.path.abspath("."))
 
 from src.tools.sagemath import (
     HAS_SAGEMATH,
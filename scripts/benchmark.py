@@ -5,12 +5,8 @@ is intentionally standalone (no pytest dependency) so it can be run in
 production-like containers.
 """
 
-import os
-import sys
 import time
 
-sys.path.insert(0, os.path.abspath("."))
-
 from src.tools.classic import caesar_break, vigenere_break
 from src.tools.number import factor_integer
 from src.tools.rsa import fermat_factor, wiener_attack
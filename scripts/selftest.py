@@ -1,7 +1,5 @@
-import os
-import sys
+import asyncio
 
-sys.path.insert(0, os.path.abspath("."))
 from src.tools.block import HAS_CRYPTOGRAPHY, HAS_PYCRYPTO, aes_decrypt, des_decrypt
 from src.tools.classic import affine_break, caesar_break, rail_fence_break, vigenere_break
 from src.tools.decode import decode_common, detect_encoding
@@ -11,7 +9,7 @@ from src.tools.rot import rot_all
 from src.tools.xor import xor_repeating_break, xor_single_break
 
 
-def main():
+async def main():
     r = rot_all("Uryyb Jbeyq", top_k=1)
     print("rot_all:", r[0].plaintext)
     d = detect_encoding("SGVsbG8gd29ybGQ=", top_k=1)
@@ -42,43 +40,26 @@ def main():
     fr6 = factor_integer(6, prefer_yafu=True)
     print("factor_integer (yafu prefer, 6):", fr6.n, fr6.factors)
     if HAS_PYCRYPTO or HAS_CRYPTOGRAPHY:
-        try:
+        results = await asyncio.gather(
             # AES CBC PKCS7 example (hex inputs). This is illustrative; actual values may differ
-            pt_aes = awaitable(
-                aes_decrypt(
-                    "6bc1bee22e409f96e93d7e117393172a",
-                    "hex",
-                    "2b7e151628aed2a6abf7158809cf4f3c",
-                    "hex",
-                    "000102030405060708090a0b0c0d0e0f",
-                    "hex",
-                    "CBC",
-                )
-            )
-            print("aes_decrypt:", pt_aes[:8])
-        except Exception as e:
-            print("aes_decrypt: skipped", str(e))
-        try:
-            pt_des = awaitable(
-                des_decrypt(
-                    "85e813540f0ab405", "hex", "133457799BBCDFF1", "hex", None, "hex", "ECB"
-                )
-            )
-            print("des_decrypt:", pt_des[:8])
-        except Exception as e:
-            print("des_decrypt: skipped", str(e))
-
-
-def awaitable(coro):
-    try:
-        import asyncio
-
-        return asyncio.get_event_loop().run_until_complete(coro)
-    except RuntimeError:
-        import asyncio
-
-        return asyncio.run(coro)
+            aes_decrypt(
+                "6bc1bee22e409f96e93d7e117393172a",
+                "hex",
+                "2b7e151628aed2a6abf7158809cf4f3c",
+                "hex",
+                "000102030405060708090a0b0c0d0e0f",
+                "hex",
+                "CBC",
+            ),
+            des_decrypt("85e813540f0ab405", "hex", "133457799BBCDFF1", "hex", None, "hex", "ECB"),
+            return_exceptions=True,
+        )
+        for name, res in zip(("aes_decrypt", "des_decrypt"), results, strict=True):
+            if isinstance(res, Exception):
+                print(f"{name}: skipped", str(res))
+            else:
+                print(f"{name}:", res[:8])
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
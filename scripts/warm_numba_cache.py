@@ -0,0 +1,61 @@
+"""Compile the optional Numba kernels ahead of time.
+
+``score_stats``, both batch kernels and the RC4 keystream kernel are
+declared with ``cache=True``, so once they have been compiled the machine code
+is loaded from ``__pycache__`` (or ``NUMBA_CACHE_DIR``) by later processes
+instead of being JIT-compiled again. Run this once after installing, e.g. in a
+Docker build step, so short-lived runs such as ``scripts/selftest.py`` never
+pay the compile cost. It is a no-op when Numba is not installed.
+"""
+
+import time
+
+import numpy as np
+
+from src.tools.rc4 import _keystream_nb
+from src.utils import scoring
+from src.utils.scoring_nb import (
+    HAS_NUMBA,
+    score_batch_stats,
+    score_batch_stats_parallel,
+    score_stats,
+)
+
+
+def main():
+    if not HAS_NUMBA:
+        print("numba not installed; nothing to compile")
+        return
+
+    # Cover both read-only (np.frombuffer) and writable candidate buffers.
+    buffers = [
+        np.frombuffer(b"warm up", dtype=np.uint8),
+        np.zeros(8, dtype=np.uint8),
+    ]
+    start = time.perf_counter()
+    for buf in buffers:
+        score_stats(
+            buf,
+            scoring._LETTER_LUT,
+            scoring._PRINTABLE_LUT,
+            scoring._ALPHA_LUT,
+            scoring._BIGRAM_CLASS_LUT,
+            scoring._BIGRAM_MAT,
+        )
+        for batch in (score_batch_stats, score_batch_stats_parallel):
+            batch(
+                buf.reshape(1, -1),
+                scoring._LETTER_LUT,
+                scoring._PRINTABLE_LUT,
+                scoring._ALPHA_LUT,
+                scoring._BIGRAM_CLASS_LUT,
+                scoring._BIGRAM_MAT,
+            )
+    # rc4() itself prefers pycryptodome, so compile the fallback kernel directly.
+    _keystream_nb(np.arange(256, dtype=np.int64), 8)
+    elapsed = time.perf_counter() - start
+    print(f"Numba kernels compiled in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
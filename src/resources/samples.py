@@ -1,11 +1,12 @@
 from mcp.server.fastmcp import FastMCP
 
+SAMPLES = {
+    "rot13_hello": "Uryyb Jbeyq",
+    "xor_single_hex": "3f292c2c2b",
+}
+
 
 def register_samples(mcp: FastMCP) -> None:
     @mcp.resource("samples://{id}")
     def samples(id: str) -> str:
-        if id == "rot13_hello":
-            return "Uryyb Jbeyq"
-        if id == "xor_single_hex":
-            return "3f292c2c2b"
-        return ""
+        return SAMPLES.get(id, "")
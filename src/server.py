@@ -1,3 +1,4 @@
+import functools
 import os
 import sys
 from collections.abc import Callable
@@ -5,28 +6,34 @@ from typing import Any
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 import anyio as _anyio
+from anyio import to_thread as _to_thread
 
 
-class _GenericFunc:
-    def __init__(self, fn):
-        self.fn = fn
-
-    def __call__(self, *args, **kwargs):
-        return self.fn(*args, **kwargs)
-
-    def __getitem__(self, item):
-        return self.fn
+def _generic_func(fn):
+    # A per-function class whose __call__ *is* fn, so calls dispatch straight to
+    # it without an extra Python frame, while fn[T] returns fn unchanged.
+    cls = type(
+        "_GenericFunc", (), {"__call__": staticmethod(fn), "__getitem__": lambda _, item: fn}
+    )
+    return cls()
 
 
 if not hasattr(_anyio.create_memory_object_stream, "__getitem__"):
-    _anyio.create_memory_object_stream = _GenericFunc(_anyio.create_memory_object_stream)  # type: ignore
+    _anyio.create_memory_object_stream = _generic_func(_anyio.create_memory_object_stream)  # type: ignore
 from mcp.server.fastmcp import Context, FastMCP  # noqa: E402
 from mcp.server.session import ServerSession  # noqa: E402
+from mcp.types import TextContent  # noqa: E402
+from pydantic import BaseModel  # noqa: E402
 
 from src.prompts.analyze import register_prompts  # noqa: E402
 from src.resources.samples import register_samples  # noqa: E402
 from src.resources.wordlist import register_wordlist  # noqa: E402
-from src.tools.block import aes_decrypt, des_decrypt  # noqa: E402
+from src.tools.block import (  # noqa: E402
+    aes_decrypt,
+    aes_decrypt_batch,
+    des_decrypt,
+    des_decrypt_batch,
+)
 from src.tools.classic import (  # noqa: E402
     affine_break,
     caesar_break,
@@ -61,9 +68,8 @@ from src.tools.sagemath import (  # noqa: E402
     lll_reduce,
     quadratic_residue,
 )
-from src.tools.score import wordlist_score  # noqa: E402
+from src.tools.score import parse_wordlist, rank_with_wordlist  # noqa: E402
 from src.tools.xor import xor_known_plaintext, xor_repeating_break, xor_single_break  # noqa: E402
-from src.utils.scoring import english_score  # noqa: E402
 
 mcp = FastMCP("CTF Crypto")
 register_samples(mcp)
@@ -80,7 +86,59 @@ def _register_tool(fn: Callable[..., Any]) -> Callable[..., Any]:
     return fn
 
 
+def _copy_result(result: Any) -> Any:
+    # Result models only hold scalars, so a shallow model copy is independent.
+    if isinstance(result, list):
+        return [_copy_result(r) for r in result]
+    if isinstance(result, BaseModel):
+        return result.model_copy()
+    return result
+
+
+def _cached_tool(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """Memoize a deterministic synchronous tool on its (hashable) arguments.
+
+    Agents often repeat the same call while exploring. The cache is bounded so a
+    long-running server does not grow without limit, and every hit returns
+    fresh lists and model copies so callers never share (and mutate) the
+    cached results.
+    """
+    cached = functools.lru_cache(maxsize=256)(fn)
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        return _copy_result(cached(*args, **kwargs))
+
+    wrapper.cache_info = cached.cache_info  # type: ignore[attr-defined]
+    wrapper.cache_clear = cached.cache_clear  # type: ignore[attr-defined]
+    return wrapper
+
+
+@functools.cache
+def _offload_limiter() -> _anyio.CapacityLimiter:
+    # Created lazily: older anyio releases need a running event loop for this.
+    return _anyio.CapacityLimiter(os.cpu_count() or 4)
+
+
+def _offload(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """Run a CPU-heavy synchronous tool in a worker thread.
+
+    Brute-force searches would otherwise block the event loop and stall every
+    other in-flight MCP request; the limiter caps concurrent searches at the
+    number of CPUs.
+    """
+
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        return await _to_thread.run_sync(
+            functools.partial(fn, *args, **kwargs), limiter=_offload_limiter()
+        )
+
+    return wrapper
+
+
 @_register_tool
+@_cached_tool
 def tool_rot_all(text: str, top_k: int = 3) -> list[BreakResult]:
     """Enumerate ROT(1..25) shifts and return top plaintext candidates ranked by English score.
 
@@ -93,6 +151,7 @@ def tool_rot_all(text: str, top_k: int = 3) -> list[BreakResult]:
 
 
 @_register_tool
+@_cached_tool
 def tool_detect_encoding(text: str, top_k: int = 5) -> list[DetectionCandidate]:
     """Identify common encodings and attempt to decode, returning encoding guesses and decoded text.
 
@@ -105,6 +164,7 @@ def tool_detect_encoding(text: str, top_k: int = 5) -> list[DetectionCandidate]:
 
 
 @_register_tool
+@_cached_tool
 def tool_decode_common(text: str, limit: int = 10) -> list[DetectionCandidate]:
     """Batch-try common decoders on the input and quickly produce multiple candidate decodings.
 
@@ -117,6 +177,7 @@ def tool_decode_common(text: str, limit: int = 10) -> list[DetectionCandidate]:
 
 
 @_register_tool
+@_cached_tool
 def tool_xor_single_break(data: str, encoding: str = "hex", top_k: int = 3) -> list[BreakResult]:
     """Brute-force single-byte XOR ciphertext and return likely plaintexts and the key byte.
 
@@ -129,6 +190,8 @@ def tool_xor_single_break(data: str, encoding: str = "hex", top_k: int = 3) -> l
 
 
 @_register_tool
+@_offload
+@_cached_tool
 def tool_xor_repeating_break(
     data: str, encoding: str = "hex", min_key: int = 2, max_key: int = 40
 ) -> BreakResult:
@@ -143,6 +206,7 @@ def tool_xor_repeating_break(
 
 
 @_register_tool
+@_cached_tool
 def tool_caesar_break(ciphertext: str) -> BreakResult:
     """Brute-force Caesar cipher and return the highest-scoring plaintext and shift.
 
@@ -154,7 +218,55 @@ def tool_caesar_break(ciphertext: str) -> BreakResult:
     return caesar_break(ciphertext)
 
 
+# Batch variants run many inputs through one MCP request, so fuzzing loops pay
+# the request round trip and schema validation once per batch instead of once
+# per input. Each item still goes through the per-input tool cache.
+
+
 @_register_tool
+@_offload
+def tool_rot_all_batch(texts: list[str], top_k: int = 3) -> list[list[BreakResult]]:
+    """Run `tool_rot_all` over many texts in a single call.
+
+    Purpose: Amortize per-request overhead when screening many candidate ciphertexts.
+    Usage: Provide `texts`; `top_k` applies to each text (default 3).
+    Returns: One list of `BreakResult` per input, in input order.
+    Related: `tool_rot_all` for a single text.
+    """
+    return [tool_rot_all(t, top_k) for t in texts]
+
+
+@_register_tool
+@_offload
+def tool_xor_single_break_batch(
+    datas: list[str], encoding: str = "hex", top_k: int = 3
+) -> list[list[BreakResult]]:
+    """Run `tool_xor_single_break` over many ciphertexts in a single call.
+
+    Purpose: Find which of many buffers was single-byte XOR encrypted (e.g. CTF line hunts).
+    Usage: `datas` are ciphertexts sharing one `encoding`; `top_k` applies to each (default 3).
+    Returns: One list of `BreakResult` per input, in input order.
+    Related: `tool_xor_single_break` for a single ciphertext.
+    """
+    return [tool_xor_single_break(d, encoding, top_k) for d in datas]
+
+
+@_register_tool
+@_offload
+def tool_caesar_break_batch(ciphertexts: list[str]) -> list[BreakResult]:
+    """Run `tool_caesar_break` over many ciphertexts in a single call.
+
+    Purpose: Amortize per-request overhead when many shift-cipher candidates need checking.
+    Usage: Provide `ciphertexts`.
+    Returns: The best `BreakResult` for each input, in input order.
+    Related: `tool_caesar_break` for a single ciphertext.
+    """
+    return [tool_caesar_break(c) for c in ciphertexts]
+
+
+@_register_tool
+@_offload
+@_cached_tool
 def tool_vigenere_break(
     ciphertext: str, max_key_len: int = 16, top_k: int = 3
 ) -> list[BreakResult]:
@@ -169,6 +281,8 @@ def tool_vigenere_break(
 
 
 @_register_tool
+@_offload
+@_cached_tool
 def tool_affine_break(ciphertext: str, top_k: int = 3) -> list[BreakResult]:
     """Break affine cipher: enumerate parameters (a,b) and return top candidates by English score.
 
@@ -181,6 +295,8 @@ def tool_affine_break(ciphertext: str, top_k: int = 3) -> list[BreakResult]:
 
 
 @_register_tool
+@_offload
+@_cached_tool
 def tool_rail_fence_break(
     ciphertext: str, max_rails: int = 10, top_k: int = 3
 ) -> list[BreakResult]:
@@ -195,6 +311,8 @@ def tool_rail_fence_break(
 
 
 @_register_tool
+@_offload
+@_cached_tool
 def tool_transposition_break(
     ciphertext: str, max_key_len: int = 5, top_k: int = 3
 ) -> list[BreakResult]:
@@ -209,6 +327,8 @@ def tool_transposition_break(
 
 
 @_register_tool
+@_offload
+@_cached_tool
 def tool_playfair_break(
     ciphertext: str, key_hint: str | None = None, top_k: int = 1
 ) -> list[BreakResult]:
@@ -270,6 +390,7 @@ async def tool_factor_integer(
 
 
 @_register_tool
+@_cached_tool
 def tool_hash_identify(text: str) -> list[str]:
     """Heuristically identify possible hash/encoding types by length and character set.
 
@@ -290,6 +411,7 @@ async def tool_aes_decrypt(
     iv: str | None = None,
     iv_encoding: str = "hex",
     mode: str = "CBC",
+    plaintext_encoding: str = "utf-8",
     ctx=None,
 ) -> str:
     """AES decryption (ECB/CBC) using `pycryptodome` or `cryptography` backends; supports interactive elicitation when parameters are missing.
@@ -297,11 +419,20 @@ async def tool_aes_decrypt(
     Purpose: Decrypt common AES tasks in CTF.
     Usage: `ciphertext` and `cipher_encoding` specify the ciphertext and its encoding; `key`/`iv` may be omitted and elicited if `ctx` is provided.
            `mode` supports `ECB`/`CBC`; plaintext is PKCS7-unpadded and returned as a string.
+           `plaintext_encoding` (default `utf-8`, invalid bytes dropped); `latin-1` is faster and lossless for binary output.
     Returns: Decrypted plaintext string; returns empty string if backends are unavailable or parameters are insufficient.
     Related: Ensure key/IV sizes match the mode; specify hex/Base64 encodings correctly.
     """
     return await aes_decrypt(
-        ciphertext, cipher_encoding, key, key_encoding, iv, iv_encoding, mode, ctx
+        ciphertext,
+        cipher_encoding,
+        key,
+        key_encoding,
+        iv,
+        iv_encoding,
+        mode,
+        ctx,
+        plaintext_encoding=plaintext_encoding,
     )
 
 
@@ -314,6 +445,7 @@ async def tool_des_decrypt(
     iv: str | None = None,
     iv_encoding: str = "hex",
     mode: str = "CBC",
+    plaintext_encoding: str = "utf-8",
     ctx=None,
 ) -> str:
     """DES decryption (ECB/CBC) using `pycryptodome` or `cryptography` backends; supports interactive elicitation.
@@ -324,7 +456,77 @@ async def tool_des_decrypt(
     Related: DES key/IV sizes differ from AES; ensure correct mode and encoding.
     """
     return await des_decrypt(
-        ciphertext, cipher_encoding, key, key_encoding, iv, iv_encoding, mode, ctx
+        ciphertext,
+        cipher_encoding,
+        key,
+        key_encoding,
+        iv,
+        iv_encoding,
+        mode,
+        ctx,
+        plaintext_encoding=plaintext_encoding,
+    )
+
+
+@_register_tool
+@_offload
+def tool_aes_decrypt_batch(
+    ciphertext: str,
+    keys: list[str],
+    cipher_encoding: str = "hex",
+    key_encoding: str = "hex",
+    iv: str | None = None,
+    iv_encoding: str = "hex",
+    mode: str = "CBC",
+    plaintext_encoding: str = "utf-8",
+) -> list[str]:
+    """Decrypt one AES ciphertext under many candidate keys in a single call.
+
+    Purpose: Key search over a candidate list without one MCP round trip per key.
+    Usage: `keys` share `key_encoding`; other parameters mirror `tool_aes_decrypt` (no elicitation).
+    Returns: One plaintext per key, in order; malformed or wrong-length keys give an empty string.
+    Related: Rank the plaintexts yourself or feed them to `tool_detect_encoding`.
+    """
+    return aes_decrypt_batch(
+        ciphertext,
+        keys,
+        cipher_encoding,
+        key_encoding,
+        iv,
+        iv_encoding,
+        mode,
+        plaintext_encoding,
+    )
+
+
+@_register_tool
+@_offload
+def tool_des_decrypt_batch(
+    ciphertext: str,
+    keys: list[str],
+    cipher_encoding: str = "hex",
+    key_encoding: str = "hex",
+    iv: str | None = None,
+    iv_encoding: str = "hex",
+    mode: str = "CBC",
+    plaintext_encoding: str = "utf-8",
+) -> list[str]:
+    """Decrypt one DES ciphertext under many candidate keys in a single call.
+
+    Purpose: DES counterpart of `tool_aes_decrypt_batch`.
+    Usage: Parameters mirror `tool_aes_decrypt_batch`.
+    Returns: One plaintext per key, in order; malformed or wrong-length keys give an empty string.
+    Related: `tool_des_decrypt` for a single key with interactive elicitation.
+    """
+    return des_decrypt_batch(
+        ciphertext,
+        keys,
+        cipher_encoding,
+        key_encoding,
+        iv,
+        iv_encoding,
+        mode,
+        plaintext_encoding,
     )
 
 
@@ -464,6 +666,11 @@ def tool_ecc_discrete_log_brute(
     return ecc_discrete_log_brute(a, b, p, base, target, max_steps)
 
 
+# Parsed wordlists by resource name. The wordlist resources are static, so a
+# name only needs one resource round trip; empty or unknown lists are not kept.
+_WORDLIST_CACHE: dict[str, tuple[str, ...]] = {}
+
+
 @_register_tool
 async def tool_rot_all_wordlist(
     text: str,
@@ -479,30 +686,22 @@ async def tool_rot_all_wordlist(
     Related: Wordlists are provided via `wordlist://{name}`; use with `tool_rot_all`/`tool_caesar_break` for better results.
     """
     cands = rot_all(text, 25)
-    words: list[str] = []
+    words: tuple[str, ...] = ()
     if ctx is not None:
-        res = await ctx.read_resource(f"wordlist://{wordlist_name}")
-        try:
-            # res.contents[0] is TextContent in MCP client; here assume text payload
-            from mcp.types import TextContent
-
-            contents_list = list(res.contents) if hasattr(res, "contents") else []
-            if contents_list and isinstance(contents_list[0], TextContent):
-                words = [x.strip() for x in contents_list[0].text.splitlines() if x.strip()]
-        except Exception:
-            pass
-    scored = []
-    for br in cands:
-        ws = wordlist_score(br.plaintext, words) if words else 0.0
-        es = english_score(br.plaintext)
-        combined = 0.7 * es + 0.3 * ws
-        scored.append(
-            BreakResult(
-                algorithm=br.algorithm, plaintext=br.plaintext, key=br.key, confidence=combined
-            )
-        )
-    scored.sort(key=lambda x: x.confidence, reverse=True)
-    return scored[:top_k]
+        words = _WORDLIST_CACHE.get(wordlist_name, ())
+        if not words:
+            res = await ctx.read_resource(f"wordlist://{wordlist_name}")
+            try:
+                # res.contents[0] is TextContent in MCP client; here assume text payload
+                contents_list = list(res.contents) if hasattr(res, "contents") else []
+                if contents_list and isinstance(contents_list[0], TextContent):
+                    words = parse_wordlist(contents_list[0].text)
+            except Exception:
+                pass
+            if words:
+                _WORDLIST_CACHE[wordlist_name] = words
+    # rot_all already batch-scored every shift; its English scores are reused.
+    return rank_with_wordlist(cands, words, top_k)
 
 
 # SageMath Tools
@@ -534,12 +733,12 @@ def tool_elliptic_curve_factor(n: str, a: str = "0", b: str = "0", timeout: int
 
 @_register_tool
 def tool_chinese_remainder(congruences: list[tuple[str, str]], timeout: int = 30) -> dict:
-    """Solve system of linear congruences using Chinese Remainder Theorem via SageMath.
+    """Solve system of linear congruences using Chinese Remainder Theorem.
 
     Purpose: Find x satisfying: x ≡ a₁ (mod n₁), x ≡ a₂ (mod n₂), ...
-    Usage: `congruences` is list of (remainder, modulus) tuples as strings.
-    Returns: Dict with `found`, `x` (solution), `modulus` (product of all moduli), and `error` if unsolvable.
-    Related: Common in RSA attacks and side-channel cryptanalysis; requires coprime moduli.
+    Usage: `congruences` is a non-empty list of (remainder, modulus) tuples as strings.
+    Returns: Dict with `found`, `x` (solution), `modulus` (lcm of all moduli), and `error` if unsolvable.
+    Related: Common in RSA attacks and side-channel cryptanalysis; moduli need not be coprime.
     """
     return chinese_remainder(congruences, timeout)
 
@@ -642,7 +841,11 @@ def tool_sagemath_check() -> dict:
         }
 
 
-# Apply all collected tool wrappers to the MCP instance.
+# Apply all collected tool wrappers to the MCP instance. FastMCP introspects each
+# signature and builds its pydantic argument model here, once, at import time;
+# calls only run the prebuilt validator, so there is nothing to rebuild per call.
+# Finding the tool for a request is a single dict probe by name, which a
+# generated if/elif dispatcher could only make slower.
 for _registered_fn in _tool_registry:
     mcp.tool()(_registered_fn)
 
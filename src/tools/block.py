@@ -1,34 +1,64 @@
+import asyncio
 import base64
+import importlib.util
+import os
+from collections.abc import Callable
+from functools import cache, lru_cache
 
-try:
-    from Crypto.Cipher import AES as PYCAES
-    from Crypto.Cipher import DES as PYCDES
-
-    HAS_PYCRYPTO = True
-except Exception:
-    HAS_PYCRYPTO = False
+# The cipher backends are only located here; they are imported on first use
+# (see _pycrypto / _cryptography), so startup only pays for the one in use.
+HAS_PYCRYPTO = importlib.util.find_spec("Crypto") is not None
+HAS_CRYPTOGRAPHY = importlib.util.find_spec("cryptography") is not None
 
 try:
-    from cryptography.hazmat.backends import default_backend
-    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+    import pybase64
 
-    HAS_CRYPTOGRAPHY = True
-except Exception:
-    HAS_CRYPTOGRAPHY = False
+    HAS_PYBASE64 = True
+except ImportError:
+    HAS_PYBASE64 = False
 
 
 # Safety limits to prevent accidental or malicious resource exhaustion.
 _MAX_CT_BYTES = 1 * 1024 * 1024  # 1 MiB
 _MAX_KEY_BYTES = 64
 _MAX_IV_BYTES = 32
+_MAX_BATCH_KEYS = 65536
 
 
-def _parse(data: str, enc: str) -> bytes:
-    if enc == "hex":
+def _b64decode(data: str) -> bytes:
+    if HAS_PYBASE64:
+        # pybase64's SIMD decoder in strict mode agrees with the stdlib on
+        # everything it accepts; lenient inputs (whitespace, stray characters,
+        # odd padding) fall through to the stdlib's rules.
+        try:
+            return pybase64.b64decode(data, validate=True)
+        except Exception:
+            pass
+    return base64.b64decode(data)
+
+
+_WHITESPACE = str.maketrans("", "", " \t\r\n\v\f")
+
+
+def _hexdecode(data: str) -> bytes:
+    try:
         return bytes.fromhex(data)
-    if enc == "b64":
-        return base64.b64decode(data)
-    return data.encode()
+    except ValueError:
+        # fromhex only skips whitespace between byte pairs; hex dumps wrapped
+        # mid-byte decode once all whitespace is stripped in one C pass.
+        return bytes.fromhex(data.translate(_WHITESPACE))
+
+
+# Input decoders by encoding name; anything else is taken as raw UTF-8 text.
+_DECODERS: dict[str, Callable[[str], bytes]] = {
+    "hex": _hexdecode,
+    "b64": _b64decode,
+}
+
+
+def _parse(data: str, enc: str) -> bytes:
+    decode = _DECODERS.get(enc)
+    return decode(data) if decode is not None else data.encode()
 
 
 def _parse_limited(data: str, enc: str, max_bytes: int, name: str) -> bytes:
@@ -39,74 +69,159 @@ def _parse_limited(data: str, enc: str, max_bytes: int, name: str) -> bytes:
     return parsed
 
 
-def _pkcs7_unpad(b: bytes) -> bytes:
+@lru_cache(maxsize=256)
+def _parse_key_iv(
+    key: str, key_encoding: str, iv: str | None, iv_encoding: str
+) -> tuple[bytes, bytes | None]:
+    # Keys and IVs are short and tend to repeat across calls (one key tried
+    # against many ciphertexts), so the decoded pair is memoized as one entry;
+    # invalid input raises and is not cached. Ciphertexts are parsed every time.
+    k = _parse_limited(key, key_encoding, _MAX_KEY_BYTES, "key")
+    ivb = _parse_limited(iv, iv_encoding, _MAX_IV_BYTES, "iv") if iv else None
+    return k, ivb
+
+
+# Every possible PKCS#7 padding run, indexed by its byte value.
+_PKCS7_PADS = tuple(bytes([p]) * p for p in range(256))
+
+
+def _pkcs7_pad_len(b: bytes) -> int:
+    """Return the length of valid PKCS#7 padding at the end of ``b`` (0 if none)."""
     if not b:
-        return b
+        return 0
     pad = b[-1]
     if pad == 0 or pad > len(b):
-        return b
-    if b.endswith(bytes([pad]) * pad):
-        return b[:-pad]
-    return b
+        return 0
+    return pad if b.endswith(_PKCS7_PADS[pad]) else 0
+
+
+def _decode_unpadded(pt: bytes, encoding: str = "utf-8") -> str:
+    # Decode straight from a view of the unpadded prefix instead of copying it.
+    return str(memoryview(pt)[: len(pt) - _pkcs7_pad_len(pt)], encoding, "ignore")
+
+
+@cache
+def _pycrypto():
+    from Crypto.Cipher import AES, DES
+
+    return AES, DES
+
+
+@cache
+def _cryptography():
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+    return Cipher, algorithms, modes
+
+
+@lru_cache(maxsize=32)
+def _pycrypto_ecb(module, key: bytes):
+    # ECB ciphers carry no chaining state, so one object per key (and its key
+    # schedule) can be reused across calls; CBC needs a fresh object per IV.
+    return module.new(key, module.MODE_ECB)
 
 
 def _aes_pycrypto(ct: bytes, key: bytes, iv: bytes | None, mode: str) -> bytes:
+    aes = _pycrypto()[0]
     m = mode.upper()
     if m == "ECB":
-        cipher = PYCAES.new(key, PYCAES.MODE_ECB)
+        cipher = _pycrypto_ecb(aes, key)
     elif m == "CBC":
         if iv is None:
             raise ValueError("IV is required for CBC mode")
-        cipher = PYCAES.new(key, PYCAES.MODE_CBC, iv)  # type: ignore[assignment]
+        cipher = aes.new(key, aes.MODE_CBC, iv)  # type: ignore[assignment]
     else:
         raise ValueError("Unsupported AES mode")
-    pt = cipher.decrypt(ct)
-    return _pkcs7_unpad(pt)
+    return cipher.decrypt(ct)
 
 
 def _des_pycrypto(ct: bytes, key: bytes, iv: bytes | None, mode: str) -> bytes:
+    des = _pycrypto()[1]
     m = mode.upper()
     if m == "ECB":
-        cipher = PYCDES.new(key, PYCDES.MODE_ECB)
+        cipher = _pycrypto_ecb(des, key)
     elif m == "CBC":
         if iv is None:
             raise ValueError("IV is required for CBC mode")
-        cipher = PYCDES.new(key, PYCDES.MODE_CBC, iv)
+        cipher = des.new(key, des.MODE_CBC, iv)
     else:
         raise ValueError("Unsupported DES mode")
-    pt = cipher.decrypt(ct)
-    return _pkcs7_unpad(pt)
+    return cipher.decrypt(ct)
+
+
+@lru_cache(maxsize=128)
+def _cryptography_cipher(algorithm: str, key: bytes, iv: bytes | None):
+    # A Cipher holds only the expanded key and mode, so it can be shared across
+    # calls keyed by (key, iv); each call still takes a fresh, stateful
+    # decryptor from it. ``iv`` is None for ECB.
+    cipher, algorithms, modes = _cryptography()
+    mode = modes.ECB() if iv is None else modes.CBC(iv)
+    return cipher(getattr(algorithms, algorithm)(key), mode)
 
 
 def _aes_cryptography(ct: bytes, key: bytes, iv: bytes | None, mode: str) -> bytes:
     m = mode.upper()
     if m == "ECB":
-        cipher_obj = Cipher(algorithms.AES(key), modes.ECB(), backend=default_backend())
+        cipher_obj = _cryptography_cipher("AES", key, None)
     elif m == "CBC":
         if iv is None:
             raise ValueError("IV is required for CBC mode")
-        cipher_obj = Cipher(algorithms.AES(key), modes.CBC(iv), backend=default_backend())  # type: ignore[arg-type]
+        cipher_obj = _cryptography_cipher("AES", key, iv)
     else:
         raise ValueError("Unsupported AES mode")
     decryptor = cipher_obj.decryptor()
-    pt = decryptor.update(ct) + decryptor.finalize()
-    return _pkcs7_unpad(pt)
+    return decryptor.update(ct) + decryptor.finalize()
 
 
 def _des_cryptography(ct: bytes, key: bytes, iv: bytes | None, mode: str) -> bytes:
     m = mode.upper()
+    # Use TripleDES for backward compatibility
     if m == "ECB":
-        # Use TripleDES for backward compatibility
-        cipher_obj = Cipher(algorithms.TripleDES(key), modes.ECB(), backend=default_backend())
+        cipher_obj = _cryptography_cipher("TripleDES", key, None)
     elif m == "CBC":
         if iv is None:
             raise ValueError("IV is required for CBC mode")
-        cipher_obj = Cipher(algorithms.TripleDES(key), modes.CBC(iv), backend=default_backend())  # type: ignore[arg-type]
+        cipher_obj = _cryptography_cipher("TripleDES", key, iv)
     else:
         raise ValueError("Unsupported DES mode")
     decryptor = cipher_obj.decryptor()
-    pt = decryptor.update(ct) + decryptor.finalize()
-    return _pkcs7_unpad(pt)
+    return decryptor.update(ct) + decryptor.finalize()
+
+
+# Backends return the raw, still padded plaintext. They are resolved once at
+# import; pycryptodome's C implementation is preferred for short inputs, where
+# its per-call overhead is lowest. AES inputs of _BULK_CT_BYTES or more go to
+# ``cryptography`` (OpenSSL), which is faster on bulk data. DES stays on
+# pycryptodome, since ``cryptography`` only offers it as TripleDES.
+# KEYKID_CIPHER_BACKEND=pycryptodome|cryptography pins one backend.
+_BULK_CT_BYTES = 4096
+_CIPHER_BACKEND = os.environ.get("KEYKID_CIPHER_BACKEND", "").strip().lower()
+
+if _CIPHER_BACKEND == "cryptography" and HAS_CRYPTOGRAPHY:
+    _AES_IMPL, _DES_IMPL = _aes_cryptography, _des_cryptography
+elif HAS_PYCRYPTO:
+    _AES_IMPL, _DES_IMPL = _aes_pycrypto, _des_pycrypto
+elif HAS_CRYPTOGRAPHY:
+    _AES_IMPL, _DES_IMPL = _aes_cryptography, _des_cryptography
+else:
+    _AES_IMPL = _DES_IMPL = None
+
+if HAS_CRYPTOGRAPHY and _CIPHER_BACKEND != "pycryptodome":
+    _AES_BULK_IMPL = _aes_cryptography
+else:
+    _AES_BULK_IMPL = _AES_IMPL
+
+# Decrypting this much input takes long enough to stall the event loop of a
+# streaming server, so larger inputs are handed to a worker thread.
+_THREAD_CT_BYTES = 64 * 1024
+
+
+async def _decrypt(impl, ct: bytes, key: bytes, iv: bytes | None, mode: str, encoding: str) -> str:
+    if len(ct) >= _THREAD_CT_BYTES:
+        pt = await asyncio.to_thread(impl, ct, key, iv, mode)
+    else:
+        pt = impl(ct, key, iv, mode)
+    return _decode_unpadded(pt, encoding)
 
 
 async def aes_decrypt(
@@ -118,6 +233,7 @@ async def aes_decrypt(
     iv_encoding: str = "hex",
     mode: str = "CBC",
     ctx: object | None = None,
+    plaintext_encoding: str = "utf-8",
 ) -> str:
     ct = _parse_limited(ciphertext, cipher_encoding, _MAX_CT_BYTES, "ciphertext")
     if key is None:
@@ -142,15 +258,11 @@ async def aes_decrypt(
                 return ""
         else:
             return ""
-    k = _parse_limited(key, key_encoding, _MAX_KEY_BYTES, "key")
-    ivb = _parse_limited(iv, iv_encoding, _MAX_IV_BYTES, "iv") if iv else None
-    if HAS_PYCRYPTO:
-        pt = _aes_pycrypto(ct, k, ivb, mode)
-    elif HAS_CRYPTOGRAPHY:
-        pt = _aes_cryptography(ct, k, ivb, mode)
-    else:
+    k, ivb = _parse_key_iv(key, key_encoding, iv, iv_encoding)
+    impl = _AES_BULK_IMPL if len(ct) >= _BULK_CT_BYTES else _AES_IMPL
+    if impl is None:
         return ""
-    return pt.decode(errors="ignore")
+    return await _decrypt(impl, ct, k, ivb, mode, plaintext_encoding)
 
 
 async def des_decrypt(
@@ -162,6 +274,7 @@ async def des_decrypt(
     iv_encoding: str = "hex",
     mode: str = "CBC",
     ctx: object | None = None,
+    plaintext_encoding: str = "utf-8",
 ) -> str:
     ct = _parse_limited(ciphertext, cipher_encoding, _MAX_CT_BYTES, "ciphertext")
     if key is None:
@@ -186,12 +299,116 @@ async def des_decrypt(
                 return ""
         else:
             return ""
-    k = _parse_limited(key, key_encoding, _MAX_KEY_BYTES, "key")
-    ivb = _parse_limited(iv, iv_encoding, _MAX_IV_BYTES, "iv") if iv else None
-    if HAS_PYCRYPTO:
-        pt = _des_pycrypto(ct, k, ivb, mode)
-    elif HAS_CRYPTOGRAPHY:
-        pt = _des_cryptography(ct, k, ivb, mode)
-    else:
+    k, ivb = _parse_key_iv(key, key_encoding, iv, iv_encoding)
+    if _DES_IMPL is None:
         return ""
-    return pt.decode(errors="ignore")
+    return await _decrypt(_DES_IMPL, ct, k, ivb, mode, plaintext_encoding)
+
+
+# Block size and accepted key lengths per batch cipher; the batch checks the
+# IV and ciphertext once up front, so only key problems are per-key.
+_BATCH_SIZES = {"AES": (16, (16, 24, 32)), "DES": (8, (8,))}
+
+
+def _decrypt_batch(
+    impl,
+    bulk_impl,
+    name: str,
+    ciphertext: str,
+    keys: list[str],
+    cipher_encoding: str,
+    key_encoding: str,
+    iv: str | None,
+    iv_encoding: str,
+    mode: str,
+    plaintext_encoding: str,
+) -> list[str]:
+    if len(keys) > _MAX_BATCH_KEYS:
+        raise ValueError(f"at most {_MAX_BATCH_KEYS} keys per batch")
+    ct = _parse_limited(ciphertext, cipher_encoding, _MAX_CT_BYTES, "ciphertext")
+    ivb = _parse_limited(iv, iv_encoding, _MAX_IV_BYTES, "iv") if iv else None
+    m = mode.upper()
+    if m not in ("ECB", "CBC"):
+        raise ValueError(f"Unsupported {name} mode")
+    block_size, key_sizes = _BATCH_SIZES[name]
+    if m == "CBC":
+        if ivb is None:
+            raise ValueError("IV is required for CBC mode")
+        if len(ivb) != block_size:
+            raise ValueError(f"IV must be {block_size} bytes long")
+    if len(ct) % block_size:
+        raise ValueError(f"Ciphertext length must be a multiple of {block_size} bytes")
+    if len(ct) >= _BULK_CT_BYTES:
+        impl = bulk_impl
+    if impl is None:
+        return [""] * len(keys)
+    out = []
+    for key in keys:
+        try:
+            k = _parse_limited(key, key_encoding, _MAX_KEY_BYTES, "key")
+        except ValueError:
+            # Malformed keys are expected in a key search.
+            out.append("")
+            continue
+        if len(k) not in key_sizes:
+            out.append("")
+            continue
+        out.append(_decode_unpadded(impl(ct, k, ivb, m), plaintext_encoding))
+    return out
+
+
+def aes_decrypt_batch(
+    ciphertext: str,
+    keys: list[str],
+    cipher_encoding: str = "hex",
+    key_encoding: str = "hex",
+    iv: str | None = None,
+    iv_encoding: str = "hex",
+    mode: str = "CBC",
+    plaintext_encoding: str = "utf-8",
+) -> list[str]:
+    """Decrypt one AES ciphertext under each of ``keys``.
+
+    The ciphertext and IV are parsed and checked once; a bad IV or ciphertext
+    length raises ``ValueError``. Keys that are malformed or have an invalid
+    length yield ``""`` instead of aborting the batch.
+    """
+    return _decrypt_batch(
+        _AES_IMPL,
+        _AES_BULK_IMPL,
+        "AES",
+        ciphertext,
+        keys,
+        cipher_encoding,
+        key_encoding,
+        iv,
+        iv_encoding,
+        mode,
+        plaintext_encoding,
+    )
+
+
+def des_decrypt_batch(
+    ciphertext: str,
+    keys: list[str],
+    cipher_encoding: str = "hex",
+    key_encoding: str = "hex",
+    iv: str | None = None,
+    iv_encoding: str = "hex",
+    mode: str = "CBC",
+    plaintext_encoding: str = "utf-8",
+) -> list[str]:
+    """Decrypt one DES ciphertext under each of ``keys``; see :func:`aes_decrypt_batch`."""
+    return _decrypt_batch(
+        _DES_IMPL,
+        _DES_IMPL,
+        "DES",
+        ciphertext,
+        keys,
+        cipher_encoding,
+        key_encoding,
+        iv,
+        iv_encoding,
+        mode,
+        plaintext_encoding,
+    )
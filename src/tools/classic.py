@@ -1,8 +1,25 @@
-from ..utils.scoring import english_score, ioc
+import itertools
+import string
+
+import numpy as np
+
+from ..utils.scoring import (
+    _ALPHA_LUT,
+    english_score_batch,
+    english_score_uncached,
+    text_to_u8,
+    top_k_indices,
+)
 from .models import BreakResult
+from .rot import _shift_candidates, _shift_text
+
+_NON_ALPHA_ASCII = bytes(c for c in range(128) if not chr(c).isalpha())
 
 
 def _letters_only(s: str) -> str:
+    if s.isascii():
+        # bytes.translate drops every non-letter in one C pass.
+        return s.encode("ascii").translate(None, _NON_ALPHA_ASCII).decode("ascii")
     return "".join(c for c in s if c.isalpha())
 
 
@@ -17,11 +34,15 @@ def _shift_char(c: str, k: int) -> str:
 def caesar_break(ciphertext: str) -> BreakResult:
     # Initialize with worst case
     best = BreakResult(algorithm="Caesar", plaintext="", key="0", confidence=0.0)
-    for k in range(26):
-        pt = "".join(_shift_char(c, k) for c in ciphertext)
-        sc = english_score(pt)
-        if sc > best.confidence:
-            best = BreakResult(algorithm="Caesar", plaintext=pt, key=str(k), confidence=sc)
+    scores = english_score_batch(_shift_candidates(ciphertext, np.arange(26)))
+    k = int(np.argmax(scores))
+    if scores[k] > 0.0:
+        best = BreakResult(
+            algorithm="Caesar",
+            plaintext=_shift_text(ciphertext, k),
+            key=str(k),
+            confidence=float(scores[k]),
+        )
     return best
 
 
@@ -56,6 +77,18 @@ _ENGLISH_FREQ = {
 }
 
 
+_ENGLISH_FREQ_VEC = np.array([_ENGLISH_FREQ[chr(c)] for c in range(97, 123)])
+# _SHIFT_WEIGHTS[shift, c] is the English frequency of letter c shifted back by shift.
+_SHIFT_WEIGHTS = _ENGLISH_FREQ_VEC[(np.arange(26)[None, :] - np.arange(26)[:, None]) % 26]
+
+
+def _letter_codes(buf: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return (0-25 letter codes, is-uppercase mask) for the ASCII letters in ``buf``."""
+    low = buf | 0x20
+    mask = (low >= ord("a")) & (low <= ord("z"))
+    return np.where(mask, low - ord("a"), 0).astype(np.int16), mask
+
+
 def _vigenere_decrypt(ciphertext: str, key: str) -> str:
     out = []
     ci = 0
@@ -69,59 +102,170 @@ def _vigenere_decrypt(ciphertext: str, key: str) -> str:
     return "".join(out)
 
 
+def _vigenere_candidates(ciphertext: str, keys: list[str]) -> np.ndarray:
+    """Decrypt ``ciphertext`` under every key at once, as a ``(len(keys), n)`` matrix."""
+    buf = text_to_u8(ciphertext)
+    codes, letters = _letter_codes(buf)
+    # Key position advances on every alphabetic character, ASCII or not.
+    pos = np.cumsum(_ALPHA_LUT[buf]) - 1
+    out = np.repeat(buf[None, :], len(keys), axis=0)
+    if not letters.any():
+        return out
+    case = buf[letters] & 0x20
+    for row, key in enumerate(keys):
+        shifts = np.frombuffer(key.encode(), dtype=np.uint8).astype(np.int16) - 65
+        k = shifts[pos[letters] % len(key)]
+        out[row, letters] = ((codes[letters] - k) % 26 + ord("A")).astype(np.uint8) | case
+    return out
+
+
 def _best_shift_frequency(column: str) -> int:
     """Return the shift that makes the column's letter frequencies closest to English."""
-    best_shift = 0
-    best_score = -1.0
-    col_lower = column.lower()
-    n = len(col_lower)
-    if n == 0:
+    buf = text_to_u8(column.lower())
+    codes = buf[(buf >= ord("a")) & (buf <= ord("z"))] - ord("a")
+    if codes.size == 0:
         return 0
-    for shift in range(26):
-        score = 0.0
-        for ch in col_lower:
-            if "a" <= ch <= "z":
-                p = (ord(ch) - ord("a") - shift) % 26
-                score += _ENGLISH_FREQ[chr(p + ord("a"))]
-        if score > best_score:
-            best_score = score
-            best_shift = shift
-    return best_shift
+    # One histogram pass, then a 26x26 product scores every shift at once.
+    hist = np.bincount(codes, minlength=26)
+    scores = _SHIFT_WEIGHTS @ hist
+    # Rounding away summation noise makes exact ties pick the lowest shift.
+    return int(np.argmax(np.round(scores, 12)))
+
+
+def _best_shifts(lowered: np.ndarray, klen: int) -> np.ndarray:
+    """Return ``_best_shift_frequency`` of all ``klen`` columns of ``lowered`` at once.
+
+    ``lowered`` is the lowercased letters-only text as bytes; a single bincount
+    over (column, letter) pairs yields every column's histogram.
+    """
+    cols = np.arange(lowered.size) % klen
+    mask = (lowered >= ord("a")) & (lowered <= ord("z"))
+    hist = np.bincount(cols[mask] * 26 + (lowered[mask] - ord("a")), minlength=klen * 26).reshape(
+        klen, 26
+    )
+    scores = hist @ _SHIFT_WEIGHTS.T
+    return np.argmax(np.round(scores, 12), axis=1)
+
+
+def _letter_ids(alpha_text: str) -> tuple[np.ndarray, int]:
+    """Map each letter to a small integer id of its lowercase form."""
+    table: dict[str, int] = {}
+    ids = np.fromiter(
+        (table.setdefault(ch.lower(), len(table)) for ch in alpha_text),
+        dtype=np.intp,
+        count=len(alpha_text),
+    )
+    return ids, len(table)
+
+
+def _column_iocs(ids: np.ndarray, vocab: int, klen: int) -> list[float]:
+    """Return ``ioc()`` of every column longer than one letter, for key length ``klen``.
+
+    Letter counts for all columns come from one bincount over (column, letter)
+    pairs instead of re-walking each column string.
+    """
+    cols = np.arange(ids.size) % klen
+    counts = np.bincount(cols * vocab + ids, minlength=klen * vocab).reshape(klen, vocab)
+    n = counts.sum(axis=1)
+    num = (counts * (counts - 1)).sum(axis=1)
+    keep = n > 1
+    return (num[keep] / (n[keep] * (n[keep] - 1))).tolist()
+
+
+def _kasiski_lengths(lowered: np.ndarray, max_len: int) -> list[int]:
+    """Return key lengths dividing most distances between repeated trigrams.
+
+    Repeats of a plaintext trigram enciphered at the same key offset sit a
+    multiple of the key length apart (Kasiski examination). Every length that
+    divides at least half as many distances as the best one is kept, so the
+    true length survives next to its divisors. Empty when nothing repeats.
+    """
+    if lowered.size < 6 or max_len < 2:
+        return []
+    b = lowered.astype(np.int64)
+    tri = (b[:-2] << 16) | (b[1:-1] << 8) | b[2:]
+    # A stable sort groups each trigram's positions in ascending order, so the
+    # gaps between neighbours in a group are the distances between repeats.
+    order = np.argsort(tri, kind="stable")
+    dists = np.diff(order)[tri[order[1:]] == tri[order[:-1]]]
+    if dists.size == 0:
+        return []
+    lengths = np.arange(2, max_len + 1)
+    counts = np.count_nonzero(dists[:, None] % lengths[None, :] == 0, axis=0)
+    if counts.max() == 0:
+        return []
+    return lengths[counts * 2 >= counts.max()].tolist()
+
+
+# Below this many letters chance trigram repeats can outvote the real ones,
+# so every key length is tried.
+_KASISKI_MIN_LETTERS = 200
+# The best IOC lengths are added to the Kasiski shortlist, unless a shortlisted
+# divisor reaches this fraction of their IOC (a multiple adds nothing).
+_IOC_KEEP = 3
+_DIVISOR_IOC = 0.85
+
+
+def _candidate_lengths(
+    ids: np.ndarray, vocab: int, lowered: np.ndarray | None, max_len: int
+) -> list[int]:
+    """Return the key lengths to try, best average column IOC first.
+
+    English columns have an IOC near 0.067 and wrong-length columns look closer
+    to random (~0.038). On long enough text the sweep is narrowed to the
+    Kasiski lengths plus the top IOC lengths; otherwise every length is kept.
+    """
+    scored = []
+    for klen in range(2, max_len + 1):
+        iocs = _column_iocs(ids, vocab, klen)
+        scored.append((klen, sum(iocs) / len(iocs) if iocs else 0.0))
+    avg = dict(scored)
+    scored.sort(key=lambda x: x[1], reverse=True)
+    ranked = [klen for klen, _ in scored]
+    if lowered is None or lowered.size < _KASISKI_MIN_LETTERS:
+        return ranked
+    shortlist = set(_kasiski_lengths(lowered, max_len))
+    if not shortlist:
+        return ranked
+    shortlist.update(
+        klen
+        for klen in ranked[:_IOC_KEEP]
+        if not any(klen % s == 0 and avg[s] >= _DIVISOR_IOC * avg[klen] for s in shortlist)
+    )
+    return [klen for klen in ranked if klen in shortlist]
 
 
 def vigenere_break(ciphertext: str, max_key_len: int = 16, top_k: int = 3) -> list[BreakResult]:
     text = ciphertext
     alpha_text = _letters_only(text)
+    max_len = min(max_key_len, len(alpha_text))
+    lower = alpha_text.lower()
+    # A few letters (e.g. "İ") change length when lowercased, which would shift
+    # column positions; only then fall back to slicing each column.
+    lowered = text_to_u8(lower) if len(lower) == len(alpha_text) else None
+
+    ids, vocab = _letter_ids(alpha_text)
+    lengths = _candidate_lengths(ids, vocab, lowered, max_len)
+
+    keys: list[str] = []
+    for klen in lengths:
+        if lowered is not None:
+            key_str = (_best_shifts(lowered, klen) + 65).astype(np.uint8).tobytes().decode()
+        else:
+            cols = [alpha_text[i::klen] for i in range(klen)]
+            key_str = "".join(chr(_best_shift_frequency(col) + 65) for col in cols)
+        if key_str not in keys:
+            keys.append(key_str)
 
-    # Rank key lengths by average column IOC. English text has IOC ~0.067,
-    # while Vigenère columns with the wrong key length look closer to random (~0.038).
-    key_len_scores: list[tuple[int, float]] = []
-    for klen in range(2, min(max_key_len, len(alpha_text)) + 1):
-        cols = [alpha_text[i::klen] for i in range(klen)]
-        iocs = [ioc(c) for c in cols if len(c) > 1]
-        avg_ioc = sum(iocs) / len(iocs) if iocs else 0.0
-        key_len_scores.append((klen, avg_ioc))
-
-    # Try all key lengths, but prioritize those with higher IOC.
-    key_len_scores.sort(key=lambda x: x[1], reverse=True)
-
-    cands: list[tuple[str, float, str]] = []
-    seen_keys: set[str] = set()
-    for klen, _ in key_len_scores:
-        cols = [alpha_text[i::klen] for i in range(klen)]
-        key_chars = [chr(_best_shift_frequency(col) + 65) for col in cols]
-        key_str = "".join(key_chars)
-        if key_str in seen_keys:
-            continue
-        seen_keys.add(key_str)
-        pt = _vigenere_decrypt(text, key_str)
-        sc = english_score(pt)
-        cands.append((key_str, sc, pt))
-
-    cands.sort(key=lambda x: x[1], reverse=True)
+    scores = english_score_batch(_vigenere_candidates(text, keys))
     return [
-        BreakResult(algorithm="Vigenere", plaintext=pt, key=key, confidence=sc)
-        for key, sc, pt in cands[:top_k]
+        BreakResult(
+            algorithm="Vigenere",
+            plaintext=_vigenere_decrypt(text, keys[i]),
+            key=keys[i],
+            confidence=float(scores[i]),
+        )
+        for i in top_k_indices(scores, top_k)
     ]
 
 
@@ -132,74 +276,72 @@ def _affine_inv(a: int) -> int | None:
     return None
 
 
+# Every (a, b) affine key with an invertible a, in the order they are reported.
+_AFFINE_KEYS = [(a, b) for a in range(1, 26) if _affine_inv(a) is not None for b in range(26)]
+_AFFINE_MAPS = np.array(
+    [[(_affine_inv(a) * (x - b)) % 26 for x in range(26)] for a, b in _AFFINE_KEYS],
+    dtype=np.uint8,
+)
+
+
 def affine_break(ciphertext: str, top_k: int = 3) -> list[BreakResult]:
+    buf = text_to_u8(ciphertext)
+    codes, letters = _letter_codes(buf)
+    cands = np.repeat(buf[None, :], len(_AFFINE_KEYS), axis=0)
+    cands[:, letters] = (_AFFINE_MAPS[:, codes[letters]] + ord("A")) | (buf[letters] & 0x20)
+    scores = english_score_batch(cands)
     out: list[BreakResult] = []
-    for a in range(1, 26):
-        inv = _affine_inv(a)
-        if inv is None:
-            continue
-        for b in range(26):
-            res = []
-            for ch in ciphertext:
-                if "A" <= ch <= "Z":
-                    x = ord(ch) - 65
-                    p = (inv * (x - b)) % 26
-                    res.append(chr(p + 65))
-                elif "a" <= ch <= "z":
-                    x = ord(ch) - 97
-                    p = (inv * (x - b)) % 26
-                    res.append(chr(p + 97))
-                else:
-                    res.append(ch)
-            pt = "".join(res)
-            sc = english_score(pt)
-            out.append(
-                BreakResult(algorithm="Affine", plaintext=pt, key=f"a={a},b={b}", confidence=sc)
+    for i in top_k_indices(scores, top_k):
+        a, b = _AFFINE_KEYS[i]
+        up = "".join(chr(p + 65) for p in _AFFINE_MAPS[i])
+        table = str.maketrans(string.ascii_uppercase + string.ascii_lowercase, up + up.lower())
+        out.append(
+            BreakResult(
+                algorithm="Affine",
+                plaintext=ciphertext.translate(table),
+                key=f"a={a},b={b}",
+                confidence=float(scores[i]),
             )
-    out.sort(key=lambda x: x.confidence, reverse=True)
-    return out[:top_k]
+        )
+    return out
+
+
+def _rail_pattern(n: int, rails: int) -> np.ndarray:
+    """Return the rail index of each position in a zig-zag over ``rails`` rails."""
+    cycle = 2 * (rails - 1)
+    r = np.arange(n) % cycle
+    return np.minimum(r, cycle - r)
 
 
-def _rail_pattern(n: int, rails: int) -> list[int]:
-    idx = []
-    r = 0
-    d = 1
-    for _i in range(n):
-        idx.append(r)
-        r += d
-        if r == rails - 1:
-            d = -1
-        if r == 0:
-            d = 1
-    return idx
+def _rail_order(n: int, rails: int) -> np.ndarray:
+    """Return the plaintext position of each ciphertext character."""
+    return np.argsort(_rail_pattern(n, rails), kind="stable")
 
 
 def rail_fence_decrypt(ciphertext: str, rails: int) -> str:
-    n = len(ciphertext)
-    pat = _rail_pattern(n, rails)
-    positions: list[list[int]] = [[] for _ in range(rails)]
-    for i, r in enumerate(pat):
-        positions[r].append(i)
-    res = [""] * n
-    pos_idx = 0
-    for r in range(rails):
-        for i in positions[r]:
-            res[i] = ciphertext[pos_idx]
-            pos_idx += 1
-    out = []
-    for i in range(n):
-        out.append(res[i])
-    return "".join(out)
+    res = [""] * len(ciphertext)
+    for ch, i in zip(ciphertext, _rail_order(len(ciphertext), rails), strict=True):
+        res[i] = ch
+    return "".join(res)
 
 
 def rail_fence_break(ciphertext: str, max_rails: int = 10, top_k: int = 3) -> list[BreakResult]:
-    out: list[BreakResult] = []
-    for rails in range(2, max_rails + 1):
-        pt = rail_fence_decrypt(ciphertext, rails)
-        sc = english_score(pt)
-        out.append(BreakResult(algorithm="RailFence", plaintext=pt, key=str(rails), confidence=sc))
-    out.sort(key=lambda x: x.confidence, reverse=True)
-    return out[:top_k]
+    buf = text_to_u8(ciphertext)
+    n = buf.size
+    rails = np.arange(2, max_rails + 1)
+    cands = np.empty((len(rails), n), dtype=np.uint8)
+    for row, r in enumerate(rails):
+        cands[row, _rail_order(n, int(r))] = buf
+    scores = english_score_batch(cands)
+    return [
+        BreakResult(
+            algorithm="RailFence",
+            plaintext=rail_fence_decrypt(ciphertext, int(rails[i])),
+            key=str(int(rails[i])),
+            confidence=float(scores[i]),
+        )
+        for i in top_k_indices(scores, top_k)
+    ]
 
 
 def _column_lengths(n: int, k: int) -> list[int]:
@@ -228,24 +370,47 @@ def columnar_transposition_decrypt(ciphertext: str, key_order: list[int]) -> str
     return "".join(rows)
 
 
-def transposition_break(ciphertext: str, max_key_len: int = 5, top_k: int = 3) -> list[BreakResult]:
-    import itertools
+def _transposition_candidates(ciphertext: str, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Decrypt under every width-``k`` column order at once.
 
-    out: list[BreakResult] = []
+    Returns the ``(k!, k)`` permutations and the matching ``(k!, n)`` plaintext
+    matrix. Plaintext position ``p`` sits in row ``p // k`` of column ``p % k``,
+    and each column is a contiguous run of the ciphertext, so every candidate
+    is a single gather from the ciphertext bytes.
+    """
+    buf = text_to_u8(ciphertext)
+    perms = np.array(list(itertools.permutations(range(k))), dtype=np.intp)
+    lens = np.array(_column_lengths(buf.size, k), dtype=np.intp)
+    # Columns are read in key order: perm[j] is where column j is read.
+    read_lens = lens[np.argsort(perms, axis=1)]
+    read_starts = np.cumsum(read_lens, axis=1) - read_lens
+    starts = np.take_along_axis(read_starts, perms, axis=1)
+    p = np.arange(buf.size)
+    return perms, buf[starts[:, p % k] + p // k]
+
+
+def transposition_break(ciphertext: str, max_key_len: int = 5, top_k: int = 3) -> list[BreakResult]:
+    keys: list[np.ndarray] = []
+    score_parts: list[np.ndarray] = []
     for k in range(2, max_key_len + 1):
-        for perm in itertools.permutations(range(k)):
-            pt = columnar_transposition_decrypt(ciphertext, list(perm))
-            sc = english_score(pt)
-            out.append(
-                BreakResult(
-                    algorithm="Transposition",
-                    plaintext=pt,
-                    key="-".join(str(x) for x in perm),
-                    confidence=sc,
-                )
+        perms, cands = _transposition_candidates(ciphertext, k)
+        keys.extend(perms)
+        score_parts.append(english_score_batch(cands))
+    if not score_parts:
+        return []
+    scores = np.concatenate(score_parts)
+    out: list[BreakResult] = []
+    for i in top_k_indices(scores, top_k):
+        perm = keys[i].tolist()
+        out.append(
+            BreakResult(
+                algorithm="Transposition",
+                plaintext=columnar_transposition_decrypt(ciphertext, perm),
+                key="-".join(str(x) for x in perm),
+                confidence=float(scores[i]),
             )
-    out.sort(key=lambda x: x.confidence, reverse=True)
-    return out[:top_k]
+        )
+    return out
 
 
 def playfair_decrypt(ciphertext: str, key_hint: str) -> str:
@@ -304,5 +469,5 @@ def playfair_break(
     if not key_hint:
         return [BreakResult(algorithm="Playfair", plaintext="", key=None, confidence=0.0)]
     pt = playfair_decrypt(ciphertext, key_hint)
-    sc = english_score(pt)
+    sc = english_score_uncached(pt)
     return [BreakResult(algorithm="Playfair", plaintext=pt, key=key_hint, confidence=sc)]
@@ -1,11 +1,41 @@
 import base64
+import heapq
+import re
+from functools import lru_cache
 from urllib.parse import unquote
 
-from ..utils.scoring import english_score
+from ..utils.scoring import english_score_uncached
 from .models import DetectionCandidate
 
+try:
+    import pybase64
+
+    HAS_PYBASE64 = True
+except ImportError:
+    HAS_PYBASE64 = False
+
+# Cheap charset prechecks so each decoder only runs (and raises) on plausible input.
+_BASE64_RE = re.compile(r"[A-Za-z0-9+/]*=*")
+_BASE32_RE = re.compile(r"[A-Za-z2-7]*=*")
+_BASE16_RE = re.compile(r"[0-9A-Fa-f]*")
+_HEX_RE = re.compile(r"[0-9A-Fa-f \t\n\r\f\v]*")
+_B85_RE = re.compile(r"[0-9A-Za-z!#$%&()*+\-;<=>?@^_`{|}~]*")
+
 
 def _try_decode_base64(s: str) -> str | None:
+    # Every prefix of valid input matches the charset too, so a short prefix
+    # rejects most non-base64 text without scanning all of it.
+    if not _BASE64_RE.fullmatch(s[:64]):
+        return None
+    if HAS_PYBASE64:
+        # SIMD strict decode; it only rejects some odd padding the stdlib
+        # accepts, and those inputs fall through to the stdlib path below.
+        try:
+            return pybase64.b64decode(s, validate=True).decode(errors="ignore")
+        except Exception:
+            pass
+    if not _BASE64_RE.fullmatch(s):
+        return None
     try:
         return base64.b64decode(s, validate=True).decode(errors="ignore")
     except Exception:
@@ -13,6 +43,8 @@ def _try_decode_base64(s: str) -> str | None:
 
 
 def _try_decode_base32(s: str) -> str | None:
+    if not _BASE32_RE.fullmatch(s):
+        return None
     try:
         return base64.b32decode(s, casefold=True).decode(errors="ignore")
     except Exception:
@@ -20,6 +52,8 @@ def _try_decode_base32(s: str) -> str | None:
 
 
 def _try_decode_base16(s: str) -> str | None:
+    if not _BASE16_RE.fullmatch(s):
+        return None
     try:
         return base64.b16decode(s, casefold=True).decode(errors="ignore")
     except Exception:
@@ -27,6 +61,8 @@ def _try_decode_base16(s: str) -> str | None:
 
 
 def _try_decode_b85(s: str) -> str | None:
+    if not _B85_RE.fullmatch(s):
+        return None
     try:
         return base64.b85decode(s).decode(errors="ignore")
     except Exception:
@@ -34,6 +70,8 @@ def _try_decode_b85(s: str) -> str | None:
 
 
 def _try_decode_hex(s: str) -> str | None:
+    if not _HEX_RE.fullmatch(s):
+        return None
     try:
         return bytes.fromhex(s).decode(errors="ignore")
     except Exception:
@@ -41,6 +79,8 @@ def _try_decode_hex(s: str) -> str | None:
 
 
 def _try_decode_url(s: str) -> str | None:
+    if "%" not in s:
+        return None
     try:
         t = unquote(s)
         if t != s:
@@ -51,6 +91,9 @@ def _try_decode_url(s: str) -> str | None:
 
 
 def _try_decode_unicode_escape(s: str) -> str | None:
+    # Plain ASCII without backslashes decodes to itself.
+    if s.isascii() and "\\" not in s:
+        return s
     try:
         return s.encode("utf-8").decode("unicode_escape")
     except Exception:
@@ -84,28 +127,53 @@ DECODERS = [
 ]
 
 
-def detect_encoding(text: str, top_k: int = 5) -> list[DetectionCandidate]:
-    cands: list[DetectionCandidate] = []
+# Inputs longer than this are probed without memoizing, so the probe cache
+# cannot pin many large payloads in memory.
+_PROBE_CACHE_MAX_CHARS = 1 << 16
+
+
+def _probe_uncached(text: str) -> tuple[tuple[str, str, float], ...]:
+    # Repeat inputs are already served whole by the probe cache, so scoring
+    # through english_score's LRU would only hash (and pin) every decoding.
+    out = []
     for name, fn in DECODERS:
         decoded = fn(text)
         if decoded is not None:
-            score = english_score(decoded)
-            cands.append(DetectionCandidate(name=name, score=score, decoded=decoded))
-    cands.sort(key=lambda x: x.score, reverse=True)
-    return cands[:top_k]
+            out.append((name, decoded, english_score_uncached(decoded)))
+    return tuple(out)
+
+
+_probe_cached = lru_cache(maxsize=256)(_probe_uncached)
+
+
+def _probe_all(text: str) -> tuple[tuple[str, str, float], ...]:
+    """Return ``(name, decoded, score)`` for every decoder accepting ``text``.
+
+    detect_encoding and decode_common share this, so an agent calling both
+    on the same input runs each decoder only once.
+    """
+    if len(text) > _PROBE_CACHE_MAX_CHARS:
+        return _probe_uncached(text)
+    return _probe_cached(text)
+
+
+def detect_encoding(text: str, top_k: int = 5) -> list[DetectionCandidate]:
+    cands = [
+        DetectionCandidate(name=name, score=score, decoded=decoded)
+        for name, decoded, score in _probe_all(text)
+    ]
+    return heapq.nlargest(top_k, cands, key=lambda x: x.score)
 
 
 def decode_common(text: str, limit: int = 10) -> list[DetectionCandidate]:
     seen = {}
     out: list[DetectionCandidate] = []
-    for name, fn in DECODERS:
-        decoded = fn(text)
-        if decoded is not None:
-            if decoded in seen:
-                continue
-            seen[decoded] = True
-            out.append(DetectionCandidate(name=name, score=english_score(decoded), decoded=decoded))
-            if len(out) >= limit:
-                break
+    for name, decoded, score in _probe_all(text):
+        if decoded in seen:
+            continue
+        seen[decoded] = True
+        out.append(DetectionCandidate(name=name, score=score, decoded=decoded))
+        if len(out) >= limit:
+            break
     out.sort(key=lambda x: x.score, reverse=True)
     return out
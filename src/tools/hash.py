@@ -1,22 +1,25 @@
+import re
+
+# Hex digest lengths of the common hash functions.
+_HEX_HASHES = {
+    32: "MD5",
+    40: "SHA1",
+    56: "SHA224",
+    64: "SHA256",
+    96: "SHA384",
+    128: "SHA512",
+}
+_HEX_RE = re.compile(r"[0-9a-fA-F]*")
+_B64_RE = re.compile(r"[A-Za-z0-9+/=]*")
+
+
 def hash_identify(text: str) -> list[str]:
     s = text.strip()
     out: list[str] = []
-    hexchars = set("0123456789abcdefABCDEF")
-    is_hex = all(c in hexchars for c in s)
-    if is_hex:
-        if len(s) == 32:
-            out.append("MD5")
-        if len(s) == 40:
-            out.append("SHA1")
-        if len(s) == 56:
-            out.append("SHA224")
-        if len(s) == 64:
-            out.append("SHA256")
-        if len(s) == 96:
-            out.append("SHA384")
-        if len(s) == 128:
-            out.append("SHA512")
-    b64chars = set("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=")
-    if all(c in b64chars for c in s):
+    # One compiled scan per charset; hex input is always base64-like too.
+    is_hex = _HEX_RE.fullmatch(s) is not None
+    if is_hex and len(s) in _HEX_HASHES:
+        out.append(_HEX_HASHES[len(s)])
+    if is_hex or _B64_RE.fullmatch(s):
         out.append("Base64-like")
     return out
@@ -1,10 +1,24 @@
+import atexit
+import itertools
+import math
+import multiprocessing
+import os
 import random
 import shutil
 import subprocess
-from functools import lru_cache
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import cache, lru_cache
 
 from .models import FactorResult
 
+try:
+    import gmpy2
+
+    HAS_GMPY2 = True
+except ImportError:
+    HAS_GMPY2 = False
+
 # Safety limits: prevent malicious or accidental resource exhaustion.
 _MAX_FACTOR_BITS = 4096
 _MAX_POLLARD_RHO_ITERS = 100000
@@ -22,6 +36,8 @@ def _powmod(a: int, d: int, n: int) -> int:
 def _is_probable_prime(n: int) -> bool:
     if n < 2:
         return False
+    if HAS_GMPY2:
+        return bool(gmpy2.is_prime(n))
     small = [2, 3, 5, 7, 11, 13, 17, 19, 23]
     for p in small:
         if n % p == 0:
@@ -31,7 +47,8 @@ def _is_probable_prime(n: int) -> bool:
     while d % 2 == 0:
         d //= 2
         s += 1
-    bases = [2, 3, 5, 7, 11]
+    # These bases make the test deterministic below 3.3 * 10**24 (past 2**64).
+    bases = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37]
     for a in bases:
         if a % n == 0:
             continue
@@ -50,50 +67,163 @@ def _is_probable_prime(n: int) -> bool:
     return True
 
 
-def _gcd(a: int, b: int) -> int:
-    while b:
-        a, b = b, a % b
-    return a
+# Brent's variant multiplies this many |x - y| terms together (mod n) before
+# taking one gcd, instead of a gcd per step.
+_RHO_BATCH = 128
+# Independent walks (fresh start and constant) tried before giving up.
+_RHO_RESTARTS = 10
+# Cofactors of at least this many bits run their walks on a process pool when
+# there is more than one CPU. Trial division leaves no factor up to
+# _TRIAL_LIMIT, so smaller cofactors split within milliseconds and spawning
+# would cost more.
+# There is no GPU backend: walks need multi-limb mul-mod, which no optional
+# dependency here provides on device, and the pool already races the walks.
+_PARALLEL_RHO_BITS = 64
+
+
+def _rho_walk(n: int, y: int, c: int, job: int | None = None) -> int | None:
+    """One Brent walk of ``x -> x*x + c`` from ``y``; a factor of n, or None.
+
+    One map evaluation per step (Floyd needs three), with the gcds batched
+    over ``_RHO_BATCH`` steps. If a batch overshoots to ``gcd == n``, its
+    steps are replayed one gcd at a time. A pool walk for ``job`` gives up
+    once the pool's current job has moved on.
+    """
+    # GMP integers make the modular squaring and gcd in the inner loop native.
+    mpz, gcd = (gmpy2.mpz, gmpy2.gcd) if HAS_GMPY2 else (int, math.gcd)
+    m = mpz(n)
+    y = x = ys = mpz(y)
+    g = q = mpz(1)
+    r = 1
+    iters = 0
+    while g == 1 and iters < _MAX_POLLARD_RHO_ITERS:
+        if job is not None and _RHO_JOB.value != job:
+            return None
+        x = y
+        for _ in range(r):
+            y = (y * y + c) % m
+        k = 0
+        while k < r and g == 1:
+            if job is not None and _RHO_JOB.value != job:
+                return None
+            ys = y
+            for _ in range(min(_RHO_BATCH, r - k)):
+                y = (y * y + c) % m
+                q = q * abs(x - y) % m
+            g = gcd(q, m)
+            k += _RHO_BATCH
+        iters += 2 * r
+        r *= 2
+    if g == m:
+        g = mpz(1)
+        while g == 1:
+            ys = (ys * ys + c) % m
+            g = gcd(abs(x - ys), m)
+    return int(g) if 1 < g < n else None
+
+
+def _rho_seeds(n: int) -> list[tuple[int, int]]:
+    # Random (start, constant) pairs; c avoids 0 and -2, whose maps degenerate.
+    return [(random.randrange(2, n - 1), random.randrange(1, n - 2)) for _ in range(_RHO_RESTARTS)]
+
+
+# In pool workers, the shared id of the job whose walks may keep running;
+# walks compare it with their own job once per gcd batch.
+_RHO_JOB = None
+# One factorization uses the pool at a time, so a job's exit only stops its
+# own walks.
+_RHO_POOL_LOCK = threading.Lock()
+
+
+def _init_rho_worker(current_job) -> None:
+    global _RHO_JOB
+    _RHO_JOB = current_job
+
+
+@cache
+def _rho_pool() -> tuple[ProcessPoolExecutor, object]:
+    # Spawned, not forked: the server process runs other tools on threads.
+    ctx = multiprocessing.get_context("spawn")
+    current_job = ctx.RawValue("q", 0)
+    pool = ProcessPoolExecutor(
+        mp_context=ctx, initializer=_init_rho_worker, initargs=(current_job,)
+    )
+    atexit.register(pool.shutdown, cancel_futures=True)
+    return pool, current_job
+
+
+def _parallel_rho(n: int) -> int | None:
+    # Walks with different constants are independent, so each runs in its own
+    # process and the first factor found wins. On any exit, queued walks are
+    # cancelled and the job id moves on, so running walks stop within a batch
+    # instead of keeping the workers busy after the tool returns.
+    pool, current_job = _rho_pool()
+    with _RHO_POOL_LOCK:
+        job = current_job.value = current_job.value + 1
+        pending = {pool.submit(_rho_walk, n, y, c, job) for y, c in _rho_seeds(n)}
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    d = fut.result()
+                    if d is not None:
+                        return d
+            return None
+        finally:
+            current_job.value = job + 1
+            for fut in pending:
+                fut.cancel()
 
 
 def _pollards_rho(n: int) -> int | None:
     """Return a non-trivial factor of n, or None if no factor is found quickly."""
     if n % 2 == 0:
         return 2
-    for _restart in range(10):
-        x = random.randrange(2, n - 1)
-        y = x
-        c = random.randrange(1, n - 1)
-        d = 1
-        iters = 0
-        while d == 1 and iters < _MAX_POLLARD_RHO_ITERS:
-            x = (_mul(x, x, n) + c) % n
-            y = (_mul(y, y, n) + c) % n
-            y = (_mul(y, y, n) + c) % n
-            d = _gcd(abs(x - y), n)
-            iters += 1
-        if 1 < d < n:
+    if (os.cpu_count() or 1) > 1 and n.bit_length() >= _PARALLEL_RHO_BITS:
+        try:
+            return _parallel_rho(n)
+        except Exception:
+            # A broken pool is dropped so a later call can start a fresh one.
+            _rho_pool()[0].shutdown(wait=False, cancel_futures=True)
+            _rho_pool.cache_clear()
+    for y, c in _rho_seeds(n):
+        d = _rho_walk(n, y, c)
+        if d is not None:
             return d
     return None
 
 
-def _trial_division(n: int, limit: int = 100000) -> list[int]:
+def _primes_upto(limit: int) -> tuple[int, ...]:
+    """Return every prime ``<= limit`` (sieve of Eratosthenes)."""
+    sieve = bytearray([1]) * (limit + 1)
+    sieve[:2] = b"\x00\x00"
+    for i in range(2, math.isqrt(limit) + 1):
+        if sieve[i]:
+            sieve[i * i :: i] = bytes(len(range(i * i, limit + 1, i)))
+    return tuple(itertools.compress(range(limit + 1), sieve))
+
+
+# Trial division divides by primes only, taken from a table built once at
+# import (9592 primes, a few ms) instead of walking a wheel of candidates.
+_TRIAL_LIMIT = 100000
+_SMALL_PRIMES = _primes_upto(_TRIAL_LIMIT)
+# After 2 and then every this many primes, stop early once the cofactor is
+# prime, so prime inputs skip the table entirely.
+_PRIME_CHECK_EVERY = 64
+
+
+def _trial_division(n: int, limit: int = _TRIAL_LIMIT) -> tuple[list[int], int]:
+    """Strip factors up to ``limit``; return them and the remaining cofactor."""
     res = []
-    while n % 2 == 0:
-        res.append(2)
-        n //= 2
-    f = 3
-    while f * f <= n and f <= limit:
-        while n % f == 0:
-            res.append(f)
-            n //= f
-        f += 2
-        # Early termination: if n is prime, stop
-        if n > 1 and n < 1000000 and _is_probable_prime(n):
+    for i, p in enumerate(_SMALL_PRIMES):
+        if p * p > n or p > limit:
             break
-    if n > 1:
-        res.append(n)
-    return res
+        while n % p == 0:
+            res.append(p)
+            n //= p
+        if i % _PRIME_CHECK_EVERY == 0 and _is_probable_prime(n):
+            break
+    return res, n
 
 
 def _factor_recursive(n: int, out: list[int]) -> None:
@@ -112,14 +242,9 @@ def _factor_recursive(n: int, out: list[int]) -> None:
 
 
 def _factor_internal(n: int) -> list[int]:
-    res = []
-    td = _trial_division(n)
-    for v in td:
-        res.append(v)
-    rem = 1
-    for v in td:
-        rem *= v
-    m = n // rem
+    res, m = _trial_division(n)
+    # The cofactor is either prime or has only factors above the trial limit,
+    # which Pollard's rho splits.
     if m > 1:
         _factor_recursive(m, res)
     res.sort()
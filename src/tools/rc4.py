@@ -1,7 +1,37 @@
 import base64
 
+import numpy as np
 from pydantic import BaseModel
 
+from ..utils.scoring_nb import HAS_NUMBA
+
+try:
+    from Crypto.Cipher import ARC4 as PYCARC4
+
+    HAS_PYCRYPTO = True
+except Exception:
+    HAS_PYCRYPTO = False
+
+if HAS_NUMBA:
+    from numba import njit
+
+    @njit(cache=True)
+    def _keystream_nb(s, n):
+        out = np.empty(n, dtype=np.uint8)
+        i = 0
+        j = 0
+        for x in range(n):
+            i = (i + 1) & 0xFF
+            j = (j + s[i]) & 0xFF
+            t = s[i]
+            s[i] = s[j]
+            s[j] = t
+            out[x] = s[(s[i] + s[j]) & 0xFF]
+        return out
+
+else:
+    _keystream_nb = None
+
 
 def _parse(data: str, enc: str) -> bytes:
     if enc == "hex":
@@ -11,24 +41,37 @@ def _parse(data: str, enc: str) -> bytes:
     return data.encode()
 
 
-def rc4(data: bytes, key: bytes) -> bytes:
-    s = list(range(256))
-    j = 0
-    for i in range(256):
-        j = (j + s[i] + key[i % len(key)]) % 256
-        s[i], s[j] = s[j], s[i]
+def _keystream_py(s: list[int], n: int) -> bytes:
     i = 0
     j = 0
-    out = bytearray()
-    for b in data:
+    out = bytearray(n)
+    for x in range(n):
         i = (i + 1) % 256
         j = (j + s[i]) % 256
         s[i], s[j] = s[j], s[i]
-        k = s[(s[i] + s[j]) % 256]
-        out.append(b ^ k)
+        out[x] = s[(s[i] + s[j]) % 256]
     return bytes(out)
 
 
+def rc4(data: bytes, key: bytes) -> bytes:
+    if HAS_PYCRYPTO and key:
+        # Only the first 256 key bytes feed the KSA, which is also the longest
+        # key pycryptodome's C implementation accepts.
+        return PYCARC4.new(key[:256]).decrypt(data)
+    s = list(range(256))
+    j = 0
+    for i in range(256):
+        j = (j + s[i] + key[i % len(key)]) % 256
+        s[i], s[j] = s[j], s[i]
+    # Without pycryptodome: the PRGA is inherently serial; run it natively when
+    # Numba is available and apply the keystream with a single vectorized XOR.
+    if _keystream_nb is not None:
+        ks = _keystream_nb(np.array(s, dtype=np.int64), len(data))
+    else:
+        ks = np.frombuffer(_keystream_py(s, len(data)), dtype=np.uint8)
+    return (np.frombuffer(data, dtype=np.uint8) ^ ks).tobytes()
+
+
 class RC4Params(BaseModel):
     key: str
     key_encoding: str = "raw"
@@ -1,20 +1,57 @@
-from ..utils.scoring import english_score
+import string
+
+import numpy as np
+
+from ..utils.scoring import english_score_batch, text_to_u8, top_k_indices
 from .models import BreakResult
 
+# _ROT_LUT[k, c] is byte c shifted back by k places (non-letters map to themselves).
+_ROT_LUT = np.tile(np.arange(256, dtype=np.uint8), (26, 1))
+for _k in range(26):
+    for _base in (ord("A"), ord("a")):
+        _ROT_LUT[_k, _base : _base + 26] = _base + (np.arange(26) - _k) % 26
+_ROT_LUT.setflags(write=False)
+del _k, _base
+
+
+def _shift_candidates(text: str, shifts: np.ndarray) -> np.ndarray:
+    """Return a ``(len(shifts), len(text))`` matrix of ``text`` shifted back by each key."""
+    # take() gathers each table row along the text; broadcasting both index
+    # arrays through one fancy index was 4-5x slower on long inputs.
+    return _ROT_LUT[shifts].take(text_to_u8(text), axis=1)
+
+
+# Per-shift translation tables for rebuilding plaintext strings: a 256-byte
+# table for the common ASCII case and a str table for everything else.
+_ROT_BYTES = [row.tobytes() for row in _ROT_LUT]
+_ROT_STR = [
+    str.maketrans(
+        string.ascii_letters,
+        "".join(chr(c) for c in _ROT_LUT[k, [ord(ch) for ch in string.ascii_letters]]),
+    )
+    for k in range(26)
+]
+
+
+def _shift_text(text: str, k: int) -> str:
+    k %= 26
+    if text.isascii():
+        return text.encode("ascii").translate(_ROT_BYTES[k]).decode("ascii")
+    return text.translate(_ROT_STR[k])
+
 
 def rot_all(text: str, top_k: int = 3) -> list[BreakResult]:
+    shifts = np.arange(1, 26)
+    scores = english_score_batch(_shift_candidates(text, shifts))
     results: list[BreakResult] = []
-    for k in range(1, 26):
-        out = []
-        for c in text:
-            if "A" <= c <= "Z":
-                out.append(chr((ord(c) - 65 - k) % 26 + 65))
-            elif "a" <= c <= "z":
-                out.append(chr((ord(c) - 97 - k) % 26 + 97))
-            else:
-                out.append(c)
-        pt = "".join(out)
-        score = english_score(pt)
-        results.append(BreakResult(algorithm=f"ROT{k}", plaintext=pt, key=str(k), confidence=score))
-    results.sort(key=lambda x: x.confidence, reverse=True)
-    return results[:top_k]
+    for i in top_k_indices(scores, top_k):
+        k = int(shifts[i])
+        results.append(
+            BreakResult(
+                algorithm=f"ROT{k}",
+                plaintext=_shift_text(text, k),
+                key=str(k),
+                confidence=float(scores[i]),
+            )
+        )
+    return results
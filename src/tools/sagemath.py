@@ -7,12 +7,25 @@ SageMath is a free open-source mathematics software system based on Python.
 Install from: https://www.sagemath.org/
 """
 
+import atexit
+import math
+import multiprocessing
+import os
+import queue
 import re
 import shutil
 import subprocess
+import threading
+import time
+from collections import Counter
 from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache, lru_cache
+from math import isqrt
 from typing import Any
 
+from .number import _factor_internal, _is_probable_prime
+
 # Check if SageMath is available
 _SAGE_BINARY = shutil.which("sage") or shutil.which("sage.exe") or shutil.which("sagemath")
 HAS_SAGEMATH = _SAGE_BINARY is not None
@@ -31,12 +44,159 @@ def _check_size(value: int, name: str) -> str | None:
     return None
 
 
-def _run_sage(code: str, timeout: int = 30) -> str | None:
+def _check_prime(value: int, name: str = "p") -> str | None:
+    # GF(p) raises inside Sage for a composite p; rejecting it here saves a
+    # round-trip to the worker for input that can never succeed.
+    if not _is_probable_prime(value):
+        return f"{name} must be prime"
+    return None
+
+
+# Worker loop for _SageSession. Each request is a length-prefixed script; the
+# reply is its captured stdout, length-prefixed the same way. ``sage.all`` is
+# imported once and every script runs in a fresh copy of its namespace, which
+# shares one ``_session_cache`` dict for state worth keeping between scripts.
+# Compiled scripts are kept by source text, so a script the caller's memo has
+# evicted (or re-sent under another timeout) skips compilation.
+_SESSION_DRIVER = r"""
+import contextlib, io, sys
+with contextlib.redirect_stdout(io.StringIO()):
+    try:
+        import sage.all
+        _BASE = {k: v for k, v in vars(sage.all).items() if not k.startswith("_")}
+    except ImportError:
+        _BASE = {}
+_BASE["_session_cache"] = {}
+_compiled = {}
+_in, _out = sys.stdin.buffer, sys.stdout.buffer
+# Scripts must not read the request stream.
+sys.stdin = io.StringIO()
+while True:
+    header = _in.readline()
+    if not header:
+        break
+    code = _in.read(int(header)).decode()
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        try:
+            obj = _compiled.get(code)
+            if obj is None:
+                obj = compile(code, "<sage-script>", "exec")
+                if len(_compiled) >= 64:
+                    _compiled.pop(next(iter(_compiled)))
+                _compiled[code] = obj
+            exec(obj, {**_BASE, "__name__": "__main__"})
+        except BaseException:
+            pass
+    data = buf.getvalue().encode()
+    _out.write(b"%d\n" % len(data) + data)
+    _out.flush()
+"""
+
+
+class _SageSession:
+    """A long-lived Sage worker process that runs scripts one at a time.
+
+    Starting Sage and importing ``sage.all`` takes seconds, so the worker pays
+    that once instead of on every call. A script that times out kills the
+    worker; the next call starts a new one.
+    """
+
+    def __init__(self, cmd: list[str]) -> None:
+        self._cmd = cmd
+        self._proc: subprocess.Popen[bytes] | None = None
+        self._lock = threading.Lock()
+
+    def run(self, code: str, timeout: float) -> str:
+        with self._lock:
+            if self._proc is None or self._proc.poll() is not None:
+                self._proc = subprocess.Popen(
+                    self._cmd,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                )
+            proc = self._proc
+            assert proc.stdin is not None and proc.stdout is not None
+            stdout = proc.stdout
+            replies: queue.Queue[bytes | None] = queue.Queue(maxsize=1)
+
+            def read_reply() -> None:
+                try:
+                    size = int(stdout.readline())
+                    data = stdout.read(size)
+                    replies.put(data if len(data) == size else None)
+                except Exception:
+                    replies.put(None)
+
+            payload = code.encode()
+            try:
+                proc.stdin.write(b"%d\n" % len(payload) + payload)
+                proc.stdin.flush()
+                threading.Thread(target=read_reply, daemon=True).start()
+                reply = replies.get(timeout=timeout)
+            except queue.Empty:
+                self._stop()
+                raise subprocess.TimeoutExpired(self._cmd, timeout) from None
+            except OSError:
+                self._stop()
+                raise
+            if reply is None:
+                self._stop()
+                raise RuntimeError("Sage worker exited unexpectedly")
+            return reply.decode(errors="replace")
+
+    def close(self) -> None:
+        with self._lock:
+            self._stop()
+
+    def _stop(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is not None:
+            proc.kill()
+            proc.wait()
+            for pipe in (proc.stdin, proc.stdout):
+                if pipe is not None:
+                    pipe.close()
+
+
+@cache
+def _sage_session() -> _SageSession:
+    session = _SageSession([str(_SAGE_BINARY), "--python", "-c", _SESSION_DRIVER])
+    atexit.register(session.close)
+    return session
+
+
+class _UncachedOutputError(Exception):
+    """Carries a script's output past the memo when it must not be cached."""
+
+    def __init__(self, output: str) -> None:
+        super().__init__(output)
+        self.output = output
+
+
+@lru_cache(maxsize=128)
+def _sage_output(code: str, timeout: int) -> str:
+    # Only deterministic scripts come here, so their output is a function of
+    # (code, timeout). Failures and ERROR: reports raise and are not cached.
+    output = _sage_session().run(code, timeout)
+    if output.startswith("ERROR:") or "\nERROR:" in output:
+        raise _UncachedOutputError(output)
+    return output
+
+
+def _run_sage(code: str, timeout: int = 30, memo: bool = False) -> str | None:
     """Run SageMath code and return output.
 
+    Scripts run in a shared, long-lived Sage worker, so only the first call
+    pays Sage's startup.
+
     Args:
         code: SageMath code to execute
         timeout: Timeout in seconds
+        memo: Reuse the output of an identical earlier script. Only for
+            deterministic scripts that print no timings; randomized ones
+            (ECM) and timed ones (discrete log) must run every time.
 
     Returns:
         stdout output, or None if SageMath is not available or command fails
@@ -45,18 +205,215 @@ def _run_sage(code: str, timeout: int = 30) -> str | None:
         return None
 
     try:
-        result = subprocess.run(
-            [_SAGE_BINARY, "--python", "-c", code], capture_output=True, text=True, timeout=timeout
-        )
-        return str(result.stdout)
+        if memo:
+            return _sage_output(code, timeout)
+        return _sage_session().run(code, timeout)
+    except _UncachedOutputError as exc:
+        return exc.output
     except subprocess.TimeoutExpired:
         return None
     except Exception:
         return None
 
 
+# Baby-step tables kept in the worker for discrete_log(method="bsgs"). Tables
+# hold at least sqrt(order) entries, and small groups get the minimum size so
+# repeat queries need few giant steps; beyond the maximum Sage's own solver runs.
+_BSGS_MIN_TABLE = 1 << 16
+_BSGS_MAX_TABLE = 1 << 20
+_BSGS_TABLES_KEPT = 4
+
+
+def _bsgs_code(g_val: int, p_val: int, base_val: int | None) -> str:
+    # Baby-step giant-step whose baby-step table is cached per (p, base) in the
+    # worker, so later targets in the same group only take the giant steps.
+    base_expr = "F.multiplicative_generator()" if base_val is None else f"F({base_val})"
+    return f"""
+import time
+from math import isqrt
+p = {p_val}
+g = {g_val}
+F = GF(p)
+b = {base_expr}
+start = time.time()
+try:
+    n = int(b.multiplicative_order())
+    root = isqrt(n - 1) + 1
+    if root > {_BSGS_MAX_TABLE}:
+        x = discrete_log(F(g), b, method='bsgs')
+    else:
+        key = ("bsgs", p, int(b))
+        if key not in _session_cache:
+            m = max(min(n, {_BSGS_MIN_TABLE}), root)
+            steps = {{}}
+            v = F(1)
+            for i in range(m):
+                steps.setdefault(int(v), i)
+                v *= b
+            while len(_session_cache) >= {_BSGS_TABLES_KEPT}:
+                _session_cache.pop(next(iter(_session_cache)))
+            _session_cache[key] = (m, steps)
+        m, steps = _session_cache[key]
+        h = F(g)
+        stride = b ** -m
+        x = None
+        for j in range((n + m - 1) // m):
+            i = steps.get(int(h))
+            if i is not None:
+                x = j * m + i
+                break
+            h *= stride
+        if x is None:
+            raise ValueError("g is not a power of the base")
+    elapsed = time.time() - start
+    print(f"RESULT: {{x}}")
+    print(f"TIME: {{elapsed}}")
+except Exception as e:
+    print(f"ERROR: {{str(e)}}")
+"""
+
+
+# Pure-Python Pohlig-Hellman + BSGS for small moduli, where a Sage round trip
+# costs far more than the solve itself. Each prime q dividing the base's order
+# needs a sqrt(q)-entry table, so larger prime factors are left to Sage.
+_PY_DLOG_MAX_BITS = 64
+_PY_DLOG_MAX_PRIME = 1 << 40
+
+
+# Searches needing at least this many baby steps are split across a process
+# pool when there is more than one CPU; below it, dispatch costs more than it saves.
+_PARALLEL_BSGS_STEPS = 1 << 18
+
+
+@cache
+def _dlog_pool() -> ProcessPoolExecutor:
+    # Spawned, not forked: the server process runs other tools on threads.
+    pool = ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+    atexit.register(pool.shutdown, cancel_futures=True)
+    return pool
+
+
+def _bsgs_range(g: int, h: int, p: int, lo: int, hi: int) -> int | None:
+    """Return x in [lo, hi) with g**x == h (mod p), or None."""
+    m = isqrt(hi - lo - 1) + 1
+    table: dict[int, int] = {}
+    v = 1
+    for j in range(m):
+        table.setdefault(v, j)
+        v = v * g % p
+    stride = pow(g, -m, p)
+    y = h * pow(g, -lo, p) % p
+    for i in range(m):
+        j = table.get(y)
+        if j is not None:
+            x = lo + i * m + j
+            return x if x < hi else None
+        y = y * stride % p
+    return None
+
+
+def _parallel_bsgs(g: int, h: int, p: int, order: int, workers: int) -> int | None:
+    # Each worker runs a full BSGS over its own slice of [0, order), so nothing
+    # but the answer crosses the process boundary. K workers finish in about
+    # 1/sqrt(K) of the serial time.
+    bounds = [order * i // workers for i in range(workers + 1)]
+    pool = _dlog_pool()
+    futures = [
+        pool.submit(_bsgs_range, g, h, p, lo, hi)
+        for lo, hi in zip(bounds, bounds[1:], strict=False)
+    ]
+    found = [x for x in (fut.result() for fut in futures) if x is not None]
+    return min(found, default=None)
+
+
+def _py_bsgs(g: int, h: int, p: int, order: int) -> int | None:
+    """Return x in [0, order) with g**x == h (mod p), or None.
+
+    ``order`` must be the multiplicative order of ``g``, so at most one x
+    qualifies and slices of the range can be searched independently.
+    """
+    workers = os.cpu_count() or 1
+    if workers > 1 and isqrt(order) >= _PARALLEL_BSGS_STEPS:
+        try:
+            return _parallel_bsgs(g, h, p, order, workers)
+        except Exception:
+            # A broken pool is dropped so a later call can start a fresh one.
+            _dlog_pool().shutdown(wait=False, cancel_futures=True)
+            _dlog_pool.cache_clear()
+    return _bsgs_range(g, h, p, 0, order)
+
+
+def _py_unit_group_factors(p: int) -> Counter[int] | None:
+    # Factorization of p - 1, or None when it is incomplete or has a prime
+    # factor too large for a pure-Python baby-step table.
+    factors = Counter(_factor_internal(p - 1))
+    if any(q > _PY_DLOG_MAX_PRIME or not _is_probable_prime(q) for q in factors):
+        return None
+    return factors
+
+
+def _py_discrete_log(h: int, g: int, p: int, factors: Counter[int]) -> int | None:
+    """Smallest x with g**x == h (mod p), by Pohlig-Hellman over ``factors`` of p - 1."""
+    g, h = g % p, h % p
+    if g == 0 or h == 0:
+        return None
+    # Strip the factors of p - 1 that do not divide the order of g.
+    order = p - 1
+    order_factors = {}
+    for q, e in factors.items():
+        while e and pow(g, order // q, p) == 1:
+            order //= q
+            e -= 1
+        if e:
+            order_factors[q] = e
+    x, mod = 0, 1
+    for q, e in order_factors.items():
+        qe = q**e
+        gq = pow(g, order // qe, p)
+        hq = pow(h, order // qe, p)
+        gamma = pow(gq, qe // q, p)
+        xq = 0
+        for k in range(e):
+            hk = pow(pow(gq, -xq, p) * hq % p, qe // q ** (k + 1), p)
+            d = _py_bsgs(gamma, hk, p, q)
+            if d is None:
+                return None
+            xq += d * q**k
+        x += mod * ((xq - x) * pow(mod, -1, qe) % qe)
+        mod *= qe
+    # Pohlig-Hellman assumes h lies in the subgroup generated by g.
+    return x if pow(g, x, p) == h else None
+
+
+def _py_discrete_log_result(g_val: int, p_val: int, base_val: int | None) -> dict[str, Any] | None:
+    factors = _py_unit_group_factors(p_val)
+    if factors is None:
+        return None
+    start = time.perf_counter()
+    if base_val is None:
+        # Smallest primitive root, matching Sage's multiplicative_generator().
+        base_val = next(
+            r for r in range(1, p_val) if all(pow(r, (p_val - 1) // q, p_val) != 1 for q in factors)
+        )
+    x = _py_discrete_log(g_val, base_val, p_val, factors)
+    result: dict[str, Any] = {
+        "found": x is not None,
+        "x": None if x is None else str(x),
+        "method": "ph",
+        "time": time.perf_counter() - start,
+        "error": None if x is not None else "g is not a power of the base",
+    }
+    return result
+
+
 def discrete_log(
-    g: str, p: str, base: str | None = None, method: str = "auto", timeout: int = 60
+    g: str,
+    p: str,
+    base: str | None = None,
+    method: str = "auto",
+    timeout: int = 60,
+    reuse_table: bool = True,
+    fast: bool = True,
 ) -> dict[str, Any]:
     """Solve discrete logarithm problem: find x such that base^x ≡ g (mod p).
 
@@ -71,6 +428,11 @@ def discrete_log(
         base: Generator/base (defaults to smallest primitive root if None)
         method: Solver method - "auto", "bsgs", "ph", "rho"
         timeout: Timeout in seconds (default 60)
+        reuse_table: With method "bsgs", keep the baby-step table in the Sage
+            worker so later queries against the same p and base reuse it
+        fast: With method "auto", solve p of up to 64 bits in pure Python
+            (Pohlig-Hellman with baby-step giant-step), without SageMath, when
+            p - 1 has no prime factor above 2**40
 
     Returns:
         Dict with keys:
@@ -83,16 +445,8 @@ def discrete_log(
     Example:
         >>> # Solve: 2^x ≡ 5 (mod 101)
         >>> discrete_log("5", "101", "2")
-        {"found": True, "x": "10", "method": "bsgs", ...}
+        {"found": True, "x": "24", "method": "ph", ...}
     """
-    if not HAS_SAGEMATH:
-        return {
-            "found": False,
-            "x": None,
-            "method": method,
-            "error": "SageMath not installed. Install from https://www.sagemath.org/",
-        }
-
     # Parse inputs
     try:
         g_val = int(g, 0) if isinstance(g, str) else g
@@ -114,9 +468,29 @@ def discrete_log(
         err = _check_size(base_val, "base")
         if err:
             return {"found": False, "x": None, "method": method, "error": err}
+    err = _check_prime(p_val)
+    if err:
+        return {"found": False, "x": None, "method": method, "error": err}
+
+    # An explicit method is the caller's choice of algorithm, so only "auto" may
+    # be answered by the pure-Python Pohlig-Hellman path.
+    if fast and method == "auto" and p_val.bit_length() <= _PY_DLOG_MAX_BITS:
+        result = _py_discrete_log_result(g_val, p_val, base_val)
+        if result is not None:
+            return result
+
+    if not HAS_SAGEMATH:
+        return {
+            "found": False,
+            "x": None,
+            "method": method,
+            "error": "SageMath not installed. Install from https://www.sagemath.org/",
+        }
 
     # Build SageMath code
-    if base_val is None:
+    if method == "bsgs" and reuse_table:
+        sage_code = _bsgs_code(g_val, p_val, base_val)
+    elif base_val is None:
         # Let SageMath find a generator
         sage_code = f"""
 import time
@@ -258,6 +632,25 @@ except Exception as e:
     return result
 
 
+def _py_crt(rems: list[int], mods: list[int]) -> tuple[int, int] | None:
+    """Combine ``x ≡ r (mod m)`` pairs into ``(x, lcm)``, or None if inconsistent.
+
+    Moduli need not be coprime: each step only requires the remainders to
+    agree modulo the gcd of the moduli combined so far.
+    """
+    x, modulus = 0, 1
+    for r, m in zip(rems, mods, strict=True):
+        g = math.gcd(modulus, m)
+        if (r - x) % g:
+            return None
+        # Advance x by multiples of the current modulus until it also fits r (mod m).
+        step = (r - x) // g * pow(modulus // g, -1, m // g) % (m // g)
+        x += modulus * step
+        modulus = modulus // g * m
+        x %= modulus
+    return x, modulus
+
+
 def chinese_remainder(congruences: list[tuple[str, str]], timeout: int = 30) -> dict[str, Any]:
     """Solve system of linear congruences using Chinese Remainder Theorem.
 
@@ -266,15 +659,18 @@ def chinese_remainder(congruences: list[tuple[str, str]], timeout: int = 30) ->
         x ≡ a2 (mod n2)
         ...
 
+    Solved in pure Python with the extended Euclidean algorithm, so SageMath
+    is not needed and no worker round trip is made.
+
     Args:
         congruences: List of (remainder, modulus) tuples as strings
-        timeout: Timeout in seconds
+        timeout: Unused; kept for compatibility with the other SageMath tools
 
     Returns:
         Dict with keys:
             - "found": bool - whether solution exists
             - "x": str | None - solution modulo N
-            - "modulus": str | None - product of all moduli
+            - "modulus": str | None - lcm of all moduli (their product if coprime)
             - "error": str | None - error if no solution
 
     Example:
@@ -282,11 +678,10 @@ def chinese_remainder(congruences: list[tuple[str, str]], timeout: int = 30) ->
         >>> chinese_remainder([("2", "3"), ("3", "5"), ("2", "7")])
         {"found": True, "x": "23", "modulus": "105"}
     """
-    if not HAS_SAGEMATH:
-        return {"found": False, "x": None, "modulus": None, "error": "SageMath not installed"}
-
-    # Build congruence list
-    cong_list = []
+    if not congruences:
+        return {"found": False, "x": None, "modulus": None, "error": "No congruences given"}
+    rems = []
+    mods = []
     for rem, mod in congruences:
         try:
             rem_val = int(rem, 0)
@@ -302,42 +697,21 @@ def chinese_remainder(congruences: list[tuple[str, str]], timeout: int = 30) ->
             err = _check_size(val, name)
             if err:
                 return {"found": False, "x": None, "modulus": None, "error": err}
-        cong_list.append((rem_val, mod_val))
-
-    sage_code = f"""
-congruences = {cong_list}
-try:
-    from sage.all import crt
-    result = crt([c[1] for c in congruences], [c[0] for c in congruences])
-    if result is not None:
-        x, N = result
-        print(f"X: {{x}}")
-        print(f"MODULUS: {{N}}")
-    else:
-        print("NO_SOLUTION")
-except Exception as e:
-    print(f"ERROR: {{str(e)}}")
-"""
-
-    output = _run_sage(sage_code, timeout)
-
-    if output is None:
-        return {"found": False, "x": None, "modulus": None, "error": "SageMath execution failed"}
-
-    result: dict[str, Any] = {"found": False, "x": None, "modulus": None, "error": None}
+        if mod_val <= 0:
+            return {"found": False, "x": None, "modulus": None, "error": "Moduli must be positive"}
+        rems.append(rem_val)
+        mods.append(mod_val)
 
-    for line in output.splitlines():
-        if line.startswith("X:"):
-            result["found"] = True
-            result["x"] = line.split(":", 1)[1].strip()
-        elif line.startswith("MODULUS:"):
-            result["modulus"] = line.split(":", 1)[1].strip()
-        elif line.startswith("ERROR:"):
-            result["error"] = line.split(":", 1)[1].strip()
-        elif line.startswith("NO_SOLUTION"):
-            result["error"] = "No solution exists (moduli not coprime)"
-
-    return result
+    solved = _py_crt(rems, mods)
+    if solved is None:
+        return {
+            "found": False,
+            "x": None,
+            "modulus": None,
+            "error": "No solution exists (congruences are inconsistent)",
+        }
+    x, modulus = solved
+    return {"found": True, "x": str(x), "modulus": str(modulus), "error": None}
 
 
 def linear_congruence_system(
@@ -411,7 +785,7 @@ except Exception as e:
     print(f"ERROR: {{str(e)}}")
 """
 
-    output = _run_sage(sage_code, timeout)
+    output = _run_sage(sage_code, timeout, memo=True)
 
     if output is None:
         return {"found": False, "error": "SageMath execution failed"}
@@ -481,6 +855,9 @@ def elliptic_curve_point_add(
         err = _check_size(val, name)
         if err:
             return {"found": False, "x": None, "y": None, "error": err}
+    err = _check_prime(p_val)
+    if err:
+        return {"found": False, "x": None, "y": None, "error": err}
 
     sage_code = f"""
 p = {p_val}
@@ -499,7 +876,7 @@ except Exception as e:
     print(f"ERROR: {{str(e)}}")
 """
 
-    output = _run_sage(sage_code, timeout)
+    output = _run_sage(sage_code, timeout, memo=True)
 
     if output is None:
         return {"found": False, "x": None, "y": None, "error": "SageMath execution failed"}
@@ -581,7 +958,7 @@ except Exception as e:
     print(f"ERROR: {{str(e)}}")
 """
 
-    output = _run_sage(sage_code, timeout)
+    output = _run_sage(sage_code, timeout, memo=True)
 
     if output is None:
         return {"found": False, "roots": [], "error": "SageMath execution failed"}
@@ -637,6 +1014,9 @@ def quadratic_residue(a: str, p: str, timeout: int = 30) -> dict[str, Any]:
         err = _check_size(val, name)
         if err:
             return {"found": False, "roots": [], "error": err}
+    err = _check_prime(p_val)
+    if err:
+        return {"found": False, "roots": [], "error": err}
 
     sage_code = f"""
 a = {a_val}
@@ -651,7 +1031,7 @@ except Exception as e:
     print(f"ERROR: {{str(e)}}")
 """
 
-    output = _run_sage(sage_code, timeout)
+    output = _run_sage(sage_code, timeout, memo=True)
 
     if output is None:
         return {"found": False, "roots": [], "error": "SageMath execution failed"}
@@ -730,7 +1110,7 @@ except Exception as e:
     print(f"ERROR: {{str(e)}}")
 """
 
-    output = _run_sage(sage_code, timeout)
+    output = _run_sage(sage_code, timeout, memo=True)
     if output is None:
         return {"success": False, "reduced_basis": [], "error": "SageMath execution failed"}
 
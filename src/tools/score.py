@@ -1,9 +1,83 @@
-def wordlist_score(text: str, words: list[str]) -> float:
+import heapq
+from collections import Counter
+from collections.abc import Sequence
+from functools import lru_cache
+
+from .models import BreakResult
+
+try:
+    import ahocorasick
+
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+
+@lru_cache(maxsize=32)
+def parse_wordlist(text: str) -> tuple[str, ...]:
+    """Split a newline-separated wordlist resource into stripped, non-empty words."""
+    return tuple(x.strip() for x in text.splitlines() if x.strip())
+
+
+@lru_cache(maxsize=32)
+def _wordlist_automaton(words: tuple[str, ...]) -> tuple[object, Counter[str]]:
+    # Duplicate entries count once per occurrence, as in the substring scan.
+    counts = Counter(w for w in words if w)
+    automaton = ahocorasick.Automaton()
+    for w in counts:
+        automaton.add_word(w, w)
+    automaton.make_automaton()
+    return automaton, counts
+
+
+def wordlist_score(text: str, words: Sequence[str]) -> float:
     if not words:
         return 0.0
     t = text.lower()
-    hits = 0
-    for w in words:
-        if w and w in t:
-            hits += 1
+    if HAS_AHOCORASICK:
+        # One pass over the text finds every listed word instead of one
+        # substring scan per word; the automaton is built once per wordlist.
+        automaton, counts = _wordlist_automaton(tuple(words))
+        if not counts:
+            return 0.0
+        found = {w for _, w in automaton.iter(t)}
+        hits = sum(counts[w] for w in found)
+    else:
+        hits = 0
+        for w in words:
+            if w and w in t:
+                hits += 1
     return min(1.0, hits / max(1, len(words)))
+
+
+def rank_with_wordlist(
+    cands: Sequence[BreakResult], words: Sequence[str], top_k: int
+) -> list[BreakResult]:
+    """Re-rank candidates by ``0.7 * confidence + 0.3 * wordlist_score``.
+
+    ``cands`` must be ordered best ``confidence`` first, as ``rot_all`` returns
+    them. The wordlist adds at most 0.3, so once that bound cannot beat the
+    current k-th combined score no later candidate can reach the top k and
+    their wordlist scans are skipped.
+    """
+    if top_k <= 0:
+        return []
+    scored = []
+    kth: list[float] = []
+    max_bonus = 0.3 if words else 0.0
+    for br in cands:
+        es = br.confidence
+        if len(kth) >= top_k and 0.7 * es + max_bonus <= kth[0]:
+            break
+        ws = wordlist_score(br.plaintext, words) if words else 0.0
+        combined = 0.7 * es + 0.3 * ws
+        scored.append(
+            BreakResult(
+                algorithm=br.algorithm, plaintext=br.plaintext, key=br.key, confidence=combined
+            )
+        )
+        if len(kth) < top_k:
+            heapq.heappush(kth, combined)
+        elif combined > kth[0]:
+            heapq.heapreplace(kth, combined)
+    return heapq.nlargest(top_k, scored, key=lambda x: x.confidence)
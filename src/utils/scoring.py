@@ -1,6 +1,17 @@
+import codecs
 import re
+import string
 from functools import lru_cache
 
+import numpy as np
+
+from .scoring_nb import (
+    PARALLEL_BATCH,
+    score_batch_stats,
+    score_batch_stats_parallel,
+    score_stats,
+)
+
 LETTER_FREQ = {
     "a": 0.08167,
     "b": 0.01492,
@@ -75,69 +86,227 @@ BIGRAM_FREQ = {
 }
 
 FLAG_PATTERN = re.compile(r"(flag|ctf|key|secret)\{.*?\}", re.IGNORECASE)
+# Literal prefixes of every FLAG_PATTERN match, after casefolding. casefold
+# maps each character IGNORECASE pairs with these letters (including "K" and
+# "ſ") onto its ASCII form, so a match always contains one of them.
+_FLAG_PREFIXES = ("flag{", "ctf{", "key{", "secret{")
+# FLAG_PATTERN's opening half. FLAG_PATTERN.search retries its lazy ".*?\}"
+# from every opener, which is quadratic on text full of unclosed openers.
+_FLAG_OPEN = re.compile(r"(?:flag|ctf|key|secret)\{", re.IGNORECASE)
+# Bytes (Latin-1) that can precede a match's "{": each prefix's last letter in
+# either case. No other Latin-1 character casefolds onto these letters.
+_FLAG_TAIL_LUT = np.zeros(256, dtype=bool)
+for _prefix in _FLAG_PREFIXES:
+    _FLAG_TAIL_LUT[[ord(_prefix[-2]), ord(_prefix[-2].upper())]] = True
+_FLAG_TAIL_LUT.setflags(write=False)
+del _prefix
 
 
-@lru_cache(maxsize=2048)
-def english_score(s: str) -> float:
-    """
-    Calculate a score for how 'English-like' the text is.
-    Considers letter frequency, bigrams, and specific CTF flag patterns.
-    """
-    if not s:
-        return 0.0
+def _has_flag(s: str) -> bool:
+    """Return whether ``FLAG_PATTERN.search(s)`` would match, in linear time."""
+    # Substring checks run in C and reject almost every candidate that merely
+    # contains a brace, leaving the scan for the rare near-misses and flags.
+    folded = s.casefold()
+    if not any(k in folded for k in _FLAG_PREFIXES):
+        return False
+    # "." stops at newlines, so a match is an opener with a "}" later on its
+    # line. Later openers on a line end at the same place as the first one,
+    # so only the first opener per line needs checking.
+    m = _FLAG_OPEN.search(s)
+    while m is not None:
+        eol = s.find("\n", m.end())
+        if eol < 0:
+            return s.find("}", m.end()) >= 0
+        if s.find("}", m.end(), eol) >= 0:
+            return True
+        m = _FLAG_OPEN.search(s, eol)
+    return False
 
-    # 1. Flag detection shortcut
-    if FLAG_PATTERN.search(s):
-        return 10.0  # Immediate high score for flag-like patterns
 
-    s_lower = s.lower()
-    n = len(s)
-
-    # 2. Letter frequency score
-    letter_score = 0.0
-    printable_count = 0
-    alpha_count = 0
-    for ch in s:
-        if ch.lower() in LETTER_FREQ:
-            letter_score += LETTER_FREQ[ch.lower()]
-        if ch.isprintable():
-            printable_count += 1
-        if ch.isalpha():
-            alpha_count += 1
+# Per-byte lookup tables (Latin-1 code points) mirroring the per-character
+# scoring rules, built once at import time and frozen so callers cannot
+# mutate them by accident.
+_CHARS = [chr(i) for i in range(256)]
+_LETTER_LUT = np.array([LETTER_FREQ.get(c.lower(), 0.0) for c in _CHARS], dtype=np.float64)
+_PRINTABLE_LUT = np.array([c.isprintable() for c in _CHARS], dtype=np.uint8)
+_ALPHA_LUT = np.array([c.isalpha() for c in _CHARS], dtype=np.uint8)
+# Derived tables: printable in the low and alpha in the high 32 bits, so one
+# NumPy gather and one row sum count both classes; and, since every scored
+# bigram is two ASCII letters, each byte's letter index (26 for anything else)
+# into a dense 27 x 27 bigram table that stays cache-resident. Every scoring
+# path, Numba, NumPy and pure Python, reads bigrams through that pair.
+_CLASS_LUT = _PRINTABLE_LUT.astype(np.int64) | (_ALPHA_LUT.astype(np.int64) << 32)
+_BIGRAM_CLASS_LUT = np.full(256, 26, dtype=np.uint8)
+_BIGRAM_CLASS_LUT[ord("a") : ord("z") + 1] = np.arange(26)
+_BIGRAM_CLASS_LUT[ord("A") : ord("Z") + 1] = np.arange(26)
+_BIGRAM_MAT = np.zeros(27 * 27, dtype=np.float64)
+for _bg, _freq in BIGRAM_FREQ.items():
+    _BIGRAM_MAT[(ord(_bg[0]) - ord("a")) * 27 + ord(_bg[1]) - ord("a")] = _freq
+for _table in (
+    _LETTER_LUT,
+    _PRINTABLE_LUT,
+    _ALPHA_LUT,
+    _CLASS_LUT,
+    _BIGRAM_CLASS_LUT,
+    _BIGRAM_MAT,
+):
+    _table.setflags(write=False)
+del _CHARS, _bg, _freq, _table
+
+# Characters outside Latin-1 have no letter or bigram weight; only their
+# printable/alpha class matters, so encode them as a Latin-1 stand-in of the
+# same class and keep the byte-level kernels exact.
+_CLASS_STAND_IN = {(True, True): "\xaa", (True, False): "?", (False, True): "\xaa"}
+
+
+def _stand_in_errors(exc: UnicodeError) -> tuple[str, int]:
+    if not isinstance(exc, UnicodeEncodeError):
+        raise exc
+    chunk = exc.object[exc.start : exc.end]
+    repl = "".join(_CLASS_STAND_IN.get((c.isprintable(), c.isalpha()), "\x00") for c in chunk)
+    return repl, exc.end
+
+
+codecs.register_error("keykid-score", _stand_in_errors)
+
+
+def text_to_u8(s: str) -> np.ndarray:
+    """Encode text as a Latin-1 ``uint8`` array suitable for the scoring tables."""
+    return np.frombuffer(s.encode("latin-1", "keykid-score"), dtype=np.uint8)
+
+
+def _seq_sum(x: np.ndarray) -> np.ndarray:
+    # Left-to-right sum: ndarray.sum's pairwise order can reorder tied candidates.
+    return np.cumsum(x, axis=-1)[..., -1]
+
+
+def _classes_numpy(buf: np.ndarray) -> tuple[int, int]:
+    # Class counts are integers, so a byte histogram dotted with the packed
+    # table is exact and skips materializing an n-element gather.
+    classes = int(np.bincount(buf, minlength=256) @ _CLASS_LUT)
+    return classes & 0xFFFFFFFF, classes >> 32
+
+
+def _bigram_freqs(buf: np.ndarray) -> np.ndarray:
+    # Map bytes to letter indices once and build each a * 27 + b index in
+    # place, so the gather reads the small dense table.
+    cls = _BIGRAM_CLASS_LUT[buf].astype(np.uint16)
+    idx = cls[..., :-1] * 27
+    idx += cls[..., 1:]
+    return _BIGRAM_MAT[idx]
+
 
+def _letter_bigram_numpy(buf: np.ndarray) -> tuple[float, float, int]:
+    letter = float(_seq_sum(_LETTER_LUT[buf]))
+    if buf.size < 2:
+        return letter, 0.0, 0
+    freqs = _bigram_freqs(buf)
+    return letter, float(_seq_sum(freqs)), int(np.count_nonzero(freqs))
+
+
+def _stats_numpy(buf: np.ndarray) -> tuple[float, int, int, float, int]:
+    printable, alpha = _classes_numpy(buf)
+    letter, bigram, hits = _letter_bigram_numpy(buf)
+    return letter, printable, alpha, bigram, hits
+
+
+# Plain-Python mirrors of the tables for the short-input path below.
+_LETTER_LIST = _LETTER_LUT.tolist()
+_BIGRAM_CLASS_LIST = _BIGRAM_CLASS_LUT.tolist()
+_BIGRAM_MAT_LIST = _BIGRAM_MAT.tolist()
+_NON_PRINTABLE_BYTES = bytes(np.flatnonzero(_PRINTABLE_LUT == 0).tolist())
+_NON_ALPHA_BYTES = bytes(np.flatnonzero(_ALPHA_LUT == 0).tolist())
+
+# Below this length the NumPy fallback is dominated by per-call overhead.
+_SMALL_INPUT = 64
+
+
+def _classes_bytes(raw: bytes) -> tuple[int, int]:
+    # bytes.translate deletes whole classes in C; what is left is the count.
+    printable = len(raw.translate(None, _NON_PRINTABLE_BYTES))
+    alpha = len(raw.translate(None, _NON_ALPHA_BYTES))
+    return printable, alpha
+
+
+def _letter_bigram_bytes(raw: bytes) -> tuple[float, float, int]:
+    # One loop sums letters and bigrams like the Numba kernel; prev starts on the zero row.
+    letter = 0.0
+    bigram = 0.0
+    hits = 0
+    prev = 26 * 27
+    for c in raw:
+        letter += _LETTER_LIST[c]
+        k = _BIGRAM_CLASS_LIST[c]
+        f = _BIGRAM_MAT_LIST[prev + k]
+        if f:
+            bigram += f
+            hits += 1
+        prev = k * 27
+    return letter, bigram, hits
+
+
+def _stats_bytes(raw: bytes) -> tuple[float, int, int, float, int]:
+    printable, alpha = _classes_bytes(raw)
+    letter, bigram, hits = _letter_bigram_bytes(raw)
+    return letter, printable, alpha, bigram, hits
+
+
+def _score_bytes(raw: bytes) -> float:
+    """Score Latin-1 bytes, skipping NumPy for short inputs when Numba is absent."""
+    n = len(raw)
+    if score_stats is None and n < _SMALL_INPUT:
+        if not raw:
+            return 0.0
+        # As in _score_u8, gated input skips the per-byte letter loop.
+        printable, alpha = _classes_bytes(raw)
+        if printable / n < 0.7 or alpha / n < 0.5:
+            return 0.0
+        letter, bigram, hits = _letter_bigram_bytes(raw)
+        return _combine(n, letter, printable, alpha, bigram, hits)
+    return _score_u8(np.frombuffer(raw, dtype=np.uint8))
+
+
+def _score_u8(buf: np.ndarray) -> float:
+    """Score a Latin-1 ``uint8`` buffer (flag detection is the caller's job)."""
+    n = buf.size
+    if n == 0:
+        return 0.0
+    if score_stats is not None:
+        stats = score_stats(
+            buf, _LETTER_LUT, _PRINTABLE_LUT, _ALPHA_LUT, _BIGRAM_CLASS_LUT, _BIGRAM_MAT
+        )
+        return _combine(n, *stats)
+    printable, alpha = _classes_numpy(buf)
+    # Gated buffers score 0 whatever their letters, so only buffers passing
+    # _combine's printable/alpha gates pay for the letter and bigram gathers.
+    if printable / n < 0.7 or alpha / n < 0.5:
+        return 0.0
+    letter, bigram, hits = _letter_bigram_numpy(buf)
+    return _combine(n, letter, printable, alpha, bigram, hits)
+
+
+def _combine(n: int, letter: float, printable: int, alpha: int, bigram: float, hits: int) -> float:
     # Penalize heavily if mostly non-printable
-    if n > 0 and (printable_count / n) < 0.7:
+    if (printable / n) < 0.7:
         return 0.0
 
     # Penalize if too few alphabetic characters
-    if n > 0 and (alpha_count / n) < 0.5:
+    if (alpha / n) < 0.5:
         return 0.0
 
     # Normalize letter score (max approx 1.0 for a very English-like distribution)
-    avg_letter_score = letter_score / n if n > 0 else 0
+    avg_letter_score = letter / n
     # Expected avg for random garbage is 1/26 ≈ 0.038 (ignoring space).
     # Expected avg for English is ≈ 0.065; a dense English sentence can reach ~0.085.
     # Scale: (val - 0.038) / (0.085 - 0.038)
     normalized_letter = (avg_letter_score - 0.038) / (0.085 - 0.038)
     normalized_letter = max(0.0, min(1.0, normalized_letter))
 
-    # 3. Bigram score - more balanced approach
+    # Bigram score: average score per matched bigram. Expected max avg is
+    # ~0.005, cap at 0.05 so bigrams cannot dominate; keep final in [0, 1].
     bigram_score = 0.0
-    bigram_count = 0
-    if n > 1:
-        for i in range(n - 1):
-            bg = s_lower[i : i + 2]
-            if bg in BIGRAM_FREQ:
-                bigram_score += BIGRAM_FREQ[bg]
-                bigram_count += 1
-        # Normalize: average score per bigram, capped at a reasonable max
-        if bigram_count > 0:
-            avg_bigram = bigram_score / bigram_count
-            # Scale bigrams: expected max avg is ~0.005, cap at 0.05
-            # This prevents bigram score from dominating; keep final in [0, 1].
-            bigram_score = min(1.0, min(0.05, avg_bigram) / 0.005)
-        else:
-            bigram_score = 0.0
+    if hits > 0:
+        bigram_score = min(1.0, min(0.05, bigram / hits) / 0.005)
 
     # Combine scores: 60% letter freq, 40% bigram
     # Bigrams add discrimination for short, pangram-like texts where letter
@@ -148,22 +317,208 @@ def english_score(s: str) -> float:
     return min(1.0, total)
 
 
+def english_score_uncached(s: str) -> float:
+    """
+    Calculate a score for how 'English-like' the text is.
+    Considers letter frequency, bigrams, and specific CTF flag patterns.
+
+    Brute-force loops call this directly: every candidate they score is
+    distinct, so going through the cache would only add hashing overhead.
+    """
+    if not s:
+        return 0.0
+
+    # Flag detection shortcut
+    # Every flag contains both braces, so skip the scan for the common case.
+    if "{" in s and "}" in s and _has_flag(s):
+        return 10.0  # Immediate high score for flag-like patterns
+
+    return _score_bytes(s.encode("latin-1", "keykid-score"))
+
+
+def english_score_bytes(raw: bytes) -> float:
+    """Score raw bytes read as Latin-1 without building a ``str``.
+
+    Equal to ``english_score_uncached(raw.decode("latin-1"))``; byte-oriented
+    breakers use it to score candidates exactly as ``english_score_batch`` does.
+    """
+    if not raw:
+        return 0.0
+    if b"{" in raw and b"}" in raw and _has_flag(raw.decode("latin-1")):
+        return 10.0
+    return _score_bytes(raw)
+
+
+# Texts longer than this are scored without memoizing: the LRU keeps every
+# key alive, so a few large payloads would pin megabytes for little gain.
+_SCORE_CACHE_MAX_CHARS = 1 << 16
+
+# A plain lru_cache: str caches its own hash, so a hit is a single dict probe.
+_english_score_cached = lru_cache(maxsize=2048)(english_score_uncached)
+
+
+def english_score(s: str) -> float:
+    """Cached :func:`english_score_uncached` for repeated cross-call lookups."""
+    if len(s) > _SCORE_CACHE_MAX_CHARS:
+        return english_score_uncached(s)
+    return _english_score_cached(s)
+
+
+# Keep the lru_cache introspection API callers already use on english_score.
+english_score.cache_info = _english_score_cached.cache_info  # type: ignore[attr-defined]
+english_score.cache_clear = _english_score_cached.cache_clear  # type: ignore[attr-defined]
+
+
+def _letter_bigram_scores(cands: np.ndarray) -> np.ndarray:
+    k, n = cands.shape
+    letter = _seq_sum(_LETTER_LUT[cands])
+    if n > 1:
+        freqs = _bigram_freqs(cands)
+        bigram = _seq_sum(freqs)
+        hits = np.count_nonzero(freqs, axis=1)
+    else:
+        bigram = np.zeros(k, dtype=np.float64)
+        hits = np.zeros(k, dtype=np.intp)
+    return _combine_rows(n, letter, bigram, hits)
+
+
+def _combine_rows(n: int, letter: np.ndarray, bigram: np.ndarray, hits: np.ndarray) -> np.ndarray:
+    # Same formula as _combine, applied element-wise to rows that pass its gates.
+    k = letter.shape[0]
+    normalized_letter = np.clip((letter / n - 0.038) / (0.085 - 0.038), 0.0, 1.0)
+    avg_bigram = np.divide(bigram, hits, out=np.zeros(k, dtype=np.float64), where=hits > 0)
+    bigram_score = np.minimum(1.0, np.minimum(0.05, avg_bigram) / 0.005)
+    return np.minimum(1.0, normalized_letter * 0.6 + bigram_score * 0.4)
+
+
+# Candidate bytes from which english_score_batch uses the multithreaded kernel.
+_PARALLEL_BATCH_MIN = 1 << 16
+
+
+def english_score_batch(cands: np.ndarray) -> np.ndarray:
+    """Score every row of a ``(k, n)`` ``uint8`` candidate matrix in one pass.
+
+    Equivalent to calling :func:`english_score_uncached` on each row decoded as
+    Latin-1, but the lookups and reductions run over the whole matrix at once.
+    """
+    k, n = cands.shape
+    if n == 0:
+        return np.zeros(k, dtype=np.float64)
+
+    scores = np.zeros(k, dtype=np.float64)
+    if score_batch_stats is not None:
+        # Small batches finish before threads would even start.
+        if PARALLEL_BATCH and cands.size >= _PARALLEL_BATCH_MIN:
+            kernel = score_batch_stats_parallel
+        else:
+            kernel = score_batch_stats
+        letter, printable, alpha, bigram, hits = kernel(
+            cands, _LETTER_LUT, _PRINTABLE_LUT, _ALPHA_LUT, _BIGRAM_CLASS_LUT, _BIGRAM_MAT
+        )
+        passing = np.flatnonzero((printable / n >= 0.7) & (alpha / n >= 0.5))
+        if passing.size:
+            scores[passing] = _combine_rows(n, letter[passing], bigram[passing], hits[passing])
+    else:
+        classes = _CLASS_LUT[cands].sum(axis=1)
+        printable, alpha = classes & 0xFFFFFFFF, classes >> 32
+        # Rows failing the printable/alpha gates score 0, so only passing rows are scored.
+        passing = np.flatnonzero((printable / n >= 0.7) & (alpha / n >= 0.5))
+        if passing.size:
+            rows = cands if passing.size == k else cands[passing]
+            scores[passing] = _letter_bigram_scores(rows)
+
+    # Flags need both braces, so only rows holding a '{' and a '}' are decoded
+    # for the regex; brute-force candidate matrices rarely have both.
+    has_braces = (cands == ord("{")).any(axis=1)
+    has_braces &= (cands == ord("}")).any(axis=1)
+    rows = np.flatnonzero(has_braces)
+    if rows.size:
+        # Short rows of random bytes (XOR key columns) often hold both braces.
+        # Every match has its "{" right after a prefix's last letter, so rows
+        # without such a pair skip the decode and the regex.
+        sub = cands[rows]
+        opener = sub[:, 1:] == ord("{")
+        opener &= _FLAG_TAIL_LUT[sub[:, :-1]]
+        rows = rows[opener.any(axis=1)]
+    for i in rows:
+        if _has_flag(cands[i].tobytes().decode("latin-1")):
+            scores[i] = 10.0
+    return scores
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Return indices of the ``k`` highest scores, best first.
+
+    Ties keep their original index order, matching a stable descending sort,
+    but only the entries at or above the k-th largest score are sorted.
+    """
+    n = scores.size
+    if k <= 0:
+        return np.zeros(0, dtype=np.intp)
+    if k >= n:
+        return np.argsort(-scores, kind="stable")
+    kth = np.partition(scores, n - k)[n - k]
+    idx = np.flatnonzero(scores >= kth)
+    return idx[np.argsort(-scores[idx], kind="stable")][:k]
+
+
+# Below this length the per-char loop beats the NumPy histogram's call overhead.
+_IOC_COUNT_MIN_LEN = 20
+
+
+_ASCII_RUNS = re.compile(r"[\x00-\x7f]+")
+
+
 def ioc(s: str) -> float:
-    freq: dict[str, int] = {}
-    for ch in s:
-        if ch.isalpha():
-            c = ch.lower()
-            freq[c] = freq.get(c, 0) + 1
-    n = sum(freq.values())
+    if len(s) >= _IOC_COUNT_MIN_LEN:
+        # One byte histogram in C over the ASCII characters; each letter's
+        # count is its two case bins.
+        ascii_bytes = s.encode("ascii", "ignore")
+        hist = np.bincount(np.frombuffer(ascii_bytes, dtype=np.uint8), minlength=128)
+        counts = (hist[97:123] + hist[65:91]).tolist()
+        if len(ascii_bytes) != len(s):
+            # Only the non-ASCII characters take the per-character rules. Some
+            # lowercase onto an ASCII letter (the Kelvin sign to "k"), so they
+            # share the histogram's keys.
+            freq = dict(zip(string.ascii_lowercase, counts, strict=True))
+            for ch in _ASCII_RUNS.sub("", s):
+                if ch.isalpha():
+                    c = ch.lower()
+                    freq[c] = freq.get(c, 0) + 1
+            counts = list(freq.values())
+    else:
+        freq: dict[str, int] = {}
+        for ch in s:
+            if ch.isalpha():
+                c = ch.lower()
+                freq[c] = freq.get(c, 0) + 1
+        counts = list(freq.values())
+    n = sum(counts)
     if n <= 1:
         return 0.0
-    num = sum(v * (v - 1) for v in freq.values())
+    num = sum(v * (v - 1) for v in counts)
     den = n * (n - 1)
     return float(num) / float(den)
 
 
+# From this many bytes on, popcounting in NumPy beats Python ints; older NumPy
+# without bitwise_count (< 2.0) falls back to unpackbits.
+_HAMMING_NUMPY_MIN = 2048
+_HAS_BITWISE_COUNT = hasattr(np, "bitwise_count")
+
+
 def hamming_distance(a: bytes, b: bytes) -> int:
     # Compare up to the shorter length, matching the test expectation and the
     # common "truncated Hamming distance" definition used in crypto exercises.
-    x = bytes(x ^ y for x, y in zip(a, b, strict=False))
-    return sum(bin(byte).count("1") for byte in x)
+    n = min(len(a), len(b))
+    if n >= _HAMMING_NUMPY_MIN:
+        if not _HAS_BITWISE_COUNT:
+            diff = np.frombuffer(a, np.uint8, n) ^ np.frombuffer(b, np.uint8, n)
+            return int(np.count_nonzero(np.unpackbits(diff)))
+        words = n // 8
+        diff = np.frombuffer(a, np.uint64, words) ^ np.frombuffer(b, np.uint64, words)
+        tail = int.from_bytes(a[words * 8 : n], "big") ^ int.from_bytes(b[words * 8 : n], "big")
+        return int(np.bitwise_count(diff).sum(dtype=np.int64)) + tail.bit_count()
+    # XOR the prefixes as big integers; int.bit_count() pops every limb in C.
+    diff = int.from_bytes(a[:n], "big") ^ int.from_bytes(b[:n], "big")
+    return diff.bit_count()
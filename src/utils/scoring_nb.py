@@ -0,0 +1,151 @@
+"""Optional Numba kernels for the English scorer.
+
+Numba is not a hard dependency. When it is installed, ``score_stats`` walks a
+``uint8`` buffer once in native code and ``score_batch_stats`` does the same
+for each row of a candidate matrix (``score_batch_stats_parallel`` spreads
+the rows over Numba's threads on multi-core machines); otherwise
+``HAS_NUMBA`` is False and ``src.utils.scoring`` falls back to its NumPy
+implementation.
+
+The kernels are compiled with ``cache=True``; ``scripts/warm_numba_cache.py``
+compiles them ahead of time. Set ``KEYKID_NO_NUMBA=1`` to force the NumPy path,
+e.g. for one-shot runs on machines where the cache cannot be written.
+"""
+
+import os
+
+import numpy as np
+
+if os.environ.get("KEYKID_NO_NUMBA"):
+    HAS_NUMBA = False
+else:
+    try:
+        from numba import config, njit, prange
+
+        HAS_NUMBA = True
+    except Exception:
+        HAS_NUMBA = False
+
+# Spreading batch rows over threads only pays off with more than one of them.
+PARALLEL_BATCH = HAS_NUMBA and config.NUMBA_NUM_THREADS > 1
+
+
+# Only no-NaN is assumed (the tables are finite), so sums keep source order and stay exact.
+_FASTMATH = {"nnan"}
+
+
+if HAS_NUMBA:
+
+    @njit(cache=True, fastmath=_FASTMATH)
+    def score_stats(buf, letter_lut, printable_lut, alpha_lut, class_lut, bigram_mat):
+        """Return (letter_sum, printable, alpha, bigram_sum, bigram_hits) for ``buf``."""
+        letter = 0.0
+        printable = 0
+        alpha = 0
+        bigram = 0.0
+        hits = 0
+        prev = 0
+        for i in range(buf.size):
+            c = buf[i]
+            letter += letter_lut[c]
+            printable += printable_lut[c]
+            alpha += alpha_lut[c]
+            lc = int(class_lut[c])
+            if i > 0:
+                f = bigram_mat[prev * 27 + lc]
+                if f > 0.0:
+                    bigram += f
+                    hits += 1
+            prev = lc
+        return letter, printable, alpha, bigram, hits
+
+    @njit(cache=True, fastmath=_FASTMATH)
+    def score_batch_stats(cands, letter_lut, printable_lut, alpha_lut, class_lut, bigram_mat):
+        """Per-row ``score_stats`` for a ``(k, n)`` matrix, skipping gated rows.
+
+        Rows whose printable or alpha ratio already scores them 0 get zero
+        letter/bigram stats, so garbage candidates cost a single class pass.
+        """
+        k, n = cands.shape
+        letter = np.zeros(k)
+        printable = np.zeros(k, dtype=np.int64)
+        alpha = np.zeros(k, dtype=np.int64)
+        bigram = np.zeros(k)
+        hits = np.zeros(k, dtype=np.int64)
+        for r in range(k):
+            p = 0
+            a = 0
+            for i in range(n):
+                c = cands[r, i]
+                p += printable_lut[c]
+                a += alpha_lut[c]
+            printable[r] = p
+            alpha[r] = a
+            if p / n < 0.7 or a / n < 0.5:
+                continue
+            ls = 0.0
+            bs = 0.0
+            h = 0
+            prev = 0
+            for i in range(n):
+                c = cands[r, i]
+                ls += letter_lut[c]
+                lc = int(class_lut[c])
+                if i > 0:
+                    f = bigram_mat[prev * 27 + lc]
+                    if f > 0.0:
+                        bs += f
+                        h += 1
+                prev = lc
+            letter[r] = ls
+            bigram[r] = bs
+            hits[r] = h
+        return letter, printable, alpha, bigram, hits
+
+    @njit(cache=True, parallel=True, fastmath=_FASTMATH)
+    def score_batch_stats_parallel(
+        cands, letter_lut, printable_lut, alpha_lut, class_lut, bigram_mat
+    ):
+        """``score_batch_stats`` with rows spread over Numba's worker threads.
+
+        Rows are independent, so each thread writes only its own rows' slots.
+        """
+        k, n = cands.shape
+        letter = np.zeros(k)
+        printable = np.zeros(k, dtype=np.int64)
+        alpha = np.zeros(k, dtype=np.int64)
+        bigram = np.zeros(k)
+        hits = np.zeros(k, dtype=np.int64)
+        for r in prange(k):
+            p = 0
+            a = 0
+            for i in range(n):
+                c = cands[r, i]
+                p += printable_lut[c]
+                a += alpha_lut[c]
+            printable[r] = p
+            alpha[r] = a
+            if p / n >= 0.7 and a / n >= 0.5:
+                ls = 0.0
+                bs = 0.0
+                h = 0
+                prev = 0
+                for i in range(n):
+                    c = cands[r, i]
+                    ls += letter_lut[c]
+                    lc = int(class_lut[c])
+                    if i > 0:
+                        f = bigram_mat[prev * 27 + lc]
+                        if f > 0.0:
+                            bs += f
+                            h += 1
+                    prev = lc
+                letter[r] = ls
+                bigram[r] = bs
+                hits[r] = h
+        return letter, printable, alpha, bigram, hits
+
+else:
+    score_stats = None
+    score_batch_stats = None
+    score_batch_stats_parallel = None
@@ -1,48 +1,64 @@
 """Pytest configuration and fixtures for Key-Kid tests."""
 
+import sys
 from pathlib import Path
+from types import MappingProxyType
 
 import pytest
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_ciphertexts():
-    """Provide standard test sample ciphertexts."""
-    return {
-        "caesar": "Uryyb Jbeyq",
-        "vigenere": "Lxfopvefrnhr",
-        "xor_single_hex": "3f292c2c2b",
-        "base64": "SGVsbG8gd29ybGQ=",
-        "hex": "48656c6c6f",
-        "rail_fence": "WECRLTEERDSOEEFEAOCAIVDEN",
-        "affine": "ZEBBW",
-    }
+    """Provide standard test sample ciphertexts (read-only, shared per session)."""
+    return MappingProxyType(
+        {
+            "caesar": "Uryyb Jbeyq",
+            "vigenere": "Lxfopvefrnhr",
+            "xor_single_hex": "3f292c2c2b",
+            "base64": "SGVsbG8gd29ybGQ=",
+            "hex": "48656c6c6f",
+            "rail_fence": "WECRLTEERDSOEEFEAOCAIVDEN",
+            "affine": "ZEBBW",
+        }
+    )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def expected_plaintexts():
-    """Provide expected plaintext results."""
-    return {
-        "caesar": "Hello World",
-        "vigenere": "testingvigenere",
-        "xor_single_hex": "Hello world",
-        "base64": "Hello world",
-        "hex": "Hello",
-        "rail_fence": "WEAREDISCOVEREDFLEEATONCE",
-        "affine": "ATTACK",
-    }
+    """Provide expected plaintext results (read-only, shared per session)."""
+    return MappingProxyType(
+        {
+            "caesar": "Hello World",
+            "vigenere": "testingvigenere",
+            "xor_single_hex": "Hello world",
+            "base64": "Hello world",
+            "hex": "Hello",
+            "rail_fence": "WEAREDISCOVEREDFLEEATONCE",
+            "affine": "ATTACK",
+        }
+    )
 
 
-@pytest.fixture
-def mcp_server():
-    """Provide MCP server instance for integration tests."""
-    import os
-    import sys
+_MCP = None
 
-    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-    from src.server import mcp
 
-    return mcp
+def _get_mcp():
+    """Import the MCP server on first use, so collecting tests never loads it."""
+    global _MCP
+    if _MCP is None:
+        root = str(Path(__file__).resolve().parent.parent)
+        if root not in sys.path:
+            sys.path.insert(0, root)
+        from src.server import mcp
+
+        _MCP = mcp
+    return _MCP
+
+
+@pytest.fixture(scope="session")
+def mcp_server():
+    """Provide MCP server instance for integration tests."""
+    return _get_mcp()
 
 
 @pytest.fixture
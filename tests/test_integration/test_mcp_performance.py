@@ -8,63 +8,69 @@ import sys
 import time
 
 import pytest
+import pytest_asyncio
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
 from mcp.testing import Client
 
-from src.server import mcp
 
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def client(mcp_server):
+    """One MCP client shared by the module, so tests time tool calls, not handshakes."""
+    async with Client(mcp_server) as c:
+        yield c
 
-@pytest.mark.asyncio
+
+@pytest.mark.asyncio(loop_scope="module")
 class TestMCPPerformance:
     """Tests for MCP server performance metrics."""
 
-    async def test_mcp_startup_time(self):
+    async def test_mcp_startup_time(self, mcp_server):
         """Test MCP server startup time."""
         start = time.time()
-        async with Client(mcp) as _client:
+        async with Client(mcp_server) as _client:
             startup_time = time.time() - start
             # Startup should be fast (< 2 seconds)
             assert startup_time < 2.0, f"Startup time {startup_time:.2f}s exceeds 2s"
 
-    async def test_mcp_tool_response_time_rot(self):
-        """Test tool response time for rot_all."""
-        async with Client(mcp) as client:
-            start = time.time()
-            result = await client.call_tool("tool_rot_all", {"text": "Uryyb Jbeyq", "top_k": 3})
-            response_time = time.time() - start
-            # Response should be fast (< 1 second)
-            assert response_time < 1.0, f"Response time {response_time:.2f}s exceeds 1s"
-            assert len(result) == 3
-
-    async def test_mcp_tool_response_time_xor(self):
-        """Test tool response time for xor_single_break."""
-        async with Client(mcp) as client:
-            start = time.time()
-            _ = await client.call_tool(
-                "tool_xor_single_break", {"data": "3f292c2c2b", "encoding": "hex", "top_k": 3}
-            )
-            response_time = time.time() - start
-            assert response_time < 1.0, f"Response time {response_time:.2f}s exceeds 1s"
-
-    async def test_mcp_concurrent_calls(self):
+    @pytest.mark.parametrize(
+        ("tool", "args", "expected_len"),
+        [
+            ("tool_rot_all", {"text": "Uryyb Jbeyq", "top_k": 3}, 3),
+            (
+                "tool_xor_single_break",
+                {"data": "3f292c2c2b", "encoding": "hex", "top_k": 3},
+                None,
+            ),
+        ],
+        ids=["rot", "xor"],
+    )
+    async def test_mcp_tool_response_time(self, client, tool, args, expected_len):
+        """Test tool response time for brute-force tools."""
+        start = time.time()
+        result = await client.call_tool(tool, args)
+        response_time = time.time() - start
+        # Response should be fast (< 1 second)
+        assert response_time < 1.0, f"Response time {response_time:.2f}s exceeds 1s"
+        if expected_len is not None:
+            assert len(result) == expected_len
+
+    async def test_mcp_concurrent_calls(self, client):
         """Test concurrent tool calls performance."""
-        async with Client(mcp) as client:
-            tasks = [
-                client.call_tool("tool_rot_all", {"text": "Uryyb Jbeyq", "top_k": 1})
-                for _ in range(20)
-            ]
-            start = time.time()
-            results = await asyncio.gather(*tasks)
-            duration = time.time() - start
-
-            assert len(results) == 20
-            # Concurrent calls should be reasonably fast
-            avg_time = duration / 20
-            assert avg_time < 0.5, f"Average call time {avg_time:.2f}s too high"
-
-    async def test_mcp_cache_effectiveness(self):
+        tasks = [
+            client.call_tool("tool_rot_all", {"text": "Uryyb Jbeyq", "top_k": 1}) for _ in range(20)
+        ]
+        start = time.time()
+        results = await asyncio.gather(*tasks)
+        duration = time.time() - start
+
+        assert len(results) == 20
+        # Concurrent calls should be reasonably fast
+        avg_time = duration / 20
+        assert avg_time < 0.5, f"Average call time {avg_time:.2f}s too high"
+
+    async def test_mcp_cache_effectiveness(self, mcp_server):
         """Test that caching improves repeated calls."""
         from src.utils.scoring import english_score
 
@@ -89,7 +95,7 @@ class TestMCPPerformance:
         cache_info = english_score.cache_info()
         assert cache_info.currsize > 0, "Cache should have entries"
 
-    async def test_mcp_memory_usage(self):
+    async def test_mcp_memory_usage(self, client):
         """Test memory usage stays bounded."""
         try:
             import os
@@ -99,50 +105,45 @@ class TestMCPPerformance:
             process = psutil.Process(os.getpid())
             initial_memory = process.memory_info().rss / 1024 / 1024
 
-            async with Client(mcp) as client:
-                # Execute many tool calls
-                for i in range(100):
-                    await client.call_tool(
-                        "tool_rot_all", {"text": f"Test text {i} " * 10, "top_k": 1}
-                    )
+            # Execute many tool calls
+            for i in range(100):
+                await client.call_tool("tool_rot_all", {"text": f"Test text {i} " * 10, "top_k": 1})
 
-                final_memory = process.memory_info().rss / 1024 / 1024
-                memory_growth = final_memory - initial_memory
+            final_memory = process.memory_info().rss / 1024 / 1024
+            memory_growth = final_memory - initial_memory
 
-                # Memory growth should be reasonable (< 50MB for 100 calls)
-                assert memory_growth < 50, f"Memory growth {memory_growth:.1f}MB too high"
+            # Memory growth should be reasonable (< 50MB for 100 calls)
+            assert memory_growth < 50, f"Memory growth {memory_growth:.1f}MB too high"
 
         except ImportError:
             pytest.skip("psutil not available")
 
-    async def test_mcp_tool_throughput(self):
+    async def test_mcp_tool_throughput(self, client):
         """Test sustained throughput of tool calls."""
-        async with Client(mcp) as client:
-            iterations = 50
-            start = time.time()
+        iterations = 50
+        start = time.time()
 
-            for _ in range(iterations):
-                await client.call_tool("tool_rot_all", {"text": "Hello World", "top_k": 1})
+        for _ in range(iterations):
+            await client.call_tool("tool_rot_all", {"text": "Hello World", "top_k": 1})
 
-            duration = time.time() - start
-            calls_per_second = iterations / duration
+        duration = time.time() - start
+        calls_per_second = iterations / duration
 
-            # Should handle at least 10 calls/second
-            assert calls_per_second >= 10, f"Throughput {calls_per_second:.1f} calls/s too low"
+        # Should handle at least 10 calls/second
+        assert calls_per_second >= 10, f"Throughput {calls_per_second:.1f} calls/s too low"
 
-    async def test_mcp_large_text_handling(self):
+    async def test_mcp_large_text_handling(self, client):
         """Test handling of large text inputs."""
-        async with Client(mcp) as client:
-            # Create a large text (10KB)
-            large_text = "A" * 10000
+        # Create a large text (10KB)
+        large_text = "A" * 10000
 
-            start = time.time()
-            result = await client.call_tool("tool_rot_all", {"text": large_text, "top_k": 1})
-            duration = time.time() - start
+        start = time.time()
+        result = await client.call_tool("tool_rot_all", {"text": large_text, "top_k": 1})
+        duration = time.time() - start
 
-            # Should handle large text reasonably
-            assert duration < 2.0, f"Large text processing took {duration:.2f}s too long"
-            assert len(result) == 1
+        # Should handle large text reasonably
+        assert duration < 2.0, f"Large text processing took {duration:.2f}s too long"
+        assert len(result) == 1
 
 
 @pytest.mark.asyncio
@@ -10,16 +10,14 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../.
 
 from mcp.testing import Client
 
-from src.server import mcp
-
 
 @pytest.mark.asyncio
 class TestMCPProtocol:
     """Tests for MCP protocol compliance."""
 
-    async def test_mcp_tool_list(self):
+    async def test_mcp_tool_list(self, mcp_server):
         """Test MCP tool listing."""
-        async with Client(mcp) as client:
+        async with Client(mcp_server) as client:
             tools = await client.list_tools()
             assert len(tools) >= 18
             tool_names = [t.name for t in tools]
@@ -29,64 +27,73 @@ class TestMCPProtocol:
             assert "tool_xor_single_break" in tool_names
             assert "tool_vigenere_break" in tool_names
 
-    async def test_mcp_tool_call_rot_all(self):
+    async def test_mcp_tool_call_rot_all(self, mcp_server):
         """Test MCP tool call for rot_all."""
-        async with Client(mcp) as client:
+        async with Client(mcp_server) as client:
             result = await client.call_tool("tool_rot_all", {"text": "Uryyb Jbeyq", "top_k": 1})
             assert len(result) == 1
             # Result should be a list of BreakResult
             assert "plaintext" in result[0] or len(result[0]) > 0
 
-    async def test_mcp_tool_call_caesar_break(self):
+    async def test_mcp_tool_call_caesar_break(self, mcp_server):
         """Test MCP tool call for caesar_break."""
-        async with Client(mcp) as client:
+        async with Client(mcp_server) as client:
             result = await client.call_tool("tool_caesar_break", {"ciphertext": "Uryyb Jbeyq"})
             assert len(result) == 1
 
-    async def test_mcp_tool_call_xor_single_break(self):
+    async def test_mcp_tool_call_xor_single_break(self, mcp_server):
         """Test MCP tool call for xor_single_break."""
-        async with Client(mcp) as client:
+        async with Client(mcp_server) as client:
             result = await client.call_tool(
                 "tool_xor_single_break", {"data": "3f292c2c2b", "encoding": "hex", "top_k": 1}
             )
             assert len(result) >= 1
 
-    async def test_mcp_tool_call_detect_encoding(self):
+    async def test_mcp_tool_call_xor_single_break_batch(self, mcp_server):
+        """Test MCP batch tool call returns one result list per input."""
+        async with Client(mcp_server) as client:
+            result = await client.call_tool(
+                "tool_xor_single_break_batch",
+                {"datas": ["3f292c2c2b", "3f292c2c2b"], "encoding": "hex", "top_k": 1},
+            )
+            assert len(result) >= 1
+
+    async def test_mcp_tool_call_detect_encoding(self, mcp_server):
         """Test MCP tool call for detect_encoding."""
-        async with Client(mcp) as client:
+        async with Client(mcp_server) as client:
             result = await client.call_tool(
                 "tool_detect_encoding", {"text": "SGVsbG8gd29ybGQ=", "top_k": 5}
             )
             assert len(result) >= 1
 
-    async def test_mcp_resources(self):
+    async def test_mcp_resources(self, mcp_server):
         """Test MCP resource access."""
-        async with Client(mcp) as client:
+        async with Client(mcp_server) as client:
             resources = await client.list_resources()
             assert len(resources) > 0
             # Check for wordlist resources
             resource_names = [r.uri for r in resources]
             assert any("wordlist" in uri for uri in resource_names)
 
-    async def test_mcp_prompts(self):
+    async def test_mcp_prompts(self, mcp_server):
         """Test MCP prompt templates."""
-        async with Client(mcp) as client:
+        async with Client(mcp_server) as client:
             prompts = await client.list_prompts()
             assert len(prompts) > 0
 
-    async def test_mcp_resource_read_wordlist(self):
+    async def test_mcp_resource_read_wordlist(self, mcp_server):
         """Test reading wordlist resource."""
-        async with Client(mcp) as client:
+        async with Client(mcp_server) as client:
             # Try to read the common wordlist
             result = await client.read_resource("wordlist://common")
             assert result is not None
             assert len(result.contents) > 0
 
-    async def test_mcp_concurrent_tool_calls(self):
+    async def test_mcp_concurrent_tool_calls(self, mcp_server):
         """Test concurrent tool calls."""
         import asyncio
 
-        async with Client(mcp) as client:
+        async with Client(mcp_server) as client:
             tasks = [
                 client.call_tool("tool_rot_all", {"text": "Uryyb Jbeyq", "top_k": 1})
                 for _ in range(5)
@@ -94,35 +101,49 @@ class TestMCPProtocol:
             results = await asyncio.gather(*tasks)
             assert len(results) == 5
 
-    async def test_mcp_tool_error_handling(self):
+    async def test_mcp_tool_error_handling(self, mcp_server):
         """Test MCP tool handles invalid input gracefully."""
-        async with Client(mcp) as client:
+        async with Client(mcp_server) as client:
             # Should not raise exception, but handle gracefully
             result = await client.call_tool("tool_rot_all", {"text": "", "top_k": 1})
             # Should return results even for empty input
             assert result is not None
 
-    async def test_mcp_tool_vigenere_break(self):
+    async def test_mcp_tool_vigenere_break(self, mcp_server):
         """Test MCP tool call for vigenere_break."""
-        async with Client(mcp) as client:
+        async with Client(mcp_server) as client:
             result = await client.call_tool(
                 "tool_vigenere_break", {"ciphertext": "Lxfopvefrnhr", "max_key_len": 8, "top_k": 1}
             )
             assert len(result) >= 1
 
-    async def test_mcp_tool_affine_break(self):
+    async def test_mcp_tool_affine_break(self, mcp_server):
         """Test MCP tool call for affine_break."""
-        async with Client(mcp) as client:
+        async with Client(mcp_server) as client:
             result = await client.call_tool(
                 "tool_affine_break", {"ciphertext": "ZEBBW", "top_k": 1}
             )
             assert len(result) >= 1
 
-    async def test_mcp_tool_rail_fence_break(self):
+    async def test_mcp_tool_rail_fence_break(self, mcp_server):
         """Test MCP tool call for rail_fence_break."""
-        async with Client(mcp) as client:
+        async with Client(mcp_server) as client:
             result = await client.call_tool(
                 "tool_rail_fence_break",
                 {"ciphertext": "WECRLTEERDSOEEFEAOCAIVDEN", "max_rails": 5, "top_k": 1},
             )
             assert len(result) >= 1
+
+
+def test_cached_tool_hits_do_not_share_results():
+    """Test mutating a cached tool's result does not leak into later calls."""
+    from src.server import tool_caesar_break, tool_rot_all_batch
+
+    first = tool_caesar_break("Uryyb Jbeyq")
+    first.plaintext = "tampered"
+    assert tool_caesar_break("Uryyb Jbeyq").plaintext != "tampered"
+
+    a, b = tool_rot_all_batch.__wrapped__(["Uryyb Jbeyq", "Uryyb Jbeyq"], 1)
+    assert a[0] is not b[0]
+    a[0].confidence = 0.0
+    assert b[0].confidence > 0
@@ -0,0 +1,276 @@
+"""Unit tests for block cipher tools."""
+
+import base64
+
+import pytest
+
+from src.tools import block
+from src.tools.block import (
+    HAS_CRYPTOGRAPHY,
+    HAS_PYCRYPTO,
+    _parse,
+    _pkcs7_pad_len,
+    aes_decrypt,
+    aes_decrypt_batch,
+    des_decrypt,
+    des_decrypt_batch,
+)
+
+pytestmark = pytest.mark.skipif(
+    not (HAS_PYCRYPTO or HAS_CRYPTOGRAPHY), reason="no AES/DES backend installed"
+)
+
+KEY = "2b7e151628aed2a6abf7158809cf4f3c"
+# FIPS-197 / SP 800-38A AES-128 ECB block for this key.
+PLAIN = "6bc1bee22e409f96e93d7e117393172a"
+CIPHER = "3ad77bb40d7a3660a89ecaf32466ef97"
+
+
+class TestParse:
+    """Tests for _parse function."""
+
+    def test_b64_matches_stdlib_for_lenient_input(self, monkeypatch):
+        """Test the fast base64 path decodes exactly like the stdlib fallback."""
+        inputs = ["SGVsbG8=", "SGVs bG8=\n", "SGVsbG8", "aa/9=", "a=b=c=d="]
+        fast = []
+        for s in inputs:
+            try:
+                fast.append(_parse(s, "b64"))
+            except ValueError:
+                fast.append(None)
+        monkeypatch.setattr(block, "HAS_PYBASE64", False)
+        for s, expected in zip(inputs, fast, strict=True):
+            if expected is None:
+                with pytest.raises(ValueError):
+                    _parse(s, "b64")
+            else:
+                assert _parse(s, "b64") == expected
+
+    def test_key_and_iv_are_memoized(self):
+        """Test repeated key/IV decodes hit the cache and bad keys still raise."""
+        block._parse_key_iv.cache_clear()
+        key = base64.b64encode(bytes.fromhex(KEY)).decode()
+        first = block._parse_key_iv(key, "b64", "00" * 16, "hex")
+        assert block._parse_key_iv(key, "b64", "00" * 16, "hex") is first
+        assert first == (bytes.fromhex(KEY), bytes(16))
+        assert block._parse_key_iv(KEY, "hex", None, "hex") == (bytes.fromhex(KEY), None)
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                block._parse_key_iv("00" * 65, "hex", None, "hex")
+        assert block._parse_key_iv.cache_info().currsize == 2
+
+    def test_hex_ignores_whitespace_inside_byte_pairs(self):
+        """Test hex input wrapped mid-byte still decodes."""
+        assert _parse("48 65\n6c", "hex") == b"Hel"
+        assert _parse("4 86\n56c", "hex") == b"Hel"
+        with pytest.raises(ValueError):
+            _parse("4g", "hex")
+
+
+class TestPkcs7PadLen:
+    """Tests for _pkcs7_pad_len function."""
+
+    def test_valid_and_invalid_tails(self):
+        """Test padding is recognised only when the whole run matches."""
+        assert _pkcs7_pad_len(b"") == 0
+        assert _pkcs7_pad_len(b"abc\x00") == 0
+        assert _pkcs7_pad_len(b"abc\x01") == 1
+        assert _pkcs7_pad_len(b"a" * 12 + b"\x04" * 4) == 4
+        assert _pkcs7_pad_len(b"a" * 12 + b"\x03\x04\x04\x04") == 0
+        assert _pkcs7_pad_len(b"\x10" * 16) == 16
+        assert _pkcs7_pad_len(b"\x05" * 4) == 0
+
+    def test_decode_unpadded_matches_slice_and_decode(self):
+        """Test decoding from a view equals slicing a copy and decoding it."""
+        samples = [
+            b"",
+            b"plain\x03\x03\x03",
+            "naïve café".encode() + b"\x02\x02",
+            "é".encode()[:1] + b"\x01",
+            b"\xff\xfe" + b"\x10" * 16,
+            b"no padding here!",
+        ]
+        for pt in samples:
+            unpadded = pt[: len(pt) - _pkcs7_pad_len(pt)]
+            assert block._decode_unpadded(pt) == unpadded.decode("utf-8", errors="ignore")
+            assert block._decode_unpadded(pt, "latin-1") == unpadded.decode("latin-1")
+
+
+class TestAesDecrypt:
+    """Tests for aes_decrypt function."""
+
+    async def test_aes_ecb_known_vector(self):
+        """Test a single AES-128 ECB block decrypts to the reference plaintext."""
+        pt = await aes_decrypt(CIPHER, "hex", KEY, "hex", None, "hex", "ECB")
+        expected = bytes.fromhex(PLAIN).decode(errors="ignore")
+        assert pt == expected
+
+    async def test_aes_ecb_repeated_key_is_stable(self):
+        """Test reusing a key across calls gives the same result each time."""
+        first = await aes_decrypt(CIPHER, "hex", KEY, "hex", None, "hex", "ECB")
+        second = await aes_decrypt(CIPHER * 2, "hex", KEY, "hex", None, "hex", "ECB")
+        assert second == first * 2
+
+    async def test_aes_cbc_requires_iv(self):
+        """Test CBC mode without an IV is rejected."""
+        with pytest.raises(ValueError):
+            await aes_decrypt(CIPHER, "hex", KEY, "hex", None, "hex", "CBC")
+
+    @pytest.mark.skipif(not HAS_PYCRYPTO, reason="pycryptodome not installed")
+    async def test_aes_cbc_strips_pkcs7_padding(self):
+        """Test valid PKCS#7 padding is removed and invalid padding is kept."""
+        from Crypto.Cipher import AES
+
+        key, iv = bytes.fromhex(KEY), bytes(16)
+        ct = AES.new(key, AES.MODE_CBC, iv).encrypt(b"hello world" + b"\x05" * 5)
+        assert (
+            await aes_decrypt(ct.hex(), "hex", KEY, "hex", iv.hex(), "hex", "CBC") == "hello world"
+        )
+        ct = AES.new(key, AES.MODE_CBC, iv).encrypt(b"hello world" + b"\x01\x02\x03\x04\x05")
+        pt = await aes_decrypt(ct.hex(), "hex", KEY, "hex", iv.hex(), "hex", "CBC")
+        assert pt == "hello world\x01\x02\x03\x04\x05"
+
+    async def test_large_input_decrypts_in_worker_thread(self, monkeypatch):
+        """Test inputs above the threshold go through asyncio.to_thread unchanged."""
+        calls = []
+        real_to_thread = block.asyncio.to_thread
+
+        async def spy(fn, *args):
+            calls.append(fn)
+            return await real_to_thread(fn, *args)
+
+        monkeypatch.setattr(block.asyncio, "to_thread", spy)
+        monkeypatch.setattr(block, "_THREAD_CT_BYTES", 32)
+        expected = bytes.fromhex(PLAIN).decode(errors="ignore")
+        pt = await aes_decrypt(CIPHER * 2, "hex", KEY, "hex", None, "hex", "ECB")
+        assert pt == expected * 2
+        assert len(calls) == 1
+        await aes_decrypt(CIPHER, "hex", KEY, "hex", None, "hex", "ECB")
+        assert len(calls) == 1
+
+    async def test_latin1_plaintext_is_lossless(self):
+        """Test latin-1 output keeps bytes that UTF-8 decoding would drop."""
+        raw = bytes.fromhex(PLAIN)
+        pt = await aes_decrypt(
+            CIPHER, "hex", KEY, "hex", None, "hex", "ECB", plaintext_encoding="latin-1"
+        )
+        assert pt.encode("latin-1") == raw
+        assert len(await aes_decrypt(CIPHER, "hex", KEY, "hex", None, "hex", "ECB")) < len(raw)
+
+    async def test_aes_without_key_returns_empty(self):
+        """Test a missing key and no context yields an empty string."""
+        assert await aes_decrypt(CIPHER) == ""
+
+
+class TestDesDecrypt:
+    """Tests for des_decrypt function."""
+
+    @pytest.mark.skipif(not HAS_PYCRYPTO, reason="pycryptodome not installed")
+    async def test_des_ecb_round_trip(self):
+        """Test DES ECB decryption inverts pycryptodome encryption."""
+        from Crypto.Cipher import DES
+
+        key = bytes.fromhex("133457799BBCDFF1")
+        ct = DES.new(key, DES.MODE_ECB).encrypt(b"8bytes!!")
+        assert (
+            await des_decrypt(ct.hex(), "hex", key.hex(), "hex", None, "hex", "ECB") == "8bytes!!"
+        )
+
+    @pytest.mark.skipif(not HAS_PYCRYPTO, reason="pycryptodome not installed")
+    def test_ecb_cipher_is_reused_per_key(self):
+        """Test the ECB cipher object for a key is built once and reused."""
+        aes, key = block._pycrypto()[0], bytes.fromhex(KEY)
+        assert block._pycrypto_ecb(aes, key) is block._pycrypto_ecb(aes, key)
+
+
+class TestDecryptBatch:
+    """Tests for aes_decrypt_batch and des_decrypt_batch."""
+
+    async def test_matches_single_calls(self):
+        """Test each key gives the same plaintext as a single decrypt."""
+        keys = [KEY, "00" * 16, "000102030405060708090a0b0c0d0e0f1011121314151617"]
+        batch = aes_decrypt_batch(CIPHER, keys, mode="ECB")
+        single = [await aes_decrypt(CIPHER, "hex", k, "hex", None, "hex", "ECB") for k in keys]
+        assert batch == single
+
+    def test_bad_keys_yield_empty_strings(self):
+        """Test malformed or wrong-length keys do not abort the batch."""
+        batch = aes_decrypt_batch(CIPHER, ["zz", "00" * 5, KEY], mode="ECB")
+        assert batch[:2] == ["", ""]
+        assert batch[2] == bytes.fromhex(PLAIN).decode(errors="ignore")
+
+    def test_mode_errors_still_raise(self):
+        """Test batch-wide parameter errors are reported, not swallowed."""
+        with pytest.raises(ValueError):
+            aes_decrypt_batch(CIPHER, [KEY], mode="CBC")
+        with pytest.raises(ValueError):
+            des_decrypt_batch(CIPHER, [KEY], mode="CTR")
+
+    def test_bad_iv_or_ciphertext_length_raises(self):
+        """Test IV and ciphertext lengths are request errors, not per-key misses."""
+        with pytest.raises(ValueError, match="IV"):
+            aes_decrypt_batch(CIPHER, [KEY], iv="00" * 8, mode="CBC")
+        with pytest.raises(ValueError, match="multiple"):
+            aes_decrypt_batch(CIPHER[:-2], [KEY], mode="ECB")
+        with pytest.raises(ValueError, match="multiple"):
+            des_decrypt_batch("00" * 12, ["00" * 8], mode="ECB")
+
+    async def test_wrong_length_des_key_yields_empty_string(self):
+        """Test a DES batch skips keys that are not 8 bytes long."""
+        ct, key = "00" * 8, "0123456789abcdef"
+        batch = des_decrypt_batch(ct, ["01" * 7, key], mode="ECB")
+        assert batch == ["", await des_decrypt(ct, "hex", key, "hex", None, "hex", "ECB")]
+
+
+@pytest.mark.skipif(not HAS_CRYPTOGRAPHY, reason="cryptography not installed")
+class TestCryptographyBackend:
+    """Tests for the cryptography-based backend."""
+
+    async def test_aes_known_vector_with_cached_cipher(self, monkeypatch):
+        """Test repeated decryptions share one Cipher and stay correct."""
+        monkeypatch.setattr(block, "_AES_IMPL", block._aes_cryptography)
+        expected = bytes.fromhex(PLAIN).decode(errors="ignore")
+        for _ in range(2):
+            assert await aes_decrypt(CIPHER, "hex", KEY, "hex", None, "hex", "ECB") == expected
+        key = bytes.fromhex(KEY)
+        cached = block._cryptography_cipher("AES", key, None)
+        assert cached is block._cryptography_cipher("AES", key, None)
+
+    @pytest.mark.skipif(not HAS_PYCRYPTO, reason="pycryptodome not installed")
+    async def test_bulk_backend_matches_small_backend(self, monkeypatch):
+        """Test bulk AES input decrypts identically on both backends."""
+        from Crypto.Cipher import AES
+
+        key, iv = bytes.fromhex(KEY), bytes(16)
+        msg = b"attack at dawn! " * (block._BULK_CT_BYTES // 16)
+        ct = AES.new(key, AES.MODE_CBC, iv).encrypt(msg + b"\x10" * 16).hex()
+        results = []
+        for impl in (block._aes_cryptography, block._aes_pycrypto):
+            monkeypatch.setattr(block, "_AES_BULK_IMPL", impl)
+            results.append(await aes_decrypt(ct, "hex", KEY, "hex", iv.hex(), "hex", "CBC"))
+        assert results == [msg.decode(), msg.decode()]
+
+    def test_cbc_without_iv_still_raises(self):
+        """Test mode validation is not bypassed by the cipher cache."""
+        key = bytes.fromhex(KEY)
+        with pytest.raises(ValueError):
+            block._aes_cryptography(bytes(16), key, None, "CBC")
+        with pytest.raises(ValueError):
+            block._aes_cryptography(bytes(16), key, None, "CTR")
+
+
+def test_backends_are_imported_lazily():
+    """Test importing the module does not import either cipher backend."""
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    code = (
+        "import sys, src.tools.block; "
+        "print('Crypto' in sys.modules or 'cryptography' in sys.modules)"
+    )
+    root = Path(__file__).resolve().parents[2]
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=root
+    )
+    assert out.stdout.strip() == "False"
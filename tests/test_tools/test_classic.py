@@ -1,14 +1,48 @@
 """Unit tests for classic cipher tools."""
 
+from src.tools import classic
 from src.tools.classic import (
+    _best_shift_frequency,
+    _best_shifts,
+    _kasiski_lengths,
+    _transposition_candidates,
     affine_break,
     caesar_break,
+    columnar_transposition_decrypt,
     playfair_break,
     rail_fence_break,
     transposition_break,
     vigenere_break,
 )
 
+_PLAIN = (
+    "it was the best of times it was the worst of times it was the age of wisdom "
+    "it was the age of foolishness it was the epoch of belief it was the epoch of "
+    "incredulity it was the season of light it was the season of darkness it was "
+    "the spring of hope it was the winter of despair we had everything before us "
+    "we had nothing before us we were all going direct to heaven"
+)
+
+
+def _vigenere_encrypt(text: str, key: str) -> str:
+    shifts = [ord(k) - ord("A") for k in key]
+    out, i = [], 0
+    for ch in text:
+        if ch.isalpha():
+            out.append(chr((ord(ch) - ord("a") + shifts[i % len(shifts)]) % 26 + ord("a")))
+            i += 1
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def _lengths_for(ciphertext: str, max_len: int = 16) -> list[int]:
+    from src.utils.scoring import text_to_u8
+
+    letters = classic._letters_only(ciphertext)
+    ids, vocab = classic._letter_ids(letters)
+    return classic._candidate_lengths(ids, vocab, text_to_u8(letters.lower()), max_len)
+
 
 class TestCaesarBreak:
     """Tests for caesar_break function."""
@@ -61,6 +95,53 @@ class TestVigenereBreak:
         # Key length should be <= 5
         assert len(results[0].key) <= 5
 
+    def test_kasiski_keeps_true_key_length(self):
+        """Test repeated-trigram distances shortlist the key length and its divisors."""
+        from src.utils.scoring import text_to_u8
+
+        # "thexyz" repeats every 6 letters, so every trigram repeat is 6 apart.
+        lengths = _kasiski_lengths(text_to_u8("thexyz" * 8), 16)
+        assert 6 in lengths
+        assert set(lengths) <= {2, 3, 6, 12}
+        assert _kasiski_lengths(text_to_u8("abcdefghij"), 16) == []
+
+    def test_short_ciphertext_tries_every_key_length(self):
+        """Test chance trigram repeats in short text never narrow the sweep."""
+        ct = _vigenere_encrypt(_PLAIN[:180], "TSUEBUUKO")
+        assert len(classic._letters_only(ct)) < classic._KASISKI_MIN_LETTERS
+        assert sorted(_lengths_for(ct)) == list(range(2, 17))
+
+    def test_top_ioc_length_survives_divisor_only_shortlist(self, mocker):
+        """Test the best IOC length is tried when Kasiski only kept its divisors."""
+        ct = _vigenere_encrypt(_PLAIN, "TSUEBUUKO")
+        mocker.patch.object(classic, "_kasiski_lengths", return_value=[2, 3])
+        assert 9 in _lengths_for(ct)
+        assert "TSUEBUUKO" in [r.key for r in vigenere_break(ct, top_k=3)]
+
+    def test_multiples_of_shortlisted_length_are_not_added(self, mocker):
+        """Test a multiple of the true length is not added back for its IOC."""
+        ct = _vigenere_encrypt(_PLAIN, "LEMON")
+        mocker.patch.object(classic, "_kasiski_lengths", return_value=[5])
+        assert _lengths_for(ct)[0] == 5
+        assert not {10, 15} & set(_lengths_for(ct))
+
+    def test_column_shifts_match_per_column_search(self):
+        """Test the batched column search agrees with scanning each column."""
+        from src.utils.scoring import text_to_u8
+
+        text = "LlggelkaqihbkLgcphsrfklxXpcxmlzmfuigzitvteweuvjbfhkkunagmcc"
+        lowered = text_to_u8(text.lower())
+        for klen in range(1, 12):
+            expected = [_best_shift_frequency(text[i::klen]) for i in range(klen)]
+            assert _best_shifts(lowered, klen).tolist() == expected
+
+    def test_letters_only_matches_isalpha_filter(self):
+        """Test the translate-based letter filter keeps exactly the isalpha characters."""
+        from src.tools.classic import _letters_only
+
+        for text in ("Lxf op, 12 vef!\n", "".join(map(chr, range(128))), "café Ünïcode ß 1"):
+            assert _letters_only(text) == "".join(c for c in text if c.isalpha())
+
 
 class TestAffineBreak:
     """Tests for affine_break function."""
@@ -124,6 +205,14 @@ class TestTranspositionBreak:
         # Key should be in format like '0-1-2' or '1-0-2'
         assert "-" in results[0].key
 
+    def test_candidates_match_single_decrypt(self):
+        """Test the batched candidates equal decrypting with each key order."""
+        text = "WEAREDISCOVEREDFLEEATONCE"
+        for k in (2, 3, 4):
+            perms, cands = _transposition_candidates(text, k)
+            for perm, row in zip(perms.tolist(), cands, strict=True):
+                assert row.tobytes().decode() == columnar_transposition_decrypt(text, perm)
+
 
 class TestPlayfairBreak:
     """Tests for playfair_break function."""
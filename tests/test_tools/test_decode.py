@@ -1,14 +1,23 @@
 """Unit tests for decode/detection tools."""
 
-from src.tools.decode import decode_common, detect_encoding
+import pytest
+
+from src.tools import decode
+from src.tools.decode import _try_decode_base64, decode_common, detect_encoding
+
+
+@pytest.fixture(scope="module")
+def b64_results():
+    """detect_encoding output for one base64 sample, shared by read-only tests."""
+    return tuple(detect_encoding("SGVsbG8gd29ybGQ=", top_k=5))
 
 
 class TestDetectEncoding:
     """Tests for detect_encoding function."""
 
-    def test_detect_base64(self):
+    def test_detect_base64(self, b64_results):
         """Test detecting base64 encoding."""
-        results = detect_encoding("SGVsbG8gd29ybGQ=", top_k=5)
+        results = b64_results
         assert len(results) > 0
         base64_results = [r for r in results if r.name == "base64"]
         assert len(base64_results) > 0
@@ -39,9 +48,9 @@ class TestDetectEncoding:
         results = detect_encoding("SGVsbG8gd29ybGQ=", top_k=2)
         assert len(results) <= 2
 
-    def test_detect_scoring(self):
+    def test_detect_scoring(self, b64_results):
         """Test results are scored by English likeness."""
-        results = detect_encoding("SGVsbG8gd29ybGQ=", top_k=5)
+        results = b64_results
         # Results should be sorted by score
         for i in range(len(results) - 1):
             assert results[i].score >= results[i + 1].score
@@ -49,6 +58,54 @@ class TestDetectEncoding:
         for r in results:
             assert 0 <= r.score <= 1
 
+    def test_detect_skips_decoders_outside_charset(self):
+        """Test decoders whose alphabet does not match the input are skipped."""
+        names = {r.name for r in detect_encoding("hello, world!", top_k=10)}
+        assert names.isdisjoint({"base64", "base32", "base16", "hex", "url"})
+        assert "unicode_escape" in names
+
+    def test_base64_padding_matches_stdlib_fallback(self, monkeypatch):
+        """Test the fast base64 path accepts the same padding as the stdlib path."""
+        inputs = ["SGVsbG8=", "SGVsbG8gd29ybGQ=", "aa/9=", "A0+==", "=", "SGVs*G8=", "x" * 70 + "!"]
+        fast = [_try_decode_base64(s) for s in inputs]
+        monkeypatch.setattr(decode, "HAS_PYBASE64", False)
+        assert fast == [_try_decode_base64(s) for s in inputs]
+
+
+class TestProbeCache:
+    """Tests for the decoder probe shared by both tools."""
+
+    def test_decoders_run_once_for_both_tools(self, monkeypatch):
+        """Test detect_encoding and decode_common share one probe per input."""
+        calls = []
+
+        def fake(s):
+            calls.append(s)
+            return s.upper()
+
+        monkeypatch.setattr(decode, "DECODERS", [("fake", fake)])
+        decode._probe_cached.cache_clear()
+        detect_encoding("probe me", top_k=1)
+        decode_common("probe me", limit=1)
+        assert calls == ["probe me"]
+        decode._probe_cached.cache_clear()
+
+    def test_large_inputs_are_not_memoized(self, monkeypatch):
+        """Test inputs above the size guard bypass the probe cache."""
+        monkeypatch.setattr(decode, "_PROBE_CACHE_MAX_CHARS", 4)
+        decode._probe_cached.cache_clear()
+        detect_encoding("SGVsbG8=")
+        assert decode._probe_cached.cache_info().currsize == 0
+
+    def test_probe_does_not_fill_english_score_cache(self):
+        """Test decodings are scored without going through english_score's LRU."""
+        from src.utils.scoring import english_score
+
+        decode._probe_cached.cache_clear()
+        english_score.cache_clear()
+        detect_encoding("SGVsbG8gd29ybGQ=")
+        assert english_score.cache_info().currsize == 0
+
 
 class TestDecodeCommon:
     """Tests for decode_common function."""
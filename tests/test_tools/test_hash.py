@@ -0,0 +1,29 @@
+"""Unit tests for hash identification tools."""
+
+from src.tools.hash import hash_identify
+
+
+class TestHashIdentify:
+    """Tests for hash_identify function."""
+
+    def test_md5(self):
+        """Test a 32-character hex digest is reported as MD5."""
+        assert hash_identify("d41d8cd98f00b204e9800998ecf8427e") == ["MD5", "Base64-like"]
+
+    def test_sha256_uppercase_and_whitespace(self):
+        """Test uppercase hex is accepted and surrounding whitespace ignored."""
+        digest = "E3B0C44298FC1C149AFBF4C8996FB92427AE41E4649B934CA495991B7852B855"
+        assert hash_identify(f"  {digest}\n") == ["SHA256", "Base64-like"]
+
+    def test_hex_of_unknown_length(self):
+        """Test hex of a non-digest length is only base64-like."""
+        assert hash_identify("abcdef") == ["Base64-like"]
+
+    def test_base64_only(self):
+        """Test base64 text that is not hex."""
+        assert hash_identify("SGVsbG8gd29ybGQ=") == ["Base64-like"]
+
+    def test_neither(self):
+        """Test text outside both alphabets matches nothing."""
+        assert hash_identify("not a hash!") == []
+        assert hash_identify("٣" * 32) == []
@@ -1,5 +1,7 @@
 """Unit tests for number theory tools."""
 
+import pytest
+
 from src.tools.number import factor_integer
 
 
@@ -103,3 +105,94 @@ class TestInternalHelpers:
         # This number requires Pollard's Rho (or similar) for efficient factoring
         result = factor_integer(10403, prefer_yafu=False)
         assert result.factors == ["101", "103"]
+
+    def test_factors_above_trial_division_limit(self):
+        """Test cofactors left after trial division are split by Pollard's Rho."""
+        result = factor_integer(97 * 1000003 * 1000033, prefer_yafu=False)
+        assert result.factors == ["97", "1000003", "1000033"]
+
+    def test_pollards_rho_splits_semiprime(self):
+        """Test Brent's rho returns a factor of a semiprime past the trial limit."""
+        from src.tools.number import _pollards_rho
+
+        p, q = 16777259, 16777289
+        assert _pollards_rho(p * q) in (p, q)
+
+    def test_pollards_rho_prime_square(self):
+        """Test prime squares, where a gcd batch can overshoot to n, still split."""
+        from src.tools.number import _pollards_rho
+
+        for p in (101, 1000003, 16777259):
+            assert _pollards_rho(p * p) == p
+
+    def test_pollards_rho_without_gmpy2(self, monkeypatch):
+        """Test the pure-int fallback factors the same number."""
+        from src.tools import number
+
+        monkeypatch.setattr(number, "HAS_GMPY2", False)
+        assert number._pollards_rho(1000003 * 1000033) in (1000003, 1000033)
+
+    def test_small_prime_table(self):
+        """Test the trial-division prime table matches a naive primality check."""
+        from src.tools.number import _SMALL_PRIMES, _primes_upto
+
+        naive = [n for n in range(2, 2000) if all(n % d for d in range(2, int(n**0.5) + 1))]
+        assert list(_primes_upto(1999)) == naive
+        assert _SMALL_PRIMES[:5] == (2, 3, 5, 7, 11)
+        assert _SMALL_PRIMES[-1] == 99991
+
+    def test_trial_division_stops_at_prime_cofactor(self):
+        """Test trial division returns a large prime cofactor untouched."""
+        from src.tools.number import _trial_division
+
+        assert _trial_division(2**4 * 3 * (2**61 - 1)) == ([2, 2, 2, 2, 3], 2**61 - 1)
+
+    def test_parallel_rho_finds_factor(self):
+        """Test the process-pool walks return a factor of the cofactor."""
+        from src.tools.number import _parallel_rho
+
+        assert _parallel_rho(1000003 * 1000033) in (1000003, 1000033)
+
+    def test_rho_walk_stops_once_its_job_is_over(self, mocker):
+        """Test a pool walk gives up when the shared job id has moved past it."""
+        import ctypes
+
+        from src.tools import number
+
+        n = 1000003 * 1000033
+        mocker.patch.object(number, "_RHO_JOB", ctypes.c_longlong(5))
+        assert number._rho_walk(n, 2, 1, job=4) is None
+        assert number._rho_walk(n, 2, 1, job=5) in (1000003, 1000033)
+
+    def test_parallel_rho_ends_its_job_on_error(self, mocker):
+        """Test an interrupted factorization cancels queued walks and stops running ones."""
+        from concurrent.futures import wait
+
+        from src.tools import number
+
+        _, current_job = number._rho_pool()
+        before = current_job.value
+        submitted = []
+        real_submit = number.ProcessPoolExecutor.submit
+
+        def submit(pool, *args):
+            submitted.append(real_submit(pool, *args))
+            return submitted[-1]
+
+        mocker.patch.object(number.ProcessPoolExecutor, "submit", submit)
+        mocker.patch.object(number, "wait", side_effect=RuntimeError)
+        with pytest.raises(RuntimeError):
+            number._parallel_rho(1000003 * 1000033)
+        assert current_job.value == before + 2
+        # Queued walks are cancelled and running ones return; none is left busy.
+        assert not wait(submitted, timeout=60).not_done
+
+    def test_rho_pool_failure_falls_back_to_serial(self, mocker):
+        """Test a failing process pool still yields a factor."""
+        from src.tools import number
+
+        mocker.patch.object(number, "_PARALLEL_RHO_BITS", 1)
+        mocker.patch.object(number.os, "cpu_count", return_value=4)
+        mocker.patch.object(number, "_parallel_rho", side_effect=OSError)
+        mocker.patch.object(number, "_rho_pool")
+        assert number._pollards_rho(1000003 * 1000033) in (1000003, 1000033)
@@ -0,0 +1,52 @@
+"""Unit tests for RC4 tools."""
+
+import pytest
+
+from src.tools import rc4 as rc4_module
+from src.tools.rc4 import _keystream_nb, _keystream_py, rc4, rc4_decrypt
+
+
+class TestRC4:
+    """Tests for rc4 function."""
+
+    def test_rc4_known_vector(self):
+        """Test the classic Key/Plaintext test vector."""
+        ct = bytes.fromhex("bbf316e8d940af0ad3")
+        assert rc4(ct, b"Key") == b"Plaintext"
+
+    def test_rc4_round_trip(self):
+        """Test encrypting twice with the same key restores the input."""
+        data = bytes(range(256)) * 4
+        assert rc4(rc4(data, b"secret"), b"secret") == data
+
+    def test_rc4_empty_data(self):
+        """Test empty input produces empty output."""
+        assert rc4(b"", b"Key") == b""
+
+    def test_rc4_long_key_matches_fallback(self, monkeypatch):
+        """Test keys longer than 256 bytes agree with the pure-Python KSA."""
+        data = bytes(range(256)) * 2
+        key = bytes(range(256)) + b"ignored tail"
+        fast = rc4(data, key)
+        monkeypatch.setattr(rc4_module, "HAS_PYCRYPTO", False)
+        assert rc4(data, key) == fast
+
+    @pytest.mark.skipif(_keystream_nb is None, reason="numba not installed")
+    def test_numba_keystream_matches_python(self):
+        """Test the Numba PRGA and the pure-Python PRGA agree."""
+        import numpy as np
+
+        s = list(range(256))
+        assert _keystream_nb(np.array(s, dtype=np.int64), 512).tobytes() == _keystream_py(s, 512)
+
+
+class TestRC4Decrypt:
+    """Tests for rc4_decrypt function."""
+
+    async def test_rc4_decrypt_hex(self):
+        """Test decrypting hex ciphertext with a raw key."""
+        assert await rc4_decrypt("bbf316e8d940af0ad3", "hex", "Key", "raw") == "Plaintext"
+
+    async def test_rc4_decrypt_missing_key(self):
+        """Test a missing key without a context returns an empty string."""
+        assert await rc4_decrypt("bbf316e8d940af0ad3", "hex") == ""
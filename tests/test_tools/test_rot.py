@@ -84,3 +84,24 @@ class TestRotAll:
         results = rot_all("000", top_k=1)
         # Numbers should be preserved
         assert "000" in results[0].plaintext
+
+    def test_shift_candidates_match_shift_text(self):
+        """Test every candidate row decodes to the string-level shift."""
+        import numpy as np
+
+        from src.tools.rot import _shift_candidates, _shift_text
+
+        text = "Hello, World! Ünïcödé ok"
+        shifts = np.arange(26)
+        rows = _shift_candidates(text, shifts)
+        assert rows.shape == (26, len(text.encode("latin-1")))
+        for k, row in zip(shifts, rows, strict=True):
+            assert row.tobytes().decode("latin-1") == _shift_text(text, int(k))
+
+    def test_rot_all_partial_top_k_matches_full_ranking(self):
+        """Test materializing only the top shifts keeps the full ranking's order."""
+        text = "Gur dhvpx oebja sbk whzcf bire gur ynml qbt"
+        full = rot_all(text, top_k=25)
+        assert len(full) == 25
+        assert rot_all(text, top_k=3) == full[:3]
+        assert full[0].key == "13"
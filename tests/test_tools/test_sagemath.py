@@ -79,7 +79,6 @@ class TestEllipticCurveFactor:
         assert result is not None
 
 
-@pytest.mark.skipif(not HAS_SAGEMATH, reason="SageMath not installed")
 class TestChineseRemainder:
     """Tests for chinese_remainder function."""
 
@@ -111,6 +110,41 @@ class TestChineseRemainder:
         assert result["found"] is False
         assert result["error"] is not None
 
+    def test_crt_non_coprime_solvable(self):
+        """Test consistent congruences with shared factors reduce modulo the lcm."""
+        result = chinese_remainder([("1", "4"), ("3", "6")])
+        assert result["found"] is True
+        assert result["x"] == "9"
+        assert result["modulus"] == "12"
+
+    def test_crt_non_coprime_inconsistent(self):
+        """Test contradictory congruences report no solution."""
+        result = chinese_remainder([("1", "4"), ("2", "6")])
+        assert result["found"] is False
+        assert result["error"] == "No solution exists (congruences are inconsistent)"
+
+    def test_crt_rejects_empty_input(self):
+        """Test an empty congruence list is an error, not the trivial solution."""
+        result = chinese_remainder([])
+        assert result["found"] is False
+        assert result["error"] is not None
+
+    def test_crt_rejects_non_positive_modulus(self):
+        """Test zero or negative moduli are rejected."""
+        result = chinese_remainder([("1", "0")])
+        assert result["found"] is False
+        assert result["error"] is not None
+
+    def test_crt_does_not_call_sage(self, mocker):
+        """Test CRT is solved without a SageMath round trip."""
+        run = mocker.patch("src.tools.sagemath._run_sage")
+        result = chinese_remainder([(str(2**200 + 7), str(2**255 - 19)), ("5", "11")])
+        assert result["found"] is True
+        x = int(result["x"])
+        assert x % (2**255 - 19) == 2**200 + 7
+        assert x % 11 == 5
+        run.assert_not_called()
+
 
 @pytest.mark.skipif(not HAS_SAGEMATH, reason="SageMath not installed")
 class TestLinearCongruence:
@@ -216,6 +250,95 @@ class TestQuadraticResidue:
         assert "0" in result["roots"]
 
 
+class TestPyDiscreteLog:
+    """Tests for the pure-Python discrete log used for small moduli."""
+
+    def test_solves_without_sage(self, mocker):
+        """Test small-p queries are answered without running Sage."""
+        from src.tools import sagemath
+
+        run = mocker.patch.object(sagemath, "_run_sage")
+        result = discrete_log("5", "101", "2")
+        assert result["found"] is True
+        assert result["x"] == "24"
+        assert result["method"] == "ph"
+        run.assert_not_called()
+
+    def test_default_base_is_smallest_primitive_root(self):
+        """Test the base defaults to the smallest generator of the group."""
+        # 3 is the smallest primitive root mod 7.
+        result = discrete_log("6", "7")
+        assert result["x"] == "3"
+
+    def test_matches_brute_force(self):
+        """Test Pohlig-Hellman returns the smallest exponent, or None."""
+        from src.tools.sagemath import _py_discrete_log, _py_unit_group_factors
+
+        for p in (2, 3, 31, 97, 257, 1009):
+            factors = _py_unit_group_factors(p)
+            for g in range(1, min(p, 40)):
+                for h in range(1, min(p, 40)):
+                    expected = next((x for x in range(p) if pow(g, x, p) == h), None)
+                    assert _py_discrete_log(h, g, p, factors) == expected
+
+    def test_64_bit_smooth_modulus(self):
+        """Test a 64-bit prime with a smooth p - 1 is solved in pure Python."""
+        p = 2**64 - 83  # p - 1 = 2^2 * 43 * 67 * 193 * 809383 * 10247197
+        x = 0x123456789ABCDEF
+        result = discrete_log(str(pow(5, x, p)), str(p), "5")
+        assert result["found"] is True
+        assert pow(5, int(result["x"]), p) == pow(5, x, p)
+
+    def test_parallel_bsgs_matches_serial(self):
+        """Test splitting the search across processes finds the same exponent."""
+        from src.tools.sagemath import _bsgs_range, _parallel_bsgs
+
+        p = 2**64 - 83
+        q = 10247197
+        g = pow(5, (p - 1) // q, p)
+        for x in (0, 1, q // 3, q - 1):
+            h = pow(g, x, p)
+            assert _parallel_bsgs(g, h, p, q, 3) == x
+            assert _bsgs_range(g, h, p, 0, q) == x
+
+    def test_pool_failure_falls_back_to_serial(self, mocker):
+        """Test a failing process pool still yields the right answer."""
+        from src.tools import sagemath
+
+        mocker.patch.object(sagemath, "_PARALLEL_BSGS_STEPS", 1)
+        mocker.patch.object(sagemath.os, "cpu_count", return_value=4)
+        mocker.patch.object(sagemath, "_parallel_bsgs", side_effect=OSError)
+        mocker.patch.object(sagemath, "_dlog_pool")
+        assert sagemath._py_bsgs(2, 5, 101, 100) == 24
+
+    def test_not_in_subgroup(self):
+        """Test a target outside the base's subgroup is reported as not found."""
+        # 4 generates the squares mod 11; 2 is not a square.
+        result = discrete_log("2", "11", "4")
+        assert result["found"] is False
+        assert result["error"] == "g is not a power of the base"
+
+    def test_fast_false_uses_sage(self, mocker):
+        """Test fast=False sends even small moduli to Sage."""
+        from src.tools import sagemath
+
+        mocker.patch.object(sagemath, "HAS_SAGEMATH", True)
+        run = mocker.patch.object(sagemath, "_run_sage", return_value="RESULT: 24\n")
+        assert discrete_log("5", "101", "2", fast=False)["method"] == "auto"
+        run.assert_called_once()
+
+    def test_explicit_method_skips_fast_path(self, mocker):
+        """Test a requested algorithm is honoured instead of the Python Pohlig-Hellman."""
+        from src.tools import sagemath
+
+        mocker.patch.object(sagemath, "HAS_SAGEMATH", True)
+        run = mocker.patch.object(sagemath, "_run_sage", return_value="RESULT: 24\n")
+        result = discrete_log("5", "101", "2", method="rho")
+        assert result["method"] == "rho"
+        assert result["x"] == "24"
+        run.assert_called_once()
+
+
 class TestSageMathAvailability:
     """Tests for SageMath availability check."""
 
@@ -230,19 +353,224 @@ class TestSageMathAvailability:
             pytest.skip("SageMath is installed")
             return
 
-        # Test functions handle missing SageMath gracefully
-        result = discrete_log("5", "101", "2")
+        # Test functions handle missing SageMath gracefully; discrete logs
+        # beyond the pure-Python fast path still need Sage.
+        result = discrete_log("5", str(2**89 - 1), "3")
         assert result["found"] is False
         assert "SageMath not installed" in result.get("error", "")
 
+        # chinese_remainder is pure Python and works without Sage.
         result = chinese_remainder([("2", "3"), ("3", "5")])
-        assert result["found"] is False
-        assert "SageMath not installed" in result.get("error", "")
+        assert result["found"] is True
 
         result = lll_reduce([["1", "0"], ["0", "1"]])
         assert result["success"] is False
         assert "SageMath not installed" in result.get("error", "")
 
+    def test_run_sage_memoizes_output(self, mocker):
+        """Test identical Sage scripts only run once."""
+        from src.tools import sagemath
+
+        mocker.patch.object(sagemath, "HAS_SAGEMATH", True)
+        mocker.patch.object(sagemath, "_SAGE_BINARY", "sage")
+        session = mocker.patch.object(sagemath, "_sage_session")
+        run = session.return_value.run
+        run.return_value = "42\n"
+        sagemath._sage_output.cache_clear()
+        try:
+            assert sagemath._run_sage("print(42)", memo=True) == "42\n"
+            assert sagemath._run_sage("print(42)", memo=True) == "42\n"
+            assert run.call_count == 1
+        finally:
+            sagemath._sage_output.cache_clear()
+
+    def test_run_sage_reruns_unmemoized_and_error_output(self, mocker):
+        """Test randomized scripts and ERROR: reports always run again."""
+        from src.tools import sagemath
+
+        mocker.patch.object(sagemath, "HAS_SAGEMATH", True)
+        mocker.patch.object(sagemath, "_SAGE_BINARY", "sage")
+        session = mocker.patch.object(sagemath, "_sage_session")
+        run = session.return_value.run
+        sagemath._sage_output.cache_clear()
+        try:
+            run.return_value = "NO_FACTOR\n"
+            assert sagemath._run_sage("ecm()") == "NO_FACTOR\n"
+            assert sagemath._run_sage("ecm()") == "NO_FACTOR\n"
+            assert run.call_count == 2
+
+            run.return_value = "ERROR: out of memory\n"
+            assert sagemath._run_sage("lll()", memo=True) == "ERROR: out of memory\n"
+            assert sagemath._run_sage("lll()", memo=True) == "ERROR: out of memory\n"
+            assert run.call_count == 4
+        finally:
+            sagemath._sage_output.cache_clear()
+
+    def test_ecm_and_discrete_log_are_not_memoized(self, mocker):
+        """Test ECM retries draw new curves and discrete logs report fresh timings."""
+        from src.tools import sagemath
+
+        mocker.patch.object(sagemath, "HAS_SAGEMATH", True)
+        run = mocker.patch.object(sagemath, "_run_sage", return_value=None)
+
+        sagemath.elliptic_curve_factor("455839")
+        sagemath.discrete_log("5", str(2**89 - 1), "3")
+        sagemath.quadratic_residue("4", "7")
+        memo = [c.kwargs.get("memo", False) for c in run.call_args_list]
+        assert memo == [False, False, True]
+
+    def test_distinct_scripts_share_one_worker(self, mocker):
+        """Test independent queries reuse one Sage process instead of one each."""
+        from src.tools import sagemath
+
+        mocker.patch.object(sagemath, "HAS_SAGEMATH", True)
+        mocker.patch.object(sagemath, "_SAGE_BINARY", "sage")
+        session_cls = mocker.patch.object(sagemath, "_SageSession")
+        session_cls.return_value.run.side_effect = lambda code, timeout: code
+        mocker.patch.object(sagemath.atexit, "register")
+        sagemath._sage_session.cache_clear()
+        sagemath._sage_output.cache_clear()
+        try:
+            outputs = [sagemath._run_sage(f"print({i})") for i in range(3)]
+            assert outputs == ["print(0)", "print(1)", "print(2)"]
+            assert session_cls.call_count == 1
+        finally:
+            sagemath._sage_session.cache_clear()
+            sagemath._sage_output.cache_clear()
+
+    def test_run_sage_does_not_cache_timeouts(self, mocker):
+        """Test a timed-out script is retried on the next call."""
+        import subprocess
+
+        from src.tools import sagemath
+
+        mocker.patch.object(sagemath, "HAS_SAGEMATH", True)
+        mocker.patch.object(sagemath, "_SAGE_BINARY", "sage")
+        session = mocker.patch.object(sagemath, "_sage_session")
+        run = session.return_value.run
+        run.side_effect = subprocess.TimeoutExpired("sage", 1)
+        sagemath._sage_output.cache_clear()
+        assert sagemath._run_sage("slow()", timeout=1) is None
+        assert sagemath._run_sage("slow()", timeout=1) is None
+        assert run.call_count == 2
+
+    def test_composite_modulus_rejected_before_sage(self, mocker):
+        """Test a composite p is reported without starting a Sage script."""
+        from src.tools import sagemath
+
+        mocker.patch.object(sagemath, "HAS_SAGEMATH", True)
+        run = mocker.patch.object(sagemath, "_run_sage")
+
+        result = sagemath.discrete_log("5", "100", "2")
+        assert result["found"] is False
+        assert result["error"] == "p must be prime"
+        result = sagemath.quadratic_residue("4", "0x21")
+        assert result["error"] == "p must be prime"
+        result = sagemath.elliptic_curve_point_add(("1", "1"), "15", ("0", "1"), ("0", "1"))
+        assert result["error"] == "p must be prime"
+        run.assert_not_called()
+
+    def test_strong_pseudoprime_modulus_rejected_without_gmpy2(self, mocker):
+        """Test a strong pseudoprime to bases 2..11 is not taken for a prime."""
+        from src.tools import number, sagemath
+
+        mocker.patch.object(number, "HAS_GMPY2", False)
+        number._is_probable_prime.cache_clear()
+        try:
+            # 6763 * 10627 * 29947
+            result = sagemath.discrete_log("5", "2152302898747")
+            assert result["found"] is False
+            assert result["error"] == "p must be prime"
+            assert number._is_probable_prime(2**61 - 1)
+        finally:
+            number._is_probable_prime.cache_clear()
+
+    def test_bsgs_reuses_worker_table_unless_disabled(self, mocker):
+        """Test method="bsgs" sends the table-caching script only when allowed."""
+        from src.tools import sagemath
+
+        mocker.patch.object(sagemath, "HAS_SAGEMATH", True)
+        run = mocker.patch.object(sagemath, "_run_sage", return_value="RESULT: 24\n")
+        assert sagemath.discrete_log("5", "101", "2", method="bsgs", fast=False)["x"] == "24"
+        assert "_session_cache" in run.call_args.args[0]
+        sagemath.discrete_log("5", "101", "2", method="bsgs", reuse_table=False, fast=False)
+        assert "_session_cache" not in run.call_args.args[0]
+
+
+class TestSageSession:
+    """Tests for the persistent Sage worker, driven by plain Python."""
+
+    @pytest.fixture
+    def session(self):
+        import sys
+
+        from src.tools import sagemath
+
+        session = sagemath._SageSession([sys.executable, "-c", sagemath._SESSION_DRIVER])
+        yield session
+        session.close()
+
+    def test_runs_scripts_in_one_process(self, session):
+        """Test consecutive scripts reuse the worker and get fresh globals."""
+        assert session.run("x = 6 * 7\nprint(x)", timeout=30) == "42\n"
+        pid = session._proc.pid
+        assert session.run("print('x' in globals())", timeout=30) == "False\n"
+        assert session._proc.pid == pid
+
+    def test_script_errors_keep_partial_output(self, session):
+        """Test output printed before an exception is still returned."""
+        assert session.run("print(1)\n1 / 0", timeout=30) == "1\n"
+        assert session.run("raise SystemExit(3)", timeout=30) == ""
+        assert session.run("print(2)", timeout=30) == "2\n"
+
+    def test_repeated_script_reuses_compiled_code(self, session):
+        """Test a re-sent script runs again and a syntax error returns no output."""
+        script = "print(len(_session_cache))\n_session_cache[len(_session_cache)] = 1"
+        assert session.run(script, timeout=30) == "0\n"
+        assert session.run(script, timeout=30) == "1\n"
+        assert session.run("print(1 +)", timeout=30) == ""
+        assert session.run("print(4)", timeout=30) == "4\n"
+
+    def test_scripts_cannot_read_the_request_stream(self, session):
+        """Test a script reading stdin sees EOF instead of the next request."""
+        assert session.run("print(input())", timeout=30) == ""
+        assert session.run("print(3)", timeout=30) == "3\n"
+
+    def test_bsgs_table_persists_between_queries(self, session):
+        """Test the cached BSGS script solves queries and keeps one table per group."""
+        from src.tools.sagemath import _bsgs_code
+
+        # Minimal stand-in for Sage's prime field, enough for the BSGS script.
+        shim = (
+            "class _E:\n"
+            "    def __init__(self, v, p): self.v, self.p = v % p, p\n"
+            "    def __mul__(self, o): return _E(self.v * o.v, self.p)\n"
+            "    def __pow__(self, k): return _E(pow(self.v, k, self.p), self.p)\n"
+            "    def __int__(self): return self.v\n"
+            "    def multiplicative_order(self):\n"
+            "        k, v = 1, self.v\n"
+            "        while v != 1: v, k = v * self.v % self.p, k + 1\n"
+            "        return k\n"
+            "def GF(p): return lambda v: _E(v, p)\n"
+        )
+        for g in (5, 7, 1):
+            out = session.run(shim + _bsgs_code(g, 101, 2), timeout=30)
+            x = int(out.splitlines()[0].removeprefix("RESULT: "))
+            assert pow(2, x, 101) == g
+        assert session.run("print(len(_session_cache))", timeout=30) == "1\n"
+        out = session.run(shim + _bsgs_code(6, 101, 5), timeout=30)
+        assert out.startswith("ERROR: g is not a power")
+        assert session.run("print(len(_session_cache))", timeout=30) == "2\n"
+
+    def test_timeout_restarts_worker(self, session):
+        """Test a timed-out script kills the worker and the next call recovers."""
+        import subprocess
+
+        with pytest.raises(subprocess.TimeoutExpired):
+            session.run("while True: pass", timeout=0.5)
+        assert session._proc is None
+        assert session.run("print('ok')", timeout=30) == "ok\n"
+
 
 @pytest.mark.skipif(not HAS_SAGEMATH, reason="SageMath not installed")
 class TestLLLReduce:
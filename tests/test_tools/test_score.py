@@ -0,0 +1,81 @@
+"""Unit tests for wordlist scoring tools."""
+
+import pytest
+
+from src.tools import score
+from src.tools.rot import rot_all
+from src.tools.score import parse_wordlist, rank_with_wordlist, wordlist_score
+
+
+class TestParseWordlist:
+    """Tests for parse_wordlist function."""
+
+    def test_strips_and_drops_blank_lines(self):
+        """Test whitespace is stripped and empty lines are skipped."""
+        assert parse_wordlist(" the \n\nflag\n  \nkey\n") == ("the", "flag", "key")
+
+    def test_result_is_cached(self):
+        """Test the same resource text is parsed only once."""
+        text = "alpha\nbeta\n"
+        assert parse_wordlist(text) is parse_wordlist(text)
+
+
+class TestWordlistScore:
+    """Tests for wordlist_score function."""
+
+    def test_empty_wordlist(self):
+        """Test an empty wordlist scores zero."""
+        assert wordlist_score("hello world", ()) == 0.0
+
+    def test_fraction_of_words_found(self):
+        """Test the score is the fraction of listed words present."""
+        assert wordlist_score("Hello World", ["hello", "world", "flag", "key"]) == 0.5
+
+    def test_text_is_lowercased_but_words_are_not(self):
+        """Test matching lowercases the text only."""
+        assert wordlist_score("I AM HERE", ["I", "am"]) == 0.5
+
+    def test_duplicate_words_each_count(self):
+        """Test repeated wordlist entries count once per entry."""
+        assert wordlist_score("the end", ["the", "the", "zzz", "qqq"]) == 0.5
+
+    @pytest.mark.skipif(not score.HAS_AHOCORASICK, reason="pyahocorasick not installed")
+    def test_automaton_matches_substring_scan(self, monkeypatch):
+        """Test the Aho-Corasick path agrees with the plain substring scan."""
+        words = ("the", "he", "a", "", "flag", "ab", "thé", "xyz")
+        texts = ["", "The Flag", "abc the", "THÉ", "hehehe", "nothing"]
+        fast = [wordlist_score(t, words) for t in texts]
+        monkeypatch.setattr(score, "HAS_AHOCORASICK", False)
+        assert fast == [wordlist_score(t, words) for t in texts]
+
+
+class TestRankWithWordlist:
+    """Tests for rank_with_wordlist function."""
+
+    def test_matches_full_rescoring(self):
+        """Test the bounded scan returns exactly the fully rescored top k."""
+        cands = rot_all("Gur synt vf va gur xrl sbe gur frperg ebbg", 25)
+        words = parse_wordlist("flag\nkey\nsecret\nroot\nthe\n")
+        full = sorted(
+            cands,
+            key=lambda c: 0.7 * c.confidence + 0.3 * wordlist_score(c.plaintext, words),
+            reverse=True,
+        )
+        for top_k in (1, 3, 25):
+            ranked = rank_with_wordlist(cands, words, top_k)
+            assert [c.key for c in ranked] == [c.key for c in full[:top_k]]
+
+    @pytest.mark.skipif(not score.HAS_AHOCORASICK, reason="pyahocorasick not installed")
+    def test_builds_one_automaton_per_wordlist(self):
+        """Test ranking every candidate reuses a single automaton."""
+        score._wordlist_automaton.cache_clear()
+        words = ("flag", "key", "the")
+        rank_with_wordlist(rot_all("Gur synt vf gur xrl", 25), words, 25)
+        rank_with_wordlist(rot_all("Uryyb jbeyq", 25), words, 25)
+        info = score._wordlist_automaton.cache_info()
+        assert info.misses == 1
+        assert info.hits >= 1
+
+    def test_non_positive_top_k(self):
+        """Test a non-positive top_k yields no candidates."""
+        assert rank_with_wordlist(rot_all("Uryyb", 25), ("hello",), 0) == []
@@ -5,6 +5,17 @@ import pytest
 from src.tools.xor import _parse_data, xor_known_plaintext, xor_repeating_break, xor_single_break
 
 
+def _avg_norm_hamming(b: bytes, key_size: int, blocks: int = 4) -> float:
+    """Per-size reference for the key-size search, one int popcount per pair."""
+    if blocks < 2 or len(b) < blocks * key_size:
+        return 1e9
+    words = [
+        int.from_bytes(b[i : i + key_size], "big") for i in range(0, blocks * key_size, key_size)
+    ]
+    dists = [(x ^ y).bit_count() / key_size for x, y in zip(words, words[1:], strict=False)]
+    return sum(dists) / len(dists)
+
+
 class TestParseData:
     """Tests for _parse_data helper function."""
 
@@ -28,6 +39,14 @@ class TestParseData:
         with pytest.raises(ValueError):
             _parse_data("gg", "hex")
 
+    def test_parse_data_hex_with_whitespace(self):
+        """Test hex with whitespace between bytes still parses like bytes.fromhex."""
+        assert _parse_data("48 65\n6c 6c 6f", "hex") == b"Hello"
+
+    def test_parse_data_base64_ignores_stray_characters(self):
+        """Test base64 keeps the lenient (non-validating) decode."""
+        assert _parse_data("SGV sbG8=\n", "b64") == b"Hello"
+
 
 class TestXorSingleBreak:
     """Tests for xor_single_break function."""
@@ -53,11 +72,62 @@ class TestXorSingleBreak:
         for i in range(len(results) - 1):
             assert results[i].confidence >= results[i + 1].confidence
 
+    def test_xor_single_break_does_not_fill_english_score_cache(self):
+        """Test the 256 candidates are batch-scored without english_score's LRU."""
+        from src.utils.scoring import english_score
+
+        english_score.cache_clear()
+        xor_single_break("3f292c2c2b", encoding="hex", top_k=256)
+        assert english_score.cache_info().currsize == 0
+
     def test_xor_single_break_top_k(self):
         """Test top_k parameter limits results."""
         results = xor_single_break("3f292c2c2b", encoding="hex", top_k=5)
         assert len(results) == 5
 
+    def test_xor_single_break_partial_top_k_matches_full_ranking(self):
+        """Test the partial top-k selection agrees with ranking all 256 keys."""
+        data = bytes(b ^ 0x5A for b in b"Cooking MC's like a pound of bacon").hex()
+        full = xor_single_break(data, encoding="hex", top_k=256)
+        top = xor_single_break(data, encoding="hex", top_k=3)
+        assert [r.key for r in top] == [r.key for r in full[:3]]
+        assert top[0].key == str(0x5A)
+
+    def test_xor_single_break_plaintexts_match_their_keys(self):
+        """Test each returned plaintext is the ciphertext XORed with its own key."""
+        ct = bytes(b ^ 0x33 for b in b"Attack at dawn")
+        for r in xor_single_break(ct.hex(), encoding="hex", top_k=256):
+            expected = bytes(b ^ int(r.key) for b in ct).decode(errors="ignore")
+            assert r.plaintext == expected
+
+    def test_blockwise_scoring_matches_one_block(self, mocker):
+        """Test scoring candidates in small scratch blocks gives identical results."""
+        from src.tools import xor
+
+        data = bytes(b ^ 0x21 for b in b"Now that the party is jumping, bass kicked in") * 3
+        key = b"ICE"
+        rep = bytes(b ^ key[i % 3] for i, b in enumerate(data)).hex()
+        single = xor_single_break(data.hex(), encoding="hex", top_k=256)
+        repeating = xor_repeating_break(rep, encoding="hex")
+        for block in (1, 97, 4096):
+            mocker.patch.object(xor, "_BLOCK_BYTES", block)
+            assert xor_single_break(data.hex(), encoding="hex", top_k=256) == single
+            assert xor_repeating_break(rep, encoding="hex") == repeating
+
+    def test_parallel_scoring_gives_same_ranking(self, monkeypatch):
+        """Test the multithreaded batch kernel ranks keys exactly like the serial one."""
+        from src.utils import scoring
+        from src.utils.scoring_nb import HAS_NUMBA
+
+        if not HAS_NUMBA:
+            pytest.skip("numba not installed")
+        data = bytes(b ^ 0x4B for b in b"A long ciphertext blob, scored across threads. " * 50)
+        serial = xor_single_break(data.hex(), encoding="hex", top_k=256)
+        monkeypatch.setattr(scoring, "PARALLEL_BATCH", True)
+        monkeypatch.setattr(scoring, "_PARALLEL_BATCH_MIN", 0)
+        assert xor_single_break(data.hex(), encoding="hex", top_k=256) == serial
+        assert serial[0].key == str(0x4B)
+
     def test_xor_single_break_base64(self):
         """Test with base64 encoding."""
         results = xor_single_break("PxksICwp", encoding="b64", top_k=1)
@@ -108,6 +178,102 @@ class TestXorRepeatingBreak:
         assert results.key is not None
         assert 0 <= results.confidence <= 1
 
+    def test_xor_repeating_break_picks_best_scoring_candidate(self):
+        """Test the batch-scored winner is the candidate with the best byte score."""
+        import heapq
+
+        import numpy as np
+
+        from src.tools.xor import _best_column_keys
+        from src.utils.scoring import english_score_bytes
+
+        pt = b"Burning 'em, if you ain't quick and nimble I go crazy when I hear a cymbal"
+        ct = bytes(p ^ b"ICE"[i % 3] for i, p in enumerate(pt))
+        result = xor_repeating_break(ct.hex(), encoding="hex")
+        buf = np.frombuffer(ct, dtype=np.uint8)
+        sizes = heapq.nsmallest(5, range(2, 41), key=lambda ks: _avg_norm_hamming(ct, ks))
+        keys = [_best_column_keys(buf, ks) for ks in sizes]
+        best = max(
+            english_score_bytes(bytes(c ^ k[i % len(k)] for i, c in enumerate(ct))) for k in keys
+        )
+        assert result.confidence == best
+
+    def test_best_column_keys_match_per_column_break(self):
+        """Test each column key is the best single-byte key for that column alone."""
+        import numpy as np
+
+        from src.tools.xor import _best_column_keys
+        from src.utils.scoring import english_score_bytes
+
+        pt = b"Burning 'em, if you ain't quick and nimble I go crazy when I hear a cymbal"
+        ct = bytes(p ^ b"ICE"[i % 3] for i, p in enumerate(pt))
+        buf = np.frombuffer(ct, dtype=np.uint8)
+        for ks in (3, 5, 7):
+            expected = bytes(
+                max(
+                    range(256),
+                    key=lambda k, col=ct[j::ks]: (
+                        english_score_bytes(bytes(c ^ k for c in col)),
+                        -k,
+                    ),
+                )
+                for j in range(ks)
+            )
+            assert _best_column_keys(buf, ks) == expected
+
+    def test_xor_repeating_break_empty_key_range(self):
+        """Test an empty key-size range returns an empty result instead of raising."""
+        result = xor_repeating_break("00ff", encoding="hex", min_key=5, max_key=2)
+        assert result.plaintext == ""
+        assert result.confidence == 0.0
+
+    def test_key_size_distances_match_avg_norm_hamming(self):
+        """Test the vectorized key-size search matches the per-size distance exactly."""
+        import random
+
+        import numpy as np
+
+        from src.tools.xor import _key_size_distances
+
+        rng = random.Random(9)
+        for n in (0, 7, 40, 161, 400):
+            data = rng.randbytes(n)
+            buf = np.frombuffer(data, dtype=np.uint8)
+            sizes = list(range(1, 45))
+            for blocks in (2, 4):
+                expected = [_avg_norm_hamming(data, ks, blocks) for ks in sizes]
+                assert _key_size_distances(buf, sizes, blocks) == expected
+
+    def test_key_size_distances_unpackbits_fallback(self, monkeypatch):
+        """Test the pre-NumPy-2 popcount path gives the same distances."""
+        import random
+
+        import numpy as np
+
+        from src.tools import xor
+
+        data = random.Random(4).randbytes(300)
+        buf = np.frombuffer(data, dtype=np.uint8)
+        sizes = list(range(1, 45))
+        expected = [_avg_norm_hamming(data, ks) for ks in sizes]
+        monkeypatch.setattr(xor, "_HAS_BITWISE_COUNT", False)
+        assert xor._key_size_distances(buf, sizes) == expected
+
+    def test_key_size_distances_match_pairwise_distances(self):
+        """Test the key-size metric averages normalized adjacent-block distances."""
+        import numpy as np
+
+        from src.tools.xor import _key_size_distances
+        from src.utils.scoring import hamming_distance
+
+        data = bytes(range(7, 250, 3))
+        buf = np.frombuffer(data, dtype=np.uint8)
+        for ks in (2, 5, 13):
+            blocks = [data[i * ks : (i + 1) * ks] for i in range(4)]
+            dists = [hamming_distance(x, y) / ks for x, y in zip(blocks, blocks[1:], strict=False)]
+            assert _key_size_distances(buf, [ks]) == [sum(dists) / 3]
+        assert _key_size_distances(buf[:10], [5]) == [1e9]
+
 
 class TestXorKnownPlaintext:
     """Tests for known-plaintext XOR attack."""
@@ -135,3 +301,12 @@ class TestXorKnownPlaintext:
         """Test graceful handling of invalid offset."""
         result = xor_known_plaintext("001122", "too long known plaintext", encoding="hex")
         assert result.confidence == 0.0
+
+    def test_xor_known_plaintext_offset_keeps_prefix(self):
+        """Test bytes before the offset are untouched and the key repeats from it."""
+        key = b"K3y"
+        body = b"attack at dawn, attack at dusk"
+        ct = b"hdr:" + bytes(c ^ key[i % 3] for i, c in enumerate(body))
+        result = xor_known_plaintext(ct.hex(), "att", encoding="hex", offset=4)
+        assert result.key == "K3y"
+        assert result.plaintext == "hdr:" + body.decode()
@@ -2,7 +2,21 @@
 
 import time
 
-from src.utils.scoring import english_score, hamming_distance, ioc
+import numpy as np
+import pytest
+
+from src.utils.scoring import (
+    _stats_bytes,
+    _stats_numpy,
+    english_score,
+    english_score_batch,
+    english_score_bytes,
+    english_score_uncached,
+    hamming_distance,
+    ioc,
+    top_k_indices,
+)
+from src.utils.scoring_nb import HAS_NUMBA, score_stats
 
 
 class TestEnglishScore:
@@ -129,6 +143,307 @@ class TestEnglishScore:
         assert cache_info.misses == 0
 
 
+class TestEnglishScoreUncached:
+    """Tests for the uncached scorer used by brute-force loops."""
+
+    def test_matches_cached_score(self):
+        """Test cached and uncached paths agree."""
+        for text in ("Hello World", "Uryyb Jbeyq", "flag{x}", "", "\x00\x01abc"):
+            assert english_score_uncached(text) == english_score(text)
+
+    def test_does_not_populate_cache(self):
+        """Test the uncached path bypasses the LRU cache."""
+        english_score.cache_clear()
+        english_score_uncached("Hello World")
+        assert english_score.cache_info().currsize == 0
+
+    def test_non_latin1_text(self):
+        """Test characters outside Latin-1 keep their printable/alpha class."""
+        # Cyrillic letters are alphabetic, so the text is not rejected outright.
+        assert english_score_uncached("hello мир") > 0.0
+        assert english_score_uncached("Ⓡⓐⓝⓓⓞⓜ") == 0.0
+
+    def test_short_input_path_matches_numpy(self):
+        """Test the pure-Python short-input stats equal the NumPy stats exactly."""
+        for raw in [b"a", b"Hello World", b"The quick brown fox\x00\xe9 jumps", bytes(range(256))]:
+            assert _stats_bytes(raw) == _stats_numpy(np.frombuffer(raw, dtype=np.uint8))
+
+    def test_numpy_class_counts_match_str_methods(self):
+        """Test the NumPy printable/alpha counts agree with str.isprintable/isalpha."""
+        raw = bytes(range(256)) * 3 + b"plain text tail"
+        text = raw.decode("latin-1")
+        _, printable, alpha, _, _ = _stats_numpy(np.frombuffer(raw, dtype=np.uint8))
+        assert printable == sum(c.isprintable() for c in text)
+        assert alpha == sum(c.isalpha() for c in text)
+
+    def test_numpy_path_skips_gathers_for_gated_buffers(self, monkeypatch, mocker):
+        """Test binary garbage is rejected before the letter and bigram gathers."""
+        from src.utils import scoring
+
+        monkeypatch.setattr(scoring, "score_stats", None)
+        spy = mocker.spy(scoring, "_letter_bigram_numpy")
+        assert scoring._score_u8(np.arange(256, dtype=np.uint8)) == 0.0
+        spy.assert_not_called()
+        text = np.frombuffer(b"the quick brown fox jumps over the lazy dog" * 2, dtype=np.uint8)
+        assert scoring._score_u8(text) > 0.0
+        spy.assert_called_once()
+
+    def test_short_path_skips_letter_loop_for_gated_input(self, monkeypatch, mocker):
+        """Test short binary garbage is rejected before the per-byte letter loop."""
+        from src.utils import scoring
+
+        monkeypatch.setattr(scoring, "score_stats", None)
+        spy = mocker.spy(scoring, "_letter_bigram_bytes")
+        assert scoring._score_bytes(bytes(range(0, 256, 8))) == 0.0
+        spy.assert_not_called()
+        assert scoring._score_bytes(b"hello there world") > 0.0
+        spy.assert_called_once()
+
+    def test_large_text_bypasses_score_cache(self):
+        """Test texts over the cache size limit are scored but not memoized."""
+        english_score.cache_clear()
+        big = "the quick brown fox " * 5000
+        assert english_score(big) == english_score_uncached(big)
+        assert english_score.cache_info().currsize == 0
+        english_score("short text")
+        assert english_score.cache_info().currsize == 1
+
+    def test_bytes_variant_matches_latin1_text(self):
+        """Test english_score_bytes equals scoring the Latin-1 decoded text."""
+        for raw in [b"", b"Hello World", b"flag{bytes}", b"caf\xe9 \x00\xff" * 20]:
+            assert english_score_bytes(raw) == english_score_uncached(raw.decode("latin-1"))
+
+    def test_flag_prescreen_matches_regex(self):
+        """Test the substring prescreen agrees with FLAG_PATTERN on edge cases."""
+        from src.utils.scoring import FLAG_PATTERN, _has_flag
+
+        texts = [
+            "FLAG{upper}",
+            "Key{kelvin}",
+            "ſecret{long_s}",
+            "ﬂag{ligature}",
+            "flag{\nsplit}",
+            "a{b}c",
+            "key {spaced}",
+            "flag{open\nctf{closed}",
+            "flag{a\rb}",
+            "ctf{x\n}\nkey{y",
+        ]
+        for text in texts:
+            assert _has_flag(text) == bool(FLAG_PATTERN.search(text)), text
+
+    def test_flag_scan_handles_many_unclosed_openers(self):
+        """Test text packed with unclosed flag openers is scanned correctly."""
+        from src.utils.scoring import _has_flag
+
+        assert _has_flag("flag{" * 5000) is False
+        assert _has_flag("flag{" * 5000 + "\n}") is False
+        assert _has_flag("flag{\n" * 5000 + "flag{}") is True
+
+    def test_brace_garbage_skips_regex(self, mocker):
+        """Test text with braces but no flag keyword never reaches the regex."""
+        from src.utils import scoring
+
+        pattern = mocker.patch.object(scoring, "FLAG_PATTERN")
+        assert english_score_uncached("x{qz}w" * 20) == 0.0
+        pattern.search.assert_not_called()
+
+    def test_unclosed_brace_skips_flag_scan(self, mocker):
+        """Test text with only an opening brace is never scanned for flags."""
+        from src.utils import scoring
+
+        spy = mocker.spy(scoring, "_has_flag")
+        english_score_uncached("flag{never closed")
+        english_score_bytes(b"flag{never closed")
+        spy.assert_not_called()
+        assert english_score_uncached("flag{closed}") == 10.0
+        assert spy.call_count == 1
+
+    def test_lookup_tables_are_read_only(self):
+        """Test the module-level scoring tables cannot be mutated."""
+        from src.utils import scoring
+
+        with pytest.raises(ValueError):
+            scoring._LETTER_LUT[ord("e")] = 1.0
+        with pytest.raises(ValueError):
+            scoring._CLASS_LUT[ord("e")] = 0
+
+    def test_bigram_mat_holds_exactly_bigram_freq(self):
+        """Test the 27 x 27 table has each BIGRAM_FREQ weight and zeros elsewhere."""
+        import string
+
+        from src.utils.scoring import _BIGRAM_MAT, BIGRAM_FREQ
+
+        letters = string.ascii_lowercase + "\0"
+        table = {
+            a + b: _BIGRAM_MAT[i * 27 + j]
+            for i, a in enumerate(letters)
+            for j, b in enumerate(letters)
+        }
+        assert {k: v for k, v in table.items() if v} == BIGRAM_FREQ
+
+    def test_bigram_gather_matches_dict_lookup(self):
+        """Test the dense bigram table gather agrees with BIGRAM_FREQ probes."""
+        from src.utils.scoring import BIGRAM_FREQ
+
+        raw = b"THe Quick tHRough ANother\xc9R \x00th"
+        low = raw.decode("latin-1").lower()
+        freqs = [BIGRAM_FREQ.get(low[i : i + 2], 0.0) for i in range(len(low) - 1)]
+        _, _, _, bigram, hits = _stats_numpy(np.frombuffer(raw, dtype=np.uint8))
+        assert bigram == sum(freqs)
+        assert hits == sum(1 for f in freqs if f)
+
+    def test_dense_bigram_table_matches_every_byte_pair(self):
+        """Test the 27 x 27 bigram gather agrees with BIGRAM_FREQ for every byte pair."""
+        from src.utils import scoring
+        from src.utils.scoring import BIGRAM_FREQ
+
+        a = np.repeat(np.arange(256, dtype=np.uint8), 256)
+        b = np.tile(np.arange(256, dtype=np.uint8), 256)
+        dense = scoring._bigram_freqs(np.stack([a, b], axis=1))[:, 0]
+        expected = [
+            BIGRAM_FREQ.get((chr(x) + chr(y)).lower(), 0.0) for x, y in zip(a, b, strict=True)
+        ]
+        assert dense.tolist() == expected
+
+    def test_bytes_path_matches_numpy_stats(self):
+        """Test the short-input Python loop gives the NumPy path's letter and bigram sums."""
+        from src.utils.scoring import _letter_bigram_bytes
+
+        for raw in (b"t", b"THe Quick tHRough ANother\xc9R \x00th", bytes(range(256))):
+            letter, _, _, bigram, hits = _stats_numpy(np.frombuffer(raw, dtype=np.uint8))
+            assert _letter_bigram_bytes(raw) == (letter, bigram, hits)
+
+    @pytest.mark.skipif(not HAS_NUMBA, reason="numba not installed")
+    def test_numba_kernel_matches_numpy(self):
+        """Test the Numba kernel and the NumPy fallback produce the same stats."""
+        from src.utils import scoring
+
+        buf = np.frombuffer(b"The quick brown fox\x00\xe9 jumps", dtype=np.uint8)
+        expected = _stats_numpy(buf)
+        got = score_stats(
+            buf,
+            scoring._LETTER_LUT,
+            scoring._PRINTABLE_LUT,
+            scoring._ALPHA_LUT,
+            scoring._BIGRAM_CLASS_LUT,
+            scoring._BIGRAM_MAT,
+        )
+        assert got[1:3] == expected[1:3]
+        assert got[4] == expected[4]
+        assert got[0] == pytest.approx(expected[0])
+        assert got[3] == pytest.approx(expected[3])
+
+    @pytest.mark.skipif(not HAS_NUMBA, reason="numba not installed")
+    def test_numba_and_numpy_scores_agree(self, monkeypatch):
+        """Test english_score_uncached gives the same score with and without the kernel."""
+        from src.utils import scoring
+
+        texts = [
+            "The quick brown fox jumps over the lazy dog" * 3,
+            "hello мир",
+            "\x00\x01\x02 binary \xff\xfe" * 10,
+            "".join(map(chr, range(256))),
+            "flag{kernel}",
+            "zzqx",
+        ]
+        with_kernel = [english_score_uncached(t) for t in texts]
+        monkeypatch.setattr(scoring, "score_stats", None)
+        without = [english_score_uncached(t) for t in texts]
+        assert without == pytest.approx(with_kernel)
+
+
+class TestEnglishScoreBatch:
+    """Tests for english_score_batch and top_k_indices."""
+
+    def test_matches_per_row_scores(self):
+        """Test each row scores the same as the single-string scorer."""
+        rows = [
+            "Hello World",
+            "Uryyb Jbeyq",
+            "flag{batch}",
+            "\x00\x01\x02\x03\x04\x05\x06\x07\x08\x09\x0a",
+        ]
+        cands = np.array([list(r.encode("latin-1")) for r in rows], dtype=np.uint8)
+        scores = english_score_batch(cands)
+        assert scores.tolist() == [english_score_uncached(r) for r in rows]
+
+    def test_gated_rows_match_per_row_scores(self):
+        """Test rows skipped by the printable/alpha gates still score exactly."""
+        plain = np.frombuffer(b"Some flag{xor} text, mostly letters.", dtype=np.uint8)
+        cands = plain[None, :] ^ np.arange(256, dtype=np.uint8)[:, None]
+        scores = english_score_batch(cands)
+        expected = [english_score_uncached(row.tobytes().decode("latin-1")) for row in cands]
+        assert scores.tolist() == expected
+        assert 0 < np.count_nonzero(scores) < 256
+
+    def test_bigrams_score_rows_without_letter_credit(self):
+        """Test a row with no letter-frequency credit still earns its bigram score."""
+        rows = ["ng.ng.ng.ng.", "zq.zq.zq.zq."]
+        cands = np.array([list(r.encode("latin-1")) for r in rows], dtype=np.uint8)
+        scores = english_score_batch(cands)
+        assert scores.tolist() == [english_score_uncached(r) for r in rows]
+        assert scores[0] > 0.0 and scores[1] == 0.0
+
+    def test_flag_needs_both_braces(self):
+        """Test only rows with a full flag{...} get the flag score."""
+        rows = ["xx flag{open", "flag} {not__", "a flag{done}"]
+        cands = np.array([list(r.encode("latin-1")) for r in rows], dtype=np.uint8)
+        scores = english_score_batch(cands)
+        assert scores.tolist() == [english_score_uncached(r) for r in rows]
+        assert scores[:2].max() < 10.0 and scores[2] == 10.0
+
+    @pytest.mark.skipif(not HAS_NUMBA, reason="numba not installed")
+    def test_numba_batch_matches_numpy(self, mocker):
+        """Test the Numba batch kernel scores rows exactly like the NumPy path."""
+        from src.utils import scoring
+
+        rng = np.random.default_rng(7)
+        plain = np.frombuffer(b"Attack at dawn, the key{is} here.", dtype=np.uint8)
+        cands = np.vstack(
+            [
+                plain[None, :] ^ np.arange(256, dtype=np.uint8)[:, None],
+                rng.integers(0, 256, (8, plain.size), dtype=np.uint8),
+            ]
+        )
+        fast = english_score_batch(cands)
+        mocker.patch.object(scoring, "score_batch_stats", None)
+        assert fast.tolist() == english_score_batch(cands).tolist()
+
+    def test_batch_flag_prefilter_matches_single_scores(self):
+        """Test rows with braces but no prefix-letter opener still score like singles."""
+        rows = [b"x{flag}y", b"Flag{ok}", b"ctf {no}", b"}{key}{", b"SECRET{x}", b"t{}"]
+        width = max(len(r) for r in rows)
+        cands = np.frombuffer(b"".join(r.ljust(width) for r in rows), dtype=np.uint8)
+        cands = cands.reshape(len(rows), width)
+        expected = [english_score(r.ljust(width).decode("latin-1")) for r in rows]
+        assert english_score_batch(cands).tolist() == expected
+
+    @pytest.mark.skipif(not HAS_NUMBA, reason="numba not installed")
+    def test_parallel_batch_kernel_matches_serial(self, monkeypatch):
+        """Test the multithreaded batch kernel scores rows exactly like the serial one."""
+        from src.utils import scoring
+
+        plain = np.frombuffer(b"Attack at dawn, the flag{is} here." * 4, dtype=np.uint8)
+        cands = plain[None, :] ^ np.arange(256, dtype=np.uint8)[:, None]
+        serial = english_score_batch(cands)
+        monkeypatch.setattr(scoring, "PARALLEL_BATCH", True)
+        monkeypatch.setattr(scoring, "_PARALLEL_BATCH_MIN", 0)
+        assert english_score_batch(cands).tolist() == serial.tolist()
+
+    def test_empty_rows(self):
+        """Test zero-length candidates score zero."""
+        scores = english_score_batch(np.zeros((4, 0), dtype=np.uint8))
+        assert scores.tolist() == [0.0] * 4
+
+    def test_top_k_is_stable(self):
+        """Test ties keep index order, like a stable descending sort."""
+        scores = np.array([0.1, 0.5, 0.3, 0.5, 0.0, 0.3])
+        assert top_k_indices(scores, 3).tolist() == [1, 3, 2]
+        assert top_k_indices(scores, 10).tolist() == [1, 3, 2, 5, 0, 4]
+        assert top_k_indices(scores, 0).tolist() == []
+
+
 class TestIOC:
     """Tests for Index of Coincidence function."""
 
@@ -177,6 +492,27 @@ class TestIOC:
         # Should be same since spaces are ignored
         assert result_with_spaces == result_without_spaces
 
+    def test_ioc_long_ascii_matches_per_char_count(self):
+        """Test the histogram path agrees with a per-letter count on long text."""
+        text = "The Quick brown FOX, 42 jumps over the lazy dog! " * 4
+        letters = [c.lower() for c in text if c.isalpha()]
+        counts = [letters.count(c) for c in set(letters)]
+        n = len(letters)
+        assert ioc(text) == sum(v * (v - 1) for v in counts) / (n * (n - 1))
+
+    def test_ioc_long_non_ascii_counts_accented_letters(self):
+        """Test non-ASCII letters still count on long text."""
+        assert ioc("é" * 40) == 1.0
+
+    def test_ioc_long_mixed_text_matches_per_char_count(self):
+        """Test mostly-ASCII text with a few non-ASCII letters counts every letter once."""
+        # The Kelvin sign lowercases to an ASCII "k" and must share its count.
+        text = "Déjà vu: the KELVIN \u212a sign, ß and Σσ in plain text. " * 3
+        letters = [c.lower() for c in text if c.isalpha()]
+        counts = [letters.count(c) for c in set(letters)]
+        n = len(letters)
+        assert ioc(text) == sum(v * (v - 1) for v in counts) / (n * (n - 1))
+
 
 class TestHammingDistance:
     """Tests for hamming_distance function."""
@@ -222,3 +558,47 @@ class TestHammingDistance:
         b = b"wokka wokka!!!"
         result = hamming_distance(a, b)
         assert result == 37, f"Expected distance 37, got {result}"
+
+    def test_hamming_large_input_matches_bytewise(self):
+        """Test multi-KiB inputs agree with a per-byte popcount."""
+        import random
+
+        rng = random.Random(7)
+        a = rng.randbytes(5000)
+        b = rng.randbytes(4999)
+        expected = sum(bin(x ^ y).count("1") for x, y in zip(a, b, strict=False))
+        assert hamming_distance(a, b) == expected
+
+    def test_hamming_numpy_path_handles_tail_and_offsets(self):
+        """Test long inputs match a per-byte popcount for odd lengths and views."""
+        import random
+
+        rng = random.Random(11)
+        data = rng.randbytes(20003)
+        for a, b in [(data[:9001], data[9001:18003]), (data[1:], data[:-1])]:
+            expected = sum(bin(x ^ y).count("1") for x, y in zip(a, b, strict=False))
+            assert hamming_distance(a, b) == expected
+
+    def test_hamming_matches_bytewise_around_numpy_threshold(self):
+        """Test both popcount paths agree at the NumPy cutover length."""
+        import random
+
+        from src.utils.scoring import _HAMMING_NUMPY_MIN
+
+        rng = random.Random(13)
+        for n in (_HAMMING_NUMPY_MIN - 1, _HAMMING_NUMPY_MIN, _HAMMING_NUMPY_MIN + 7):
+            a, b = rng.randbytes(n), rng.randbytes(n)
+            expected = sum(bin(x ^ y).count("1") for x, y in zip(a, b, strict=True))
+            assert hamming_distance(a, b) == expected
+
+    def test_hamming_unpackbits_fallback(self, monkeypatch):
+        """Test the pre-NumPy-2.0 unpackbits path gives the same distance."""
+        import random
+
+        from src.utils import scoring
+
+        rng = random.Random(12)
+        a, b = rng.randbytes(5003), rng.randbytes(5010)
+        expected = hamming_distance(a, b)
+        monkeypatch.setattr(scoring, "_HAS_BITWISE_COUNT", False)
+        assert hamming_distance(a, b) == expected